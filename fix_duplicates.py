@@ -3,10 +3,16 @@
 Remove duplicate city entries from city-data.ts by parsing the file structure properly.
 Keeps the entry with the higher marketScore.overall.
 """
+import os
 import re
 import json
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from validate_city_data import check, snapshot
 
 def main():
+    baseline = snapshot('src/data/city-data.ts')
     with open('src/data/city-data.ts', 'r') as f:
         content = f.read()
     
@@ -14,7 +20,7 @@ def main():
     match = re.search(r'export const cityData: Record<string, CityData\[\]> = \{', content)
     if not match:
         print("Could not find cityData export")
-        return
+        return 1
     
     header = content[:match.end()]
     rest = content[match.end():]
@@ -130,6 +136,7 @@ def main():
         f.write(new_content)
     
     print("File updated successfully")
+    return 1 if check('src/data/city-data.ts', baseline=baseline) else 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
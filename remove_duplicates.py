@@ -2,8 +2,13 @@
 """
 Remove duplicate city entries from city-data.ts, keeping the entry with the higher marketScore.overall
 """
+import os
 import re
 import json
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from validate_city_data import check, snapshot
 
 def extract_city_entries(content):
     """Extract all city entries from the content"""
@@ -57,6 +62,7 @@ def extract_city_entries(content):
     return entries
 
 def main():
+    baseline = snapshot('src/data/city-data.ts')
     with open('src/data/city-data.ts', 'r') as f:
         content = f.read()
     
@@ -129,5 +135,7 @@ def main():
         remaining_dups = [id for id in new_ids if new_ids.count(id) > 1]
         print(f"Warning: Still have duplicates: {set(remaining_dups)}")
 
+    return 1 if check('src/data/city-data.ts', baseline=baseline) else 0
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Anomaly gates for the monthly update: compare the freshly downloaded state
+metrics with the values currently in state-data.ts / inventory-data.ts and
+refuse to write when too many states move implausibly.
+
+The downloads are only checked for "at least 45 states" and a sane 30-year
+rate, so a shifted Redfin column would be written as-is. Here every metric
+becomes one column of a (states x metrics) array and a single vectorized
+pass computes, per metric:
+
+- the month-over-month delta (percentage points, or percent change for
+  levels like medianValue and daysOnMarket)
+- a robust z-score of that delta: (delta - median) / (1.4826 x MAD)
+
+A state/metric is flagged when its delta exceeds the metric's ceiling or its
+z-score exceeds --max-z. A column shift moves every state at once, which
+the ceilings catch even though the z-scores stay small; a single broken
+row is caught by its z-score. The update is blocked when any metric has
+more than --max-flagged-share of states flagged; a few isolated flags are
+reported but don't block.
+
+monthly-data-update.py runs the gates before writing. Standalone, they
+compare two versions of the data files, e.g. before committing a manual edit:
+
+    git show HEAD:src/data/state-data.ts > /tmp/state-data.ts
+    git show HEAD:src/data/inventory-data.ts > /tmp/inventory-data.ts
+    python3 scripts/anomaly_gates.py --previous-state-data /tmp/state-data.ts \\
+        --previous-inventory /tmp/inventory-data.ts
+"""
+
+import argparse
+import json
+import sys
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from city_data import STATE_DATA_TS, iter_record_values, load_state_data, read_bytes, ts_to_json
+
+INVENTORY_TS = "src/data/inventory-data.ts"
+
+# name, relative (% change instead of point delta), ceiling for |delta|,
+# floor for the MAD scale so a quiet month doesn't turn noise into z > 5
+Metric = namedtuple('Metric', 'name relative ceiling min_scale')
+
+METRICS = (
+    Metric('oneYear', False, 5.0, 0.5),               # appreciation, pp
+    Metric('fiveYear', False, 10.0, 1.0),
+    Metric('medianValue', True, 5.0, 0.5),            # %
+    Metric('inventoryGrowthYoY', False, 25.0, 2.0),
+    Metric('inventoryVs2019', False, 20.0, 2.0),      # pp vs the fixed Dec 2019 baseline
+    Metric('priceCutPercent', False, 8.0, 1.0),
+    Metric('daysOnMarket', True, 50.0, 5.0),          # %
+)
+
+MAX_Z = 5.0
+MAX_FLAGGED_SHARE = 0.10
+MAD_TO_SIGMA = 1.4826
+
+
+def load_previous(state_path=STATE_DATA_TS, inventory_path=INVENTORY_TS):
+    """{state: {metric: value}} for every gated metric currently on disk."""
+    previous = {}
+    for code, state in load_state_data(state_path).items():
+        previous.setdefault(code, {}).update(state['appreciation'])
+    data = read_bytes(inventory_path)
+    for code, s, e in iter_record_values(data, 'inventoryData'):
+        previous.setdefault(code, {}).update(json.loads(ts_to_json(data[s:e])))
+    return previous
+
+
+def current_values(zillow, redfin):
+    """{state: {metric: value}} in the form update_state_data/update_inventory_data write."""
+    current = {}
+    for code, z in zillow.items():
+        current.setdefault(code, {}).update(
+            oneYear=z['oneYear'], fiveYear=z['fiveYear'], medianValue=z['medianValue'])
+    for code, r in redfin.items():
+        row = current.setdefault(code, {})
+        if r.get('inventoryYoY') is not None:
+            row['inventoryGrowthYoY'] = round(r['inventoryYoY'])
+        if r.get('inventoryVs2019') is not None:
+            row['inventoryVs2019'] = r['inventoryVs2019']
+        if r.get('priceCuts') is not None:
+            row['priceCutPercent'] = round(r['priceCuts'], 1)
+        if r.get('dom') is not None:
+            row['daysOnMarket'] = r['dom']
+    return current
+
+
+def _matrix(values, codes):
+    out = np.full((len(codes), len(METRICS)), np.nan)
+    for i, code in enumerate(codes):
+        row = values.get(code, {})
+        for j, metric in enumerate(METRICS):
+            v = row.get(metric.name)
+            if v is not None:
+                out[i, j] = v
+    return out
+
+
+def evaluate(previous, current, max_z=MAX_Z):
+    """Return (codes, delta, z, flagged) arrays of shape (states, metrics)."""
+    codes = sorted(set(previous) & set(current))
+    prev = _matrix(previous, codes)
+    new = _matrix(current, codes)
+    relative = np.array([m.relative for m in METRICS])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(relative, (new / prev - 1) * 100, new - prev)
+    delta[~np.isfinite(delta)] = np.nan
+
+    with warnings.catch_warnings():
+        # Metrics missing on both sides give all-NaN columns
+        warnings.simplefilter('ignore', RuntimeWarning)
+        center = np.nanmedian(delta, axis=0)
+        mad = np.nanmedian(np.abs(delta - center), axis=0) * MAD_TO_SIGMA
+    scale = np.fmax(mad, np.array([m.min_scale for m in METRICS]))
+    z = (delta - center) / scale
+
+    ceiling = np.array([m.ceiling for m in METRICS])
+    with np.errstate(invalid='ignore'):
+        flagged = (np.abs(delta) > ceiling) | (np.abs(z) > max_z)
+    return codes, delta, z, flagged
+
+
+def gate(previous, current, max_z=MAX_Z, max_flagged_share=MAX_FLAGGED_SHARE, show=3):
+    """Print a compact report. Returns True if the update may be written."""
+    codes, delta, z, flagged = evaluate(previous, current, max_z)
+    if not codes:
+        print("  Anomaly gates: no states in common with the current files - blocking")
+        return False
+    limit = max(1, int(len(codes) * max_flagged_share))
+    ok = True
+    print(f"  Anomaly gates ({len(codes)} states, block at >{limit} flagged per metric):")
+    for j, metric in enumerate(METRICS):
+        column = delta[:, j]
+        n_flagged = int(flagged[:, j].sum())
+        blocked = n_flagged > limit
+        ok &= not blocked
+        unit = '%' if metric.relative else 'pp'
+        median = float(np.nanmedian(column)) if np.isfinite(column).any() else float('nan')
+        line = (f"    {'BLOCK' if blocked else 'ok':<5} {metric.name:<19} median {median:+7.2f}{unit:<2} "
+                f"flagged {n_flagged:>2}")
+        if n_flagged:
+            worst = np.argsort(-np.nan_to_num(np.abs(z[:, j]) * flagged[:, j]))[:min(show, n_flagged)]
+            line += '  ' + ', '.join(f"{codes[i]} {column[i]:+.1f}{unit} (z {z[i, j]:+.1f})" for i in worst)
+        print(line)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the monthly anomaly gates between two versions of the data files.')
+    parser.add_argument('--previous-state-data', required=True)
+    parser.add_argument('--previous-inventory', required=True)
+    parser.add_argument('--state-data', default=STATE_DATA_TS)
+    parser.add_argument('--inventory', default=INVENTORY_TS)
+    parser.add_argument('--max-z', type=float, default=MAX_Z)
+    parser.add_argument('--max-flagged-share', type=float, default=MAX_FLAGGED_SHARE)
+    args = parser.parse_args(argv)
+
+    previous = load_previous(args.previous_state_data, args.previous_inventory)
+    current = load_previous(args.state_data, args.inventory)
+    return 0 if gate(previous, current, args.max_z, args.max_flagged_share) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
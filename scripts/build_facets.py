@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Build facet indexes and top-K leaderboards from city-data.ts.
+
+Writes to public/data/facets/:
+  - <facet>.json         {value: [ids]} for state, marketType, verdict,
+                         rprRating, riskLevel, strStatus, priceBand, dsi
+  - top-by-state.json    {state: {overall|rpr|revenue: [[id, value], ...]}}
+  - top-by-type.json     the same per market type
+  - manifest.json        content hash per file
+
+One pass over the parsed entries fills every index; leaderboards keep a
+bounded heap per (group, metric), so ranking costs O(n log K). A filter
+like "lake markets in TN under $350k" becomes an intersection of three id
+lists. Id lists are sorted, so intersections can merge. A file is only
+rewritten when its content hash changes.
+
+Usage: python3 scripts/build_facets.py [--top 25] [--force]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+
+from city_data import CITY_DATA_TS, content_hash, iter_cities
+
+OUTPUT_DIR = 'public/data/facets'
+MANIFEST_VERSION = 1
+DEFAULT_TOP = 25
+
+# Upper bounds (exclusive) of the medianHomePrice bands; the last band is open
+PRICE_BANDS = ((200000, 'under-200k'), (350000, '200k-350k'), (500000, '350k-500k'),
+               (750000, '500k-750k'), (None, '750k-plus'))
+
+FACETS = {
+    'state': lambda st, c: st,
+    'marketType': lambda st, c: c['amenityDelta']['marketType'],
+    'verdict': lambda st, c: c['marketScore']['verdict'],
+    'rprRating': lambda st, c: c['investmentMetrics']['rprRating'],
+    'riskLevel': lambda st, c: c['saturationRisk']['riskLevel'],
+    'strStatus': lambda st, c: c['strStatus'],
+    'priceBand': lambda st, c: price_band(c['rental']['medianHomePrice']),
+    'dsi': lambda st, c: 'true' if c['dsi'] else 'false',
+}
+
+METRICS = {
+    'overall': lambda c: c['marketScore']['overall'],
+    'rpr': lambda c: c['rpr'],
+    'revenue': lambda c: c['rental']['monthlyRevenue'],
+}
+
+LEADERBOARDS = {
+    'top-by-state': lambda st, c: st,
+    'top-by-type': lambda st, c: c['amenityDelta']['marketType'],
+}
+
+
+def price_band(price):
+    for limit, label in PRICE_BANDS:
+        if limit is None or price < limit:
+            return label
+
+
+class TopK:
+    """Bounded min-heap keeping the K largest (value, id) pairs."""
+
+    __slots__ = ('k', 'heap')
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, value, city_id):
+        item = (value, _Rev(city_id))
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def ranked(self):
+        return [[rev.s, value] for value, rev in sorted(self.heap, reverse=True)]
+
+
+class _Rev:
+    """String wrapper with reversed ordering, so equal values rank ids A-Z."""
+
+    __slots__ = ('s',)
+
+    def __init__(self, s):
+        self.s = s
+
+    def __lt__(self, other):
+        return self.s > other.s
+
+    def __eq__(self, other):
+        return self.s == other.s
+
+
+def build(city_path=CITY_DATA_TS, top=DEFAULT_TOP):
+    """One pass over the data. Returns {file name: document}."""
+    facets = {name: {} for name in FACETS}
+    boards = {name: {} for name in LEADERBOARDS}
+    seen = set()
+    for state, city in iter_cities(city_path):
+        city_id = city['id']
+        if city_id in seen:
+            continue
+        seen.add(city_id)
+        for name, get in FACETS.items():
+            facets[name].setdefault(get(state, city), []).append(city_id)
+        values = {metric: get(city) for metric, get in METRICS.items()}
+        for name, group_of in LEADERBOARDS.items():
+            group = boards[name].setdefault(group_of(state, city), {m: TopK(top) for m in METRICS})
+            for metric, value in values.items():
+                group[metric].push(value, city_id)
+
+    docs = {}
+    for name, index in facets.items():
+        docs[f"{name}.json"] = {value: sorted(ids) for value, ids in sorted(index.items())}
+    for name, groups in boards.items():
+        docs[f"{name}.json"] = {group: {m: heap.ranked() for m, heap in metrics.items()}
+                                for group, metrics in sorted(groups.items())}
+    return docs
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+
+def _write(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_indexes(docs, output_dir=OUTPUT_DIR, force=False):
+    """Write changed files. Returns (files manifest, written names)."""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    previous = {} if force else load_manifest(manifest_path)
+
+    files, written = {}, []
+    for name, doc in sorted(docs.items()):
+        body = json.dumps(doc, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = content_hash(body)
+        path = os.path.join(output_dir, name)
+        files[name] = {'hash': digest, 'bytes': len(body)}
+        if previous.get(name, {}).get('hash') == digest and os.path.exists(path):
+            continue
+        _write(path, body)
+        written.append(name)
+
+    for name in set(previous) - set(files):
+        path = os.path.join(output_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    _write(manifest_path, (json.dumps({'version': MANIFEST_VERSION, 'files': files},
+                                      indent=2, sort_keys=True) + '\n').encode('utf-8'))
+    return files, written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build facet indexes and top-K leaderboards.')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'Leaderboard size (default {DEFAULT_TOP})')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--force', action='store_true', help='Rewrite every file even if unchanged')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    docs = build(args.city_data, args.top)
+    files, written = write_indexes(docs, args.output_dir, args.force)
+    total = sum(f['bytes'] for f in files.values())
+    print(f"Built {len(files)} index files in {args.output_dir}/ ({total / 1024:.0f} KB, {time.time() - start:.2f}s)")
+    print(f"  Rewritten: {len(written)} {written if written else ''}")
+    print(f"  Unchanged: {len(files) - len(written)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
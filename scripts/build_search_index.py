@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Build a prebuilt city search index from basic-city-data.ts and city-data.ts.
+
+/api/cities/search runs `name.ilike.%q%` OR county OR state against the
+database on every keystroke. This compiles the same fields into one JSON
+artifact a route can load once and query in memory:
+
+  {
+    "version": 1,
+    "sources": {path: sha256},
+    "records": [[id, name, state, county, population, hasFullData], ...],
+    "terms": ["abbeville", "aberdeen", ...],       sorted
+    "postings": [[record, ...], ...],              aligned with terms
+    "trigrams": {"abe": [record, ...], ...}        over city names
+  }
+
+- Records are sorted by population (descending), so a record's index is its
+  rank and every posting list - kept ascending - is already population-ranked:
+  the first k matches are the top k
+- Terms are the normalized words of the name and county, the state code and
+  the state name. A prefix query ("gat", "sevier co") binary-searches the
+  sorted terms for the range starting with each word and intersects postings
+- Name trigrams cover the ilike-style substring case ("burg" in
+  "Gatlinburg"): for words of 3+ characters the trigram postings are
+  intersected and the substring confirmed, and those hits join the prefix hits
+- Cities in both files are merged by id; city-data.ts supplies the county
+  and marks hasFullData
+
+The build is skipped when the content hashes of both data files match the
+ones recorded in the existing artifact.
+
+Usage: python3 scripts/build_search_index.py [--force] [--query TEXT]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+from city_data import BASIC_CITY_TS, CITY_DATA_TS, NAME_TO_CODE, content_hash, iter_basic_cities, iter_cities, read_bytes
+
+OUTPUT = 'public/data/search-index.json'
+INDEX_VERSION = 1
+CODE_TO_NAME = {code: name for name, code in NAME_TO_CODE.items()}
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+ID, NAME, STATE, COUNTY, POPULATION, FULL = range(6)
+
+
+def normalize(text):
+    """'Cañon City' -> 'canon city'. ASCII-folds, lowercases, keeps letters/digits/spaces."""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def record_terms(record):
+    terms = set(normalize(record[NAME]).split())
+    terms.update(normalize(record[COUNTY]).split())
+    terms.add(record[STATE].lower())
+    terms.update(normalize(CODE_TO_NAME.get(record[STATE], '')).split())
+    return terms
+
+
+# ============================================================
+# Build
+# ============================================================
+
+def load_records(basic_path=BASIC_CITY_TS, city_path=CITY_DATA_TS, basic_data=None, city_data=None):
+    """Merged [id, name, state, county, population, hasFullData] rows, ranked by population."""
+    records = {}
+    for state, row in iter_basic_cities(basic_path, basic_data):
+        if row['id'] not in records:
+            records[row['id']] = [row['id'], row['name'], state, '', row['population'], 0]
+    for state, city in iter_cities(city_path, city_data):
+        record = records.get(city['id'])
+        if record is None:
+            records[city['id']] = [city['id'], city['name'], state, city['county'], city['population'], 1]
+        else:
+            record[COUNTY] = city['county']
+            record[FULL] = 1
+    return sorted(records.values(), key=lambda r: (-r[POPULATION], r[ID]))
+
+
+def build_index(records, sources):
+    postings, grams = {}, {}
+    for i, record in enumerate(records):
+        for term in record_terms(record):
+            postings.setdefault(term, []).append(i)
+        for gram in trigrams(normalize(record[NAME])):
+            grams.setdefault(gram, []).append(i)
+    terms = sorted(postings)
+    return {
+        'version': INDEX_VERSION,
+        'sources': sources,
+        'records': records,
+        'terms': terms,
+        'postings': [postings[t] for t in terms],
+        'trigrams': {g: grams[g] for g in sorted(grams)},
+    }
+
+
+# ============================================================
+# Query (mirrors what a route does with the loaded artifact)
+# ============================================================
+
+def _prefix_matches(index, word):
+    """Record indexes having a term that starts with `word`."""
+    terms = index['terms']
+    hits = set()
+    i = bisect.bisect_left(terms, word)
+    while i < len(terms) and terms[i].startswith(word):
+        hits.update(index['postings'][i])
+        i += 1
+    return hits
+
+
+def _substring_matches(index, word):
+    """Record indexes whose name contains `word` (at least 3 characters)."""
+    gram_lists = [index['trigrams'].get(g) for g in trigrams(word)]
+    if not gram_lists or not all(gram_lists):
+        return set()
+    records = index['records']
+    candidates = set(min(gram_lists, key=len)).intersection(*gram_lists)
+    return {i for i in candidates if word in normalize(records[i][NAME])}
+
+
+def search(index, query, limit=20, state=None):
+    """Top `limit` records, by population, where every word of `query` is a
+    term prefix or (3+ characters) a substring of the name."""
+    words = normalize(query).split()
+    if not words:
+        return []
+    matched = None
+    for word in words:
+        hits = _prefix_matches(index, word)
+        if len(word) >= 3:
+            hits |= _substring_matches(index, word)
+        matched = hits if matched is None else matched & hits
+        if not matched:
+            return []
+
+    records = index['records']
+    ranked = sorted(matched)
+    if state:
+        ranked = [i for i in ranked if records[i][STATE] == state.upper()]
+    return [records[i] for i in ranked[:limit]]
+
+
+# ============================================================
+# Artifact
+# ============================================================
+
+def load_index(path=OUTPUT):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        index = json.load(f)
+    return index if index.get('version') == INDEX_VERSION else None
+
+
+def write_index(index, path=OUTPUT):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    body = json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return len(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the prefix/trigram city search index.')
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--output', default=OUTPUT)
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the data files are unchanged')
+    parser.add_argument('--query', help='Run a query against the index after building')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    basic_data, city_data = read_bytes(args.basic), read_bytes(args.city_data)
+    sources = {args.basic: content_hash(basic_data), args.city_data: content_hash(city_data)}
+    index = load_index(args.output)
+
+    if not args.force and index is not None and index.get('sources') == sources:
+        print(f"{args.output} is up to date")
+    else:
+        records = load_records(args.basic, args.city_data, basic_data, city_data)
+        index = build_index(records, sources)
+        size = write_index(index, args.output)
+        full = sum(r[FULL] for r in records)
+        print(f"Indexed {len(records)} cities ({full} with full data): {len(index['terms'])} terms, "
+              f"{len(index['trigrams'])} trigrams, {size / 1024:.0f} KB in {time.time() - start:.2f}s")
+        print(f"Wrote {args.output}")
+
+    if args.query:
+        t = time.perf_counter()
+        results = search(index, args.query, args.limit)
+        elapsed = (time.perf_counter() - t) * 1e6
+        print(f"{len(results)} result(s) for {args.query!r} in {elapsed:.0f}us")
+        for r in results:
+            county = f", {r[COUNTY]}" if r[COUNTY] else ''
+            print(f"  {r[ID]:<32} {r[NAME]}{county}, {r[STATE]}  pop {r[POPULATION]:,}{'  [full]' if r[FULL] else ''}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Roll city-data.ts up to one aggregate per state in src/data/state-aggregates.ts.
+
+state-data.ts holds hand-curated state figures and getAllStates() reduces
+over every city at render time; nothing precomputes what the ~1,600 full
+markets say about their state. One pass over city-data.ts groups the
+entries by state and computes, per state:
+
+- cityCount and total population
+- population-weighted medians of avgADR, occupancyRate, monthlyRevenue and rpr
+- verdict distribution (marketScore.verdict) and counts per market type
+
+The first entry of a duplicated id wins, as everywhere else. Each state
+carries a `hash` of its member entries' source text (plus the aggregate
+version); on a rerun only states whose hash changed are recomputed, every
+other line is kept byte-for-byte, and the file is not touched at all when
+nothing changed.
+
+Usage: python3 scripts/build_state_aggregates.py [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+from city_data import CITY_DATA_TS, iter_array_entries, iter_record_values, read_bytes, to_ts_literal, ts_to_json
+
+OUTPUT = 'src/data/state-aggregates.ts'
+EXPORT_NAME = 'stateAggregates'
+# Bump when the computed fields change, so every state is recomputed
+AGGREGATE_VERSION = 1
+VERDICTS = ('strong-buy', 'buy', 'hold', 'caution', 'avoid')
+
+HEADER = """// Generated by scripts/build_state_aggregates.py from city-data.ts - do not edit by hand.
+// Population-weighted medians and distributions over each state's full-data markets.
+// `hash` covers the state's member entries; only states whose cities changed are rewritten.
+
+export interface StateAggregate {
+  hash: string;
+  cityCount: number;
+  population: number;
+  medianADR: number;
+  medianOccupancy: number;
+  medianMonthlyRevenue: number;
+  medianRPR: number;
+  verdicts: Record<'strong-buy' | 'buy' | 'hold' | 'caution' | 'avoid', number>;
+  marketTypes: Record<string, number>;
+}
+
+"""
+
+
+def weighted_median(values, weights):
+    """Smallest value whose cumulative weight reaches half the total."""
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    return values[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+
+
+def group_cities(city_path=CITY_DATA_TS, data=None):
+    """One pass: {state: (hash, [city, ...])} with the first entry per id."""
+    if data is None:
+        data = read_bytes(city_path)
+    groups = {}
+    seen = set()
+    for state, s, e in iter_array_entries(data, 'cityData'):
+        raw = data[s:e]
+        city = json.loads(ts_to_json(raw))
+        if city['id'] in seen:
+            continue
+        seen.add(city['id'])
+        group = groups.get(state)
+        if group is None:
+            group = groups[state] = (hashlib.sha256(str(AGGREGATE_VERSION).encode()), [])
+        group[0].update(raw)
+        group[1].append(city)
+    return {state: (digest.hexdigest()[:16], cities) for state, (digest, cities) in groups.items()}
+
+
+def aggregate(digest, cities):
+    rental = [c['rental'] for c in cities]
+    # Unknown populations count once rather than dropping the market
+    weights = np.array([max(c['population'], 1) for c in cities], dtype=np.float64)
+
+    def column(values):
+        return weighted_median(np.array(values, dtype=np.float64), weights)
+
+    verdicts = Counter(c['marketScore']['verdict'] for c in cities)
+    market_types = Counter(c['amenityDelta']['marketType'] for c in cities)
+    return {
+        'hash': digest,
+        'cityCount': len(cities),
+        'population': int(sum(c['population'] for c in cities)),
+        'medianADR': int(round(column([r['avgADR'] for r in rental]))),
+        'medianOccupancy': int(round(column([r['occupancyRate'] for r in rental]))),
+        'medianMonthlyRevenue': int(round(column([r['monthlyRevenue'] for r in rental]))),
+        'medianRPR': round(float(column([c['rpr'] for c in cities])), 3),
+        'verdicts': {v: verdicts[v] for v in VERDICTS},
+        'marketTypes': dict(sorted(market_types.items())),
+    }
+
+
+def existing_lines(path=OUTPUT):
+    """{state: (hash, line text)} from a previous run, or {}."""
+    if not os.path.exists(path):
+        return {}
+    data = read_bytes(path)
+    lines = {}
+    try:
+        for code, s, e in iter_record_values(data, EXPORT_NAME):
+            lines[code] = (json.loads(ts_to_json(data[s:e])).get('hash'), data[s:e].decode('utf-8'))
+    except ValueError:
+        return {}
+    return lines
+
+
+def build(city_path=CITY_DATA_TS, output=OUTPUT, force=False):
+    """Return (module text, rewritten states, removed states)."""
+    groups = group_cities(city_path)
+    previous = {} if force else existing_lines(output)
+    out = [HEADER, f"export const {EXPORT_NAME}: Record<string, StateAggregate> = {{\n"]
+    rewritten = []
+    for state in sorted(groups):
+        digest, cities = groups[state]
+        kept = previous.get(state)
+        if kept and kept[0] == digest:
+            literal = kept[1]
+        else:
+            literal = to_ts_literal(aggregate(digest, cities))
+            rewritten.append(state)
+        out.append(f"  {state}: {literal},\n")
+    out.append("};\n")
+    removed = sorted(set(previous) - set(groups))
+    return ''.join(out), rewritten, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Roll city-data.ts up into src/data/state-aggregates.ts.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--output', default=OUTPUT)
+    parser.add_argument('--force', action='store_true', help='Recompute every state')
+    args = parser.parse_args(argv)
+
+    text, rewritten, removed = build(args.city_data, args.output, args.force)
+    if not rewritten and not removed and os.path.exists(args.output):
+        print(f"{args.output} is up to date")
+        return 0
+    tmp = args.output + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, args.output)
+    print(f"Wrote {args.output}: {len(rewritten)} state(s) recomputed"
+          f"{' (' + ', '.join(rewritten) + ')' if len(rewritten) <= 10 else ''}"
+          f"{', removed ' + ', '.join(removed) if removed else ''}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
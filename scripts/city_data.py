@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for reading the TypeScript data modules in src/data/.
+
+The data files are TS object literals, not JSON: keys are unquoted, strings
+use either quote style, and entries may be one-line TS, multi-line TS or
+compact JSON. Everything here works on raw bytes so callers get real byte
+offsets back, and entries are converted to JSON and handed to json.loads
+rather than parsed character by character.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+
+CITY_DATA_TS = "src/data/city-data.ts"
+BASIC_CITY_TS = "src/data/basic-city-data.ts"
+STATE_DATA_TS = "src/data/state-data.ts"
+STR_REGULATIONS_TS = "src/data/str-regulations.ts"
+
+NAME_TO_CODE = {
+    'Alabama': 'AL', 'Alaska': 'AK', 'Arizona': 'AZ', 'Arkansas': 'AR',
+    'California': 'CA', 'Colorado': 'CO', 'Connecticut': 'CT', 'Delaware': 'DE',
+    'Florida': 'FL', 'Georgia': 'GA', 'Hawaii': 'HI', 'Idaho': 'ID',
+    'Illinois': 'IL', 'Indiana': 'IN', 'Iowa': 'IA', 'Kansas': 'KS',
+    'Kentucky': 'KY', 'Louisiana': 'LA', 'Maine': 'ME', 'Maryland': 'MD',
+    'Massachusetts': 'MA', 'Michigan': 'MI', 'Minnesota': 'MN', 'Mississippi': 'MS',
+    'Missouri': 'MO', 'Montana': 'MT', 'Nebraska': 'NE', 'Nevada': 'NV',
+    'New Hampshire': 'NH', 'New Jersey': 'NJ', 'New Mexico': 'NM', 'New York': 'NY',
+    'North Carolina': 'NC', 'North Dakota': 'ND', 'Ohio': 'OH', 'Oklahoma': 'OK',
+    'Oregon': 'OR', 'Pennsylvania': 'PA', 'Rhode Island': 'RI', 'South Carolina': 'SC',
+    'South Dakota': 'SD', 'Tennessee': 'TN', 'Texas': 'TX', 'Utah': 'UT',
+    'Vermont': 'VT', 'Virginia': 'VA', 'Washington': 'WA', 'West Virginia': 'WV',
+    'Wisconsin': 'WI', 'Wyoming': 'WY', 'District of Columbia': 'DC'
+}
+
+# Strings (either quote), comments and brackets - everything the scanner needs
+# to track nesting without being fooled by a '{' inside a highlight string.
+_SCAN_RE = re.compile(
+    rb"""'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|//[^\n]*|/\*.*?\*/|[{}\[\]]""",
+    re.DOTALL,
+)
+
+# Tokens that differ between a TS object literal and JSON. Keys are only
+# recognised right after '{' or ',' so words inside strings are never quoted.
+_TS_JSON_RE = re.compile(
+    rb"""([{,]\s*)([A-Za-z_$][\w$]*)(?=\s*:)|'((?:[^'\\\n]|\\.)*)'"""
+    rb"""|"((?:[^"\\\n]|\\.)*)"|//[^\n]*|/\*.*?\*/|,(?=\s*[}\]])""",
+    re.DOTALL,
+)
+
+_JS_ESCAPE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+_JS_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+_STATE_KEY_RE = re.compile(rb'^\s*[\'"]?([A-Z]{2})[\'"]?\s*:\s*\[', re.MULTILINE)
+_ID_NAME_RE = re.compile(
+    rb"""\{\s*["']?id["']?\s*:\s*(['"])((?:\\.|(?!\1)[^\\\n])*)\1\s*,"""
+    rb"""\s*["']?name["']?\s*:\s*(['"])((?:\\.|(?!\3)[^\\\n])*)\3"""
+)
+_KEY_RE = re.compile(rb"""['"]?([\w$-]+)['"]?\s*:\s*$""")
+
+# Census legal-description leftovers seen in generated ids (ak-juneau-city-and,
+# in-indianapolis-city-(balance), ...).
+_ID_SUFFIX_RE = re.compile(
+    r'(?:-(?:city-and-borough|consolidated-government|unified-government'
+    r'|metropolitan-government|metro-government|metro-township|city-balance'
+    r'|city-and|corporation|municipality|balance|cdp))+$'
+)
+_ID_WORD_RE = re.compile(r'(?<=-)(st|ste|mt|ft)(?=-|$)')
+_ID_WORDS = {'st': 'saint', 'ste': 'sainte', 'mt': 'mount', 'ft': 'fort'}
+
+# Trailing legal descriptors. Case-sensitive on purpose: "Carson City" and
+# "Boise City city" keep their capitalized City.
+_DESCRIPTOR_RE = re.compile(
+    r'\s+(?:\(balance\)|city and borough|city and|metropolitan government|metro government'
+    r'|consolidated government|unified government|metro township|charter township|corporation'
+    r'|municipality|plantation|borough|township|village|city|town|CDP)$'
+)
+_GOVERNMENT_RE = re.compile(r'government|metro township')
+
+
+# ============================================================
+# TS literal -> JSON
+# ============================================================
+
+def _unescape_js(s):
+    """Decode JS string escapes (\\' is legal in JS, not in JSON)."""
+    def repl(m):
+        esc = m.group(1)
+        if esc[0] in 'ux' and len(esc) > 1:
+            return chr(int(esc[1:], 16))
+        return _JS_ESCAPES.get(esc, esc)
+    return _JS_ESCAPE_RE.sub(repl, s)
+
+
+def _ts_json_token(m):
+    group = m.lastindex
+    if group == 2:
+        return m.group(1) + b'"' + m.group(2) + b'"'
+    if group == 3:
+        text = m.group(3)
+        if b'\\' not in text and b'"' not in text:
+            return b'"' + text + b'"'
+    elif group == 4:
+        text = m.group(4)
+        if b'\\' not in text:
+            return m.group(0)
+    else:
+        return b''  # comment or trailing comma
+    return json.dumps(_unescape_js(text.decode('utf-8')), ensure_ascii=False).encode('utf-8')
+
+
+def ts_to_json(raw):
+    """Convert a TS object/array literal (bytes) into JSON bytes."""
+    return _TS_JSON_RE.sub(_ts_json_token, raw)
+
+
+def parse_literal(raw):
+    """Parse a TS object/array literal (bytes or str) into Python objects."""
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    return json.loads(ts_to_json(raw))
+
+
+# ============================================================
+# Python -> TS literal
+# ============================================================
+
+_TS_IDENT_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+class TsIdent(str):
+    """A name to_ts_literal() emits as-is (a shared constant), not as a string."""
+
+    __slots__ = ()
+
+
+def ts_string(text):
+    """Single-quoted TS string, the style city-data.ts uses."""
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n') + "'"
+
+
+def to_ts_literal(value, order=None):
+    """Render parsed data as a one-line TS literal: `{ id: 'x', rental: { ... } }`.
+
+    `order` is {key: sub_order} giving the key order of objects (and of
+    objects inside arrays); keys it doesn't list follow in their own order.
+    """
+    if isinstance(value, dict):
+        if not value:
+            return '{}'
+        keys = list(value)
+        if order:
+            keys = [k for k in order if k in value] + [k for k in keys if k not in order]
+        parts = []
+        for k in keys:
+            name = k if _TS_IDENT_RE.fullmatch(k) else ts_string(k)
+            parts.append(f"{name}: {to_ts_literal(value[k], order.get(k) if order else None)}")
+        return '{ ' + ', '.join(parts) + ' }'
+    if isinstance(value, list):
+        return '[' + ', '.join(to_ts_literal(v, order) for v in value) + ']'
+    if isinstance(value, TsIdent):
+        return str(value)
+    if isinstance(value, str):
+        return ts_string(value)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return 'null'
+    return repr(value)
+
+
+# ============================================================
+# Locating entries
+# ============================================================
+
+def find_export(data, name):
+    """Return the byte offset of the opening brace of `export const <name> ... = {`."""
+    m = re.search(rb'export const ' + name.encode() + rb'\b[^=]*=\s*\{', data)
+    if not m:
+        raise ValueError(f"Could not find `export const {name}`")
+    return m.end() - 1
+
+
+def _scan(data, start):
+    """Yield (depth_before, token, start, end) for every bracket after `start`.
+
+    Stops after the bracket that closes the literal opened at `start`.
+    """
+    depth = 0
+    for m in _SCAN_RE.finditer(data, start):
+        tok = m.group(0)
+        c = tok[:1]
+        if c in b'{[':
+            yield depth, c, m.start(), m.end()
+            depth += 1
+        elif c in b'}]':
+            depth -= 1
+            yield depth, c, m.start(), m.end()
+            if depth == 0:
+                return
+
+
+def _key_before(data, lo, hi):
+    m = _KEY_RE.search(data, lo, hi)
+    return m.group(1).decode() if m else None
+
+
+def iter_record_values(data, name):
+    """Yield (key, start, end) for every value of a `Record<string, T>` export."""
+    start = find_export(data, name)
+    last = start + 1
+    value_start = None
+    for depth, c, s, e in _scan(data, start):
+        if depth == 1 and c in b'{[':
+            value_start = s
+            key = _key_before(data, last, s)
+        elif depth == 1 and c in b'}]':
+            yield key, value_start, e
+            last = e
+
+
+def iter_array_entries(data, name):
+    """Yield (key, start, end) for every object inside a `Record<string, T[]>` export.
+
+    `key` is the record key (the state code for cityData/basicCityData) and
+    start/end are byte offsets of the entry's braces.
+    """
+    start = find_export(data, name)
+    last = start + 1
+    key = None
+    entry_start = None
+    for depth, c, s, e in _scan(data, start):
+        if depth == 1:
+            if c == b'[':
+                key = _key_before(data, last, s)
+            else:
+                last = e
+        elif depth == 2:
+            if c == b'{':
+                entry_start = s
+            elif c == b'}':
+                yield key, entry_start, e
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# ============================================================
+# Loading whole modules
+# ============================================================
+
+def iter_cities(path=CITY_DATA_TS, data=None):
+    """Yield (state, city_dict) for every entry in city-data.ts, in file order."""
+    if data is None:
+        data = read_bytes(path)
+    for state, s, e in iter_array_entries(data, 'cityData'):
+        yield state, json.loads(ts_to_json(data[s:e]))
+
+
+def load_city_data(path=CITY_DATA_TS):
+    """Return cityData as {state: [city, ...]} - the same shape as the TS export."""
+    by_state = {}
+    for state, city in iter_cities(path):
+        by_state.setdefault(state, []).append(city)
+    return by_state
+
+
+def iter_basic_cities(path=BASIC_CITY_TS, data=None):
+    """Yield (state, row) for every Tier 2 row in basic-city-data.ts."""
+    if data is None:
+        data = read_bytes(path)
+    for state, s, e in iter_array_entries(data, 'basicCityData'):
+        yield state, json.loads(ts_to_json(data[s:e]))
+
+
+def load_basic_city_data(path=BASIC_CITY_TS):
+    """Return basicCityData as {state: [row, ...]}."""
+    by_state = {}
+    for state, row in iter_basic_cities(path):
+        by_state.setdefault(state, []).append(row)
+    return by_state
+
+
+def load_state_data(path=STATE_DATA_TS):
+    """Return stateData as {code: state_dict}."""
+    data = read_bytes(path)
+    return {
+        code: json.loads(ts_to_json(data[s:e]))
+        for code, s, e in iter_record_values(data, 'stateData')
+    }
+
+
+def load_regulations(path=STR_REGULATIONS_TS):
+    """Return STR_REGULATIONS as {city_id: entry} (curated cities only)."""
+    data = read_bytes(path)
+    return {
+        city_id: json.loads(ts_to_json(data[s:e]))
+        for city_id, s, e in iter_record_values(data, 'STR_REGULATIONS')
+    }
+
+
+# ============================================================
+# Patching entries in place
+# ============================================================
+
+def _field_re(key):
+    return re.compile(rb'(["\']?' + key.encode() + rb'["\']?\s*:\s*)'
+                      rb"""(-?[\d.]+(?:e-?\d+)?|true|false|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")""")
+
+
+def _value_bytes(value):
+    if isinstance(value, bool):
+        return b'true' if value else b'false'
+    if isinstance(value, str):
+        return ts_string(value).encode('utf-8')
+    return str(value).encode()
+
+
+_FIELD_RES = {}
+
+
+def set_field(raw, key, value):
+    """Replace the first `key: <number|bool|string>` in an entry's bytes.
+
+    Works for both `key: 1` and `"key":1` styles. Only use it for keys that
+    occur once per entry (population, medianHomePrice, mtrMonthlyIncome...);
+    rpr/dsi appear at several nesting levels - use set_path() for those.
+    """
+    pattern = _FIELD_RES.get(key)
+    if pattern is None:
+        pattern = _FIELD_RES[key] = _field_re(key)
+    text = _value_bytes(value)
+    return pattern.sub(lambda m: m.group(1) + text, raw, count=1)
+
+
+def _child_start(raw, start, key):
+    """Offset of the `{`/`[` of `key`'s value directly inside the literal opened at `start`."""
+    last = start + 1
+    for depth, c, s, e in _scan(raw, start):
+        if depth == 1 and c in b'{[':
+            if _key_before(raw, last, s) == key:
+                return s
+        elif depth == 1 and c in b'}]':
+            last = e
+    return None
+
+
+def _direct_spans(raw, start):
+    """Byte ranges directly inside the literal opened at `start`, nested literals excluded."""
+    spans = []
+    last = start + 1
+    for depth, c, s, e in _scan(raw, start):
+        if depth == 1 and c in b'{[':
+            spans.append((last, s))
+        elif depth == 1 and c in b'}]':
+            last = e
+        elif depth == 0:
+            spans.append((last, s))
+    return spans
+
+
+def set_path(raw, path, value):
+    """set_field() for a dotted path ('investmentMetrics.rpr', 'marketScore.rpr').
+
+    Every segment is matched at its own nesting level, so a plain 'rpr'
+    only touches the entry's top-level rpr. Missing paths leave `raw` as is.
+    """
+    *parents, key = path.split('.')
+    start = raw.index(b'{')
+    for parent in parents:
+        start = _child_start(raw, start, parent)
+        if start is None:
+            return raw
+    pattern = _FIELD_RES.get(key)
+    if pattern is None:
+        pattern = _FIELD_RES[key] = _field_re(key)
+    text = _value_bytes(value)
+    for lo, hi in _direct_spans(raw, start):
+        m = pattern.search(raw, lo, hi)
+        if m:
+            return raw[:m.start(2)] + text + raw[m.end(2):]
+    return raw
+
+
+def patch_entries(data, name, fn):
+    """Rebuild `data` with fn(key, raw_entry) applied to every entry of `name`.
+
+    fn returns replacement bytes or None to keep the entry. Returns
+    (new_data, changed_count); bytes between entries are copied as-is.
+    """
+    parts = []
+    last = 0
+    changed = 0
+    for key, s, e in iter_array_entries(data, name):
+        new = fn(key, data[s:e])
+        if new is not None and new != data[s:e]:
+            parts.append(data[last:s])
+            parts.append(new)
+            last = e
+            changed += 1
+    parts.append(data[last:])
+    return b''.join(parts), changed
+
+
+# ============================================================
+# Ids and names
+# ============================================================
+
+def slugify(text):
+    """'Cañon City' -> 'canon-city'. ASCII-folds, lowercases, joins words with '-'."""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def normalize_id(city_id):
+    """Comparison key for ids that may differ only by spelling artifacts.
+
+    'ak-juneau-city-and' and 'ak-juneau' both map to 'ak-juneau';
+    'ga-st-simons-island' and 'ga-saint-simons-island' both map to
+    'ga-saint-simons-island'. Not a valid id - only use it for matching.
+    """
+    slug = slugify(city_id)
+    stripped = _ID_SUFFIX_RE.sub('', slug)
+    if len(stripped) > 3:
+        slug = stripped
+    return slug[:2] + _ID_WORD_RE.sub(lambda m: _ID_WORDS[m.group(1)], slug[2:])
+
+
+def normalize_place_name(name):
+    """Strip Census legal descriptors from a place name.
+
+    Consolidated governments keep only the city part:
+    "Louisville/Jefferson County metro government (balance)" -> "Louisville".
+    """
+    name = name.strip()
+    consolidated = bool(_GOVERNMENT_RE.search(name)) and 'metro township' not in name
+    while True:
+        stripped = _DESCRIPTOR_RE.sub('', name)
+        if stripped == name or not stripped:
+            break
+        name = stripped
+    if consolidated:
+        name = re.split(r'[-/,]', name)[0].strip()
+    return name
+
+
+def iter_id_names(data, name):
+    """Fast (state, id, name) pass for exports whose entries start with id, name.
+
+    Skips the full literal parse - only the record keys and the two leading
+    string fields are matched - for tools that only need identities.
+    """
+    start = find_export(data, name)
+    end = data.find(b'\n};', start)
+    end = len(data) if end < 0 else end
+    headers = [(m.start(), m.group(1).decode()) for m in _STATE_KEY_RE.finditer(data, start, end)]
+    i = -1
+    for m in _ID_NAME_RE.finditer(data, start, end):
+        while i + 1 < len(headers) and headers[i + 1][0] < m.start():
+            i += 1
+        city_id = m.group(2).decode('utf-8')
+        city_name = m.group(4).decode('utf-8')
+        if '\\' in city_name:
+            city_name = _unescape_js(city_name)
+        yield headers[i][1], city_id, city_name
+
+
+# ============================================================
+# Hashing
+# ============================================================
+
+def dumps_compact(obj):
+    """Minified, key-stable JSON used for both output files and content hashes."""
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
+
+
+def content_hash(obj):
+    """sha256 of the compact JSON form of `obj` (bytes are hashed as-is)."""
+    if not isinstance(obj, bytes):
+        obj = dumps_compact(obj).encode('utf-8')
+    return hashlib.sha256(obj).hexdigest()
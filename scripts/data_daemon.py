@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Resident data daemon: parse the data modules once, answer queries over a
+Unix socket.
+
+    python3 scripts/data_daemon.py serve [--socket PATH]
+    python3 scripts/data_daemon.py query '{"op": "get", "id": "tn-nashville"}'
+
+city-data.ts, basic-city-data.ts and state-data.ts are parsed at startup.
+Before every request the daemon stats the three files and re-parses only
+the ones whose mtime or size changed, so edits made during a session show up
+on the next query without restarting it.
+
+Protocol: one JSON object per line in each direction. Requests carry an
+"op"; responses are {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+
+  ping                                   -> "pong"
+  stats                                  -> counts, load times, file versions
+  get        id                          -> full entry, else Tier 2 row
+  state      code                        -> stateData[code]
+  filter     state?, where?, fields?, sort?, desc?, limit?
+                                         -> matching full cities
+  aggregate  group_by, metric, where?    -> {group: {count, mean, min, max}}
+  reload                                 -> force a re-parse of every file
+
+`where` maps dotted paths to a value or to {"min": x, "max": y, "in": [...]},
+e.g. {"amenityDelta.marketType": "lake", "rental.occupancyRate": {"min": 60}}.
+`group_by` and `metric` are dotted paths; group_by may be "state".
+
+The socket defaults to $EDGE_DATA_SOCKET or /tmp/edge-data.sock.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from city_data import (
+    BASIC_CITY_TS, CITY_DATA_TS, STATE_DATA_TS, iter_basic_cities, iter_cities, load_state_data,
+)
+
+DEFAULT_SOCKET = os.environ.get('EDGE_DATA_SOCKET', '/tmp/edge-data.sock')
+DEFAULT_LIMIT = 100
+
+
+def _path_get(obj, path):
+    for key in path.split('.'):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _matches(value, cond):
+    if isinstance(cond, dict):
+        if 'in' in cond and value not in cond['in']:
+            return False
+        if 'min' in cond and (value is None or value < cond['min']):
+            return False
+        if 'max' in cond and (value is None or value > cond['max']):
+            return False
+        return True
+    return value == cond
+
+
+class DataIndex:
+    """Parsed data files plus the lookups the daemon serves."""
+
+    def __init__(self, city_path=CITY_DATA_TS, basic_path=BASIC_CITY_TS, state_path=STATE_DATA_TS):
+        self.paths = {'cities': city_path, 'basic': basic_path, 'states': state_path}
+        self.versions = {}
+        self.load_times = {}
+        self.cities = []      # [(state, city)], duplicate ids dropped (first wins, as in getAllCities)
+        self.by_id = {}
+        self.basic_by_id = {}
+        self.states = {}
+        # Re-entrant: handle() holds it while op_reload() calls refresh()
+        self.lock = threading.RLock()
+        self.refresh(force=True)
+
+    def _version(self, name):
+        st = os.stat(self.paths[name])
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, name):
+        start = time.time()
+        path = self.paths[name]
+        if name == 'cities':
+            cities, by_id = [], {}
+            for state, city in iter_cities(path):
+                if city['id'] not in by_id:
+                    city['state'] = state
+                    by_id[city['id']] = city
+                    cities.append((state, city))
+            self.cities, self.by_id = cities, by_id
+        elif name == 'basic':
+            self.basic_by_id = {row['id']: row for _, row in iter_basic_cities(path)}
+        else:
+            self.states = load_state_data(path)
+        self.load_times[name] = round(time.time() - start, 3)
+
+    def refresh(self, force=False):
+        """Re-parse files that changed since the last load. Returns the reloaded names."""
+        reloaded = []
+        with self.lock:
+            for name in self.paths:
+                version = self._version(name)
+                if force or self.versions.get(name) != version:
+                    self._load(name)
+                    self.versions[name] = version
+                    reloaded.append(name)
+        return reloaded
+
+    # -- queries ------------------------------------------------------
+
+    def _where(self, where):
+        where = where or {}
+        state = where.get('state')
+        for st, city in self.cities:
+            if state and st != state:
+                continue
+            if all(_matches(_path_get(city, path), cond) for path, cond in where.items() if path != 'state'):
+                yield city
+
+    def op_ping(self, req):
+        return 'pong'
+
+    def op_stats(self, req):
+        return {
+            'cities': len(self.cities),
+            'basic': len(self.basic_by_id),
+            'states': len(self.states),
+            'loadSeconds': self.load_times,
+            'versions': {name: list(v) for name, v in self.versions.items()},
+        }
+
+    def op_get(self, req):
+        city_id = req['id']
+        return self.by_id.get(city_id) or self.basic_by_id.get(city_id)
+
+    def op_state(self, req):
+        return self.states.get(req['code'].upper())
+
+    def op_filter(self, req):
+        where = dict(req.get('where') or {})
+        if req.get('state'):
+            where['state'] = req['state'].upper()
+        rows = list(self._where(where))
+        if req.get('sort'):
+            key, desc = req['sort'], bool(req.get('desc'))
+            # Entries without the field sort last in both directions
+            rows.sort(key=lambda c: ((_path_get(c, key) is None) != desc, _path_get(c, key) or 0),
+                      reverse=desc)
+        total = len(rows)
+        rows = rows[:req.get('limit', DEFAULT_LIMIT)]
+        fields = req.get('fields')
+        if fields:
+            rows = [{f: _path_get(c, f) for f in fields} for c in rows]
+        return {'total': total, 'rows': rows}
+
+    def op_aggregate(self, req):
+        group_by, metric = req['group_by'], req['metric']
+        groups = {}
+        for city in self._where(req.get('where')):
+            value = _path_get(city, metric)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            g = groups.setdefault(str(_path_get(city, group_by)), [0, 0.0, value, value])
+            g[0] += 1
+            g[1] += value
+            g[2] = min(g[2], value)
+            g[3] = max(g[3], value)
+        return {k: {'count': n, 'mean': round(total / n, 4), 'min': lo, 'max': hi}
+                for k, (n, total, lo, hi) in sorted(groups.items())}
+
+    def op_reload(self, req):
+        return self.refresh(force=True)
+
+    def handle(self, req):
+        if not isinstance(req, dict):
+            raise ValueError(f"request must be a JSON object, got {type(req).__name__}")
+        op = getattr(self, f"op_{req.get('op')}", None)
+        if op is None:
+            raise ValueError(f"unknown op {req.get('op')!r}")
+        if req.get('op') != 'reload':
+            self.refresh()
+        with self.lock:
+            return op(req)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                result = self.server.index.handle(json.loads(line))
+                reply = {'ok': True, 'result': result}
+            except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+                reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply, separators=(',', ':')).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class DataServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, index):
+        self.index = index
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _Handler)
+
+
+def serve(socket_path=DEFAULT_SOCKET, **paths):
+    index = DataIndex(**paths)
+    stats = index.op_stats({})
+    print(f"Loaded {stats['cities']} cities, {stats['basic']} Tier 2 rows, {stats['states']} states "
+          f"({sum(index.load_times.values()):.2f}s)")
+    server = DataServer(socket_path, index)
+    print(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def query(request, socket_path=DEFAULT_SOCKET, timeout=30):
+    """Send one request to a running daemon and return its result (raises on error)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        buf = b''
+        while not buf.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    if not buf.strip():
+        raise RuntimeError('daemon closed the connection without a reply')
+    try:
+        reply = json.loads(buf)
+    except ValueError as e:
+        raise RuntimeError(f"malformed reply from daemon ({e})") from None
+    if not isinstance(reply, dict) or not reply.get('ok'):
+        raise RuntimeError(reply.get('error') if isinstance(reply, dict) else f"malformed reply {reply!r}")
+    return reply['result']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resident data daemon for the Edge data files.')
+    sub = parser.add_subparsers(dest='action', required=True)
+    serve_p = sub.add_parser('serve', help='Parse the data files and serve queries')
+    serve_p.add_argument('--socket', default=DEFAULT_SOCKET)
+    serve_p.add_argument('--city-data', default=CITY_DATA_TS)
+    serve_p.add_argument('--basic', default=BASIC_CITY_TS)
+    serve_p.add_argument('--state-data', default=STATE_DATA_TS)
+    query_p = sub.add_parser('query', help='Send one JSON request to a running daemon')
+    query_p.add_argument('request', help='JSON request, e.g. \'{"op": "stats"}\'')
+    query_p.add_argument('--socket', default=DEFAULT_SOCKET)
+    args = parser.parse_args(argv)
+
+    if args.action == 'serve':
+        serve(args.socket, city_path=args.city_data, basic_path=args.basic, state_path=args.state_data)
+        return 0
+    try:
+        result = query(json.loads(args.request), args.socket)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"data_daemon: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
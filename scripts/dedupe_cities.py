@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Remove duplicate city entries from city-data.ts, keeping the entry with the
+higher marketScore.overall (the first one on a tie).
+
+Same policy as fix_duplicates.py / remove_duplicates.py at the repo root, but
+entries are located with the string-aware scanner in city_data.py instead of
+brace-counting regexes, which cut entries short at the first nested `}`
+(dsiDetails, topAmenities). Only the removed entries (and the lines they
+leave empty) are touched; every other byte is kept.
+
+Usage: python3 scripts/dedupe_cities.py [--city-data PATH] [--dry-run]
+"""
+
+import argparse
+import re
+import sys
+
+from city_data import CITY_DATA_TS, iter_array_entries, read_bytes
+from validate_city_data import add_no_validate, check, snapshot
+
+_ID_RE = re.compile(rb"""["']?id["']?\s*:\s*['"]([^'"]+)['"]""")
+_OVERALL_RE = re.compile(rb"""["']?overall["']?\s*:\s*(-?[\d.]+)""")
+
+
+def find_duplicates(data):
+    """Return (removals, kept) where removals is [(state, id, start, end, score)]."""
+    by_id = {}
+    for state, s, e in iter_array_entries(data, 'cityData'):
+        m = _ID_RE.search(data, s, e)
+        if not m:
+            continue
+        score_m = _OVERALL_RE.search(data, s, e)
+        score = float(score_m.group(1)) if score_m else 0
+        by_id.setdefault(m.group(1).decode('utf-8'), []).append((state, s, e, score))
+
+    removals = []
+    kept = {}
+    for city_id, entries in by_id.items():
+        if len(entries) < 2:
+            continue
+        # max() keeps the first entry among equal scores
+        best = max(entries, key=lambda x: x[3])
+        kept[city_id] = best
+        removals.extend((state, city_id, s, e, score) for state, s, e, score in entries if (s, e) != best[1:3])
+    removals.sort(key=lambda r: r[2])
+    return removals, kept
+
+
+def _removal_span(data, start, end):
+    """Extend [start, end) over the trailing comma, and over the whole line if nothing else is on it."""
+    m = re.compile(rb'[ \t]*,?').match(data, end)
+    end = m.end()
+    line_start = data.rfind(b'\n', 0, start) + 1
+    line_end = data.find(b'\n', end)
+    line_end = len(data) if line_end < 0 else line_end
+    if not data[line_start:start].strip() and not data[end:line_end].strip():
+        return line_start, min(line_end + 1, len(data))
+    return start, end
+
+
+def remove_entries(data, spans):
+    parts = []
+    last = 0
+    for start, end in spans:
+        start, end = _removal_span(data, start, end)
+        parts.append(data[last:start])
+        last = end
+    parts.append(data[last:])
+    return b''.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Remove duplicate city entries from city-data.ts.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--dry-run', action='store_true')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    baseline = None if args.no_validate else snapshot(args.city_data)
+
+    data = read_bytes(args.city_data)
+    removals, kept = find_duplicates(data)
+    for state, city_id, _, _, score in removals:
+        best = kept[city_id]
+        print(f"{state}: {city_id} - keeping score {best[3]:g}, removing score {score:g}")
+    print(f"\nTotal duplicates removed: {len(removals)}" + (" [dry run]" if args.dry_run else ""))
+
+    if removals and not args.dry_run:
+        with open(args.city_data, 'wb') as f:
+            f.write(remove_entries(data, [(s, e) for _, _, s, e, _ in removals]))
+        if not args.no_validate and check(args.city_data, baseline=baseline):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
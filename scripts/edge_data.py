@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Edge data tooling.
+
+    python3 scripts/edge_data.py <command> [options]
+    python3 scripts/edge_data.py <command> --help
+
+Each command is an existing script's main(argv); its module is imported
+only when that command runs, so `--help` and the quick commands don't pay
+for generate_new_cities.py's city tables or the download code in
+monthly-data-update.py. Every data path is an option of its command
+(--city-data, --basic, --entries, ...); defaults are relative to the repo
+root, which is the working directory unless -C is given.
+
+New tools register themselves in COMMANDS.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# command -> (module name, or a .py file name in scripts/ for hyphenated scripts, help)
+COMMANDS = {
+    'validate': ('validate_city_data', 'Schema-check city-data.ts or a generated entries file'),
+    'dedupe': ('dedupe_cities', 'Remove duplicate ids from city-data.ts'),
+    'format': ('format_city_data', 'Rewrite city-data.ts with one canonical line per city'),
+    'generate': ('generate_new_cities', 'Generate new city entries into an entries file'),
+    'insert': ('insert_cities', 'Insert generated entries into city-data.ts'),
+    'monthly-update': ('monthly-data-update.py', 'Zillow / Redfin / Freddie Mac monthly refresh'),
+    'gates': ('anomaly_gates', 'Monthly anomaly gates between two versions of state/inventory data'),
+    'propagate-prices': ('propagate_appreciation', 'Scale city prices by the state ZHVI change; recompute RPR / DSI / scores'),
+    'export': ('export_city_json', 'Per-state JSON export with gzip/brotli siblings'),
+    'sitemaps': ('generate_sitemaps', 'Regenerate city/state sitemaps with content-hash lastmod'),
+    'llms-txt': ('generate_llms_txt', 'Regenerate the market-data sections of public/llms*.txt'),
+    'facets': ('build_facets', 'Facet id indexes and top-K leaderboards (public/data/facets)'),
+    'state-aggregates': ('build_state_aggregates', 'Per-state rollups of city-data.ts (src/data/state-aggregates.ts)'),
+    'search-index': ('build_search_index', 'Prefix/trigram city search index (public/data/search-index.json)'),
+    'export-rows': ('export_city_rows', 'Flattened city_rows staging table as COPY TSV/CSV or SQLite'),
+    'sync-full-data': ('sync_has_full_data', 'Sync hasFullData in basic-city-data.ts'),
+    'regenerate-basic': ('regenerate_basic_cities', 'Rebuild basic-city-data.ts from a Census SUB-EST CSV'),
+    'hud-fmr': ('ingest_hud_fmr', 'Set mtrMonthlyIncome from a HUD county FMR CSV'),
+    'near-dups': ('find_near_duplicates', 'Report probable duplicate cities'),
+    'score-delta': ('score_delta', 'NDJSON delta of cities whose score inputs changed'),
+    'what-if': ('what_if_grid', 'Cash flow / survival over a rate x down x expense grid (.npz)'),
+    'monte-carlo': ('monte_carlo', 'Simulated revenue percentiles and break-even probability per city'),
+    'daemon': ('data_daemon', 'Serve the parsed data files over a Unix socket (serve | query)'),
+}
+
+
+def load_command(name):
+    """Import and return the module behind a command."""
+    target = COMMANDS[name][0]
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    if not target.endswith('.py'):
+        return importlib.import_module(target)
+    module_name = target[:-3].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPTS_DIR, target))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = [
+        "usage: edge_data.py [-C DIR] <command> [options]",
+        "",
+        "commands:",
+    ]
+    lines += [f"  {name.ljust(width)}  {help_text}" for name, (_, help_text) in COMMANDS.items()]
+    lines += [
+        "",
+        "options:",
+        "  -C DIR      run as if started in DIR (default: current directory)",
+        "",
+        "Run `edge_data.py <command> --help` for a command's options.",
+    ]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ['-C']:
+        if len(argv) < 2:
+            print(usage(), file=sys.stderr)
+            return 2
+        os.chdir(argv[1])
+        argv = argv[2:]
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"edge_data.py: unknown command {command!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module = load_command(command)
+    # So each command's argparse usage reads "edge_data.py <command>"
+    sys.argv[0] = f"edge_data.py {command}"
+    return module.main(rest) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Export city-data.ts + basic-city-data.ts as per-state JSON for lazy client loading.
+
+Writes to public/data/cities/:
+  - <state>.json     minified {"state", "cities", "basic"} document
+  - <state>.json.gz  gzip -9 sibling
+  - <state>.json.br  brotli q11 sibling (only if the `brotli` module is installed)
+  - manifest.json    content hash + byte sizes per state
+
+The export is incremental: a state is only re-serialized and recompressed when
+its content hash differs from the one in the existing manifest (or one of its
+files is missing). Brotli at quality 11 is the slow part, so an unchanged
+month only costs the parse.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+from city_data import (
+    CITY_DATA_TS, BASIC_CITY_TS, content_hash, iter_basic_cities, iter_cities,
+)
+
+try:
+    import brotli
+except ImportError:  # optional - .br files are skipped without it
+    brotli = None
+
+OUTPUT_DIR = 'public/data/cities'
+MANIFEST_VERSION = 1
+
+
+def build_state_documents(city_path=CITY_DATA_TS, basic_path=BASIC_CITY_TS):
+    """Group both tiers by state. Returns {state: document}."""
+    docs = {}
+    for state, city in iter_cities(city_path):
+        docs.setdefault(state, {'state': state, 'cities': [], 'basic': []})['cities'].append(city)
+    for state, row in iter_basic_cities(basic_path):
+        docs.setdefault(state, {'state': state, 'cities': [], 'basic': []})['basic'].append(row)
+    return docs
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('states', {})
+
+
+def _write(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def export(output_dir=OUTPUT_DIR, city_path=CITY_DATA_TS, basic_path=BASIC_CITY_TS, force=False):
+    """Export every state, recompressing only states whose content changed."""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    previous = {} if force else load_manifest(manifest_path)
+
+    docs = build_state_documents(city_path, basic_path)
+    states = {}
+    written = []
+    for state in sorted(docs):
+        # Key order is kept as in the TS source; only the hash uses sorted keys
+        body = json.dumps(docs[state], separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = content_hash(body)
+        name = f"{state.lower()}.json"
+        base = os.path.join(output_dir, name)
+        suffixes = ['', '.gz'] + (['.br'] if brotli else [])
+
+        prev = previous.get(state)
+        if prev and prev['hash'] == digest and all(os.path.exists(base + s) for s in suffixes):
+            states[state] = prev
+            continue
+
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        entry = {'file': name, 'hash': digest, 'bytes': len(body), 'gzip': len(gz),
+                 'cities': len(docs[state]['cities']), 'basic': len(docs[state]['basic'])}
+        _write(base, body)
+        _write(base + '.gz', gz)
+        if brotli:
+            br = brotli.compress(body, quality=11)
+            _write(base + '.br', br)
+            entry['brotli'] = len(br)
+        elif os.path.exists(base + '.br'):
+            os.remove(base + '.br')  # stale - would no longer match the .json
+        states[state] = entry
+        written.append(state)
+
+    # Drop files for states that no longer exist in the data
+    for state in set(previous) - set(states):
+        for suffix in ('', '.gz', '.br'):
+            path = os.path.join(output_dir, previous[state]['file'] + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+    manifest = {'version': MANIFEST_VERSION, 'states': states}
+    _write(manifest_path, (json.dumps(manifest, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+    return states, written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export per-state city JSON with gzip/brotli siblings.')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--force', action='store_true', help='Rewrite every state even if unchanged')
+    args = parser.parse_args(argv)
+    start = time.time()
+    states, written = export(args.output_dir, args.city_data, args.basic, force=args.force)
+
+    raw = sum(s['bytes'] for s in states.values())
+    gz = sum(s['gzip'] for s in states.values())
+    print(f"Exported {len(states)} states to {args.output_dir}/")
+    print(f"  Recompressed: {len(written)} {written if written else ''}")
+    print(f"  Unchanged:    {len(states) - len(written)}")
+    print(f"  Total JSON: {raw / 1024:.0f} KB, gzip: {gz / 1024:.0f} KB", end='')
+    if brotli:
+        br = sum(s.get('brotli', 0) for s in states.values())
+        print(f", brotli: {br / 1024:.0f} KB")
+    else:
+        print("\n  (brotli module not installed - .br files skipped)")
+    print(f"  Done in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
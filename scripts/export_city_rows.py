@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Export cities as flat rows into a separate `city_rows` staging table:
+COPY-ready TSV/CSV or a SQLite file.
+
+This is not the `cities` table migrate-cities-to-supabase.ts fills and
+/api/cities/search reads. That table's market_score, cash_on_cash and
+full_data come from getAllCities() (src/lib/scoring.ts with the regulation
+penalty), so the migration stays the way to load it. city_rows carries the
+raw city-data.ts fields, for analysis or SQL-side checks.
+
+    python3 scripts/export_city_rows.py --format csv --output /tmp/cities.csv
+    psql "$DATABASE_URL" -f <(python3 scripts/export_city_rows.py --schema)
+    psql "$DATABASE_URL" -c "\\copy city_rows FROM '/tmp/cities.csv' WITH (FORMAT csv, HEADER true)"
+
+One row per city, with marketScore, investmentMetrics, saturationRisk,
+rental and incomeBySize flattened into columns; highlights and topAmenities
+stay as JSON text. Rows are written as each entry is parsed, so the
+serialized dataset is never held in memory. --include-basic appends Tier 2
+rows (has_full_data = false) the same way migrate-cities-to-supabase.ts
+does: skipping ids and name+state pairs that already have a full entry.
+
+Formats:
+  tsv     PostgreSQL COPY text format (\\N for NULL, backslash escapes)
+  csv     COPY ... WITH (FORMAT csv, HEADER true)
+  sqlite  a city_rows table in a new SQLite file (--output required)
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from city_data import BASIC_CITY_TS, CITY_DATA_TS, iter_basic_cities, iter_cities
+
+TABLE = 'city_rows'
+
+
+def _json(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+# (column, SQL type, getter(state, city)) - order is the file/table column order
+COLUMNS = (
+    ('id', 'TEXT PRIMARY KEY', lambda st, c: c['id']),
+    ('name', 'TEXT NOT NULL', lambda st, c: c['name']),
+    ('state', 'TEXT NOT NULL', lambda st, c: st),
+    ('county', 'TEXT', lambda st, c: c.get('county')),
+    ('type', 'TEXT', lambda st, c: c.get('type')),
+    ('population', 'INTEGER', lambda st, c: c.get('population')),
+    ('has_full_data', 'BOOLEAN NOT NULL', lambda st, c: 'rental' in c),
+    ('rpr', 'REAL', lambda st, c: c.get('rpr')),
+    ('dsi', 'BOOLEAN', lambda st, c: c.get('dsi')),
+    ('score_overall', 'INTEGER', lambda st, c: c['marketScore']['overall']),
+    ('score_demand', 'INTEGER', lambda st, c: c['marketScore']['demand']),
+    ('score_affordability', 'INTEGER', lambda st, c: c['marketScore']['affordability']),
+    ('score_regulation', 'INTEGER', lambda st, c: c['marketScore']['regulation']),
+    ('score_seasonality', 'INTEGER', lambda st, c: c['marketScore']['seasonality']),
+    ('score_saturation', 'INTEGER', lambda st, c: c['marketScore']['saturation']),
+    ('score_rpr', 'INTEGER', lambda st, c: c['marketScore']['rpr']),
+    ('verdict', 'TEXT', lambda st, c: c['marketScore']['verdict']),
+    ('rpr_rating', 'TEXT', lambda st, c: c['investmentMetrics']['rprRating']),
+    ('monthly_mortgage', 'REAL', lambda st, c: c['investmentMetrics']['dsiDetails']['monthlyMortgage']),
+    ('monthly_expenses', 'REAL', lambda st, c: c['investmentMetrics']['dsiDetails']['monthlyExpenses']),
+    ('net_monthly_income', 'REAL', lambda st, c: c['investmentMetrics']['dsiDetails']['netMonthlyIncome']),
+    ('str_to_housing_ratio', 'REAL', lambda st, c: c['saturationRisk']['strToHousingRatio']),
+    ('listings_per_thousand', 'REAL', lambda st, c: c['saturationRisk']['listingsPerThousand']),
+    ('yoy_supply_growth', 'REAL', lambda st, c: c['saturationRisk']['yoySupplyGrowth']),
+    ('risk_level', 'TEXT', lambda st, c: c['saturationRisk']['riskLevel']),
+    ('avg_adr', 'REAL', lambda st, c: c['rental']['avgADR']),
+    ('occupancy_rate', 'REAL', lambda st, c: c['rental']['occupancyRate']),
+    ('monthly_revenue', 'REAL', lambda st, c: c['rental']['monthlyRevenue']),
+    ('median_home_price', 'REAL', lambda st, c: c['rental']['medianHomePrice']),
+    ('revenue_p75', 'REAL', lambda st, c: c['rental']['revenue75thPercentile']),
+    ('revenue_p90', 'REAL', lambda st, c: c['rental']['revenue90thPercentile']),
+    ('mtr_monthly_income', 'REAL', lambda st, c: c['rental']['mtrMonthlyIncome']),
+    ('income_1br', 'REAL', lambda st, c: c['incomeBySize']['oneBR']),
+    ('income_2br', 'REAL', lambda st, c: c['incomeBySize']['twoBR']),
+    ('income_3br', 'REAL', lambda st, c: c['incomeBySize']['threeBR']),
+    ('income_4br', 'REAL', lambda st, c: c['incomeBySize']['fourBR']),
+    ('income_5br', 'REAL', lambda st, c: c['incomeBySize']['fiveBR']),
+    ('income_6br', 'REAL', lambda st, c: c['incomeBySize']['sixPlusBR']),
+    ('best_performer', 'TEXT', lambda st, c: c['incomeBySize']['bestPerformer']),
+    ('market_type', 'TEXT', lambda st, c: c['amenityDelta']['marketType']),
+    ('top_amenities', 'TEXT', lambda st, c: _json(c['amenityDelta']['topAmenities'])),
+    ('str_status', 'TEXT', lambda st, c: c.get('strStatus')),
+    ('permit_required', 'BOOLEAN', lambda st, c: c.get('permitRequired')),
+    ('highlights', 'TEXT', lambda st, c: _json(c['highlights'])),
+)
+COLUMN_NAMES = [name for name, _, _ in COLUMNS]
+# Tier 2 rows only have these; every other column is NULL
+BASIC_COLUMNS = {'id', 'name', 'state', 'population', 'has_full_data'}
+
+
+def schema_sql(table=TABLE):
+    cols = ',\n'.join(f"  {name} {sql_type}" for name, sql_type, _ in COLUMNS)
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n{cols}\n);\n"
+
+
+def iter_rows(city_path=CITY_DATA_TS, basic_path=BASIC_CITY_TS, include_basic=False):
+    """Yield one tuple per city (first entry per id), then Tier 2 rows if asked."""
+    seen = set()
+    names = set()
+    for state, city in iter_cities(city_path):
+        if city['id'] in seen:
+            continue
+        seen.add(city['id'])
+        names.add((city['name'].lower(), state))
+        yield tuple(get(state, city) for _, _, get in COLUMNS)
+    if not include_basic:
+        return
+    for state, row in iter_basic_cities(basic_path):
+        if row['id'] in seen or (row['name'].lower(), row['state']) in names:
+            continue
+        seen.add(row['id'])
+        yield tuple(get(state, row) if name in BASIC_COLUMNS else None for name, _, get in COLUMNS)
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_text(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def write_tsv(rows, out):
+    n = 0
+    for row in rows:
+        out.write('\t'.join(_copy_text(v) for v in row))
+        out.write('\n')
+        n += 1
+    return n
+
+
+def write_csv(rows, out):
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(COLUMN_NAMES)
+    n = 0
+    for row in rows:
+        # COPY CSV: unquoted empty = NULL, booleans as true/false
+        writer.writerow(['' if v is None else ('true' if v else 'false') if isinstance(v, bool) else v
+                         for v in row])
+        n += 1
+    return n
+
+
+def write_sqlite(rows, path, table=TABLE):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(schema_sql(table))
+        placeholders = ','.join('?' * len(COLUMNS))
+        cur = conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+        n = cur.rowcount
+    conn.close()
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export flattened city rows for a bulk COPY / SQLite load.')
+    parser.add_argument('--format', choices=('tsv', 'csv', 'sqlite'), default='tsv')
+    parser.add_argument('--output', help='Output file (default stdout; required for sqlite)')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--include-basic', action='store_true', help='Append Tier 2 rows with NULL metrics')
+    parser.add_argument('--schema', action='store_true', help=f'Print CREATE TABLE {TABLE} and exit')
+    args = parser.parse_args(argv)
+
+    if args.schema:
+        sys.stdout.write(schema_sql())
+        return 0
+
+    start = time.time()
+    rows = iter_rows(args.city_data, args.basic, args.include_basic)
+    if args.format == 'sqlite':
+        if not args.output:
+            parser.error('--format sqlite needs --output')
+        n = write_sqlite(rows, args.output)
+    else:
+        writer = write_tsv if args.format == 'tsv' else write_csv
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                n = writer(rows, f)
+        else:
+            n = writer(rows, sys.stdout)
+    print(f"Exported {n} rows ({args.format}) in {time.time() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Find probable duplicate cities that exact-id dedup misses.
+
+fix_duplicates.py / remove_duplicates.py only catch identical ids. This finds
+pairs like ak-juneau-city-and vs ak-juneau or st-simons-island vs
+saint-simons-island, across city-data.ts and basic-city-data.ts.
+
+Instead of comparing every pair (~15k ids), each state gets a trigram
+inverted index over normalized id + name. Trigrams are ordered rarest-first
+and only each record's prefix (the part any pair above the threshold must
+share) goes into the index, so only real candidates get scored (Dice
+coefficient on trigram sets). The whole run takes well under a second.
+
+Pairs where a full city and its own Tier 2 row share an id are not
+duplicates and are skipped.
+
+Usage: python3 scripts/find_near_duplicates.py [--threshold 0.8]
+"""
+
+import argparse
+import math
+import re
+import sys
+import time
+from collections import defaultdict
+
+from city_data import CITY_DATA_TS, BASIC_CITY_TS, iter_id_names, normalize_id, read_bytes
+
+DEFAULT_THRESHOLD = 0.8
+
+
+def _key(city_id, name):
+    """Text the trigrams come from: normalized id without the state prefix."""
+    norm = normalize_id(city_id).split('-', 1)[-1]
+    name_norm = normalize_id('xx-' + name).split('-', 1)[-1] if name else ''
+    # Prefer the name when it carries more information than a truncated id
+    text = name_norm if len(name_norm) > len(norm) else norm
+    return re.sub(r'[^a-z0-9]+', ' ', text).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_records(city_path=CITY_DATA_TS, basic_path=BASIC_CITY_TS):
+    """Return [(state, source, id, name)] for both tiers, deduped on (source, id)."""
+    records = []
+    seen = set()
+    for source, path, export in (('full', city_path, 'cityData'), ('basic', basic_path, 'basicCityData')):
+        for state, city_id, name in iter_id_names(read_bytes(path), export):
+            if (source, city_id) not in seen:
+                seen.add((source, city_id))
+                records.append((state, source, city_id, name))
+    return records
+
+
+def _prefix_len(size, threshold):
+    """Tokens of a rarest-first set that any Dice >= threshold partner must hit.
+
+    Dice >= t forces an overlap of at least t*|A|/(2-t), so two qualifying
+    sets always share a token within the first |A| - overlap + 1 of each.
+    """
+    overlap = math.ceil(threshold * size / (2 - threshold) - 1e-9)
+    return max(1, size - overlap + 1)
+
+
+def find_near_duplicates(records, threshold=DEFAULT_THRESHOLD):
+    """Return [(score, state, a, b)] sorted by score desc; a/b are (source, id, name)."""
+    by_state = defaultdict(list)
+    for state, source, city_id, name in records:
+        by_state[state].append((source, city_id, name))
+
+    results = []
+    for state, items in by_state.items():
+        grams = [trigrams(_key(city_id, name)) for _, city_id, name in items]
+        freq = defaultdict(int)
+        for g in grams:
+            for t in g:
+                freq[t] += 1
+
+        index = defaultdict(list)
+        for i, g in enumerate(grams):
+            ordered = sorted(g, key=lambda t: (freq[t], t))
+            candidates = set()
+            for t in ordered[:_prefix_len(len(g), threshold)]:
+                candidates.update(index[t])
+                index[t].append(i)
+
+            for j in candidates:
+                shared = len(g & grams[j])
+                score = 2 * shared / (len(g) + len(grams[j]))
+                if score < threshold:
+                    continue
+                a, b = items[j], items[i]
+                if a[1] == b[1] and a[0] != b[0]:
+                    continue  # a full city and its own Tier 2 row
+                results.append((score, state, a, b))
+
+    results.sort(key=lambda r: (-r[0], r[1], r[2][1], r[3][1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report probable duplicate cities.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum trigram Dice similarity (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--limit', type=int, default=200, help='Max pairs to print')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    records = load_records()
+    loaded = time.time()
+    pairs = find_near_duplicates(records, args.threshold)
+    done = time.time()
+
+    print(f"Indexed {len(records)} ids; {len(pairs)} probable duplicate pairs "
+          f"(parse {loaded - start:.2f}s, match {done - loaded:.2f}s)")
+    for score, state, a, b in pairs[:args.limit]:
+        print(f"  {score:.2f}  {state}  [{a[0]}] {a[1]} ({a[2]})  ~  [{b[0]}] {b[1]} ({b[2]})")
+    if len(pairs) > args.limit:
+        print(f"  ... and {len(pairs) - args.limit} more")
+    return 1 if pairs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
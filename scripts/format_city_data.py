@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Rewrite city-data.ts in canonical form: one city per line.
+
+- Every entry is re-rendered as a single TS-style line (unquoted keys,
+  single-quoted strings) with the fixed key order in CITY_KEY_ORDER, the
+  order format_city_entry() and the existing entries use
+- Entries are sorted by id within each state; state order, the interface
+  above the export and the helpers below it are kept byte for byte
+- Duplicate ids are kept (adjacent after sorting); dedupe_cities.py removes them
+
+Once the file is canonical, a monthly update diff is exactly the changed
+lines, and tools can stream it line by line.
+
+The rewrite is checked before anything is written: the formatted module must
+parse back to the same entries, and formatting it again must be a no-op.
+
+--compact emits a smaller module for shipping with the same exported
+`cityData: Record<string, CityData[]>`:
+
+- topAmenities lists shared by several entries become named constants
+  (AMENITIES_MOUNTAIN, ...)
+- investmentMetrics.rpr/dsi, dsiDetails.survives, the 75th/90th percentile
+  and MTR revenue multiples, and incomeBySize rows that follow one of the
+  multiplier profiles in SIZE_PROFILES are omitted; expandCity() restores
+  them when the module loads
+- floats are rounded to FLOAT_PLACES and whole floats written as integers
+
+A field is only omitted when the expansion reproduces it exactly, and every
+entry is expanded back and compared before the module is written. The
+compact module is an output, not a source: the scripts here read the full
+city-data.ts.
+
+Usage: python3 scripts/format_city_data.py [--check] [--city-data PATH] [--output PATH]
+       python3 scripts/format_city_data.py --compact [--output PATH]
+"""
+
+import argparse
+import math
+import sys
+from collections import Counter
+
+from city_data import (
+    CITY_DATA_TS, TsIdent, dumps_compact, find_export, iter_array_entries, iter_cities, parse_literal,
+    read_bytes, to_ts_literal,
+)
+from validate_city_data import add_no_validate, check, snapshot
+
+INDENT = '    '
+
+# {key: nested order} in the order entries are written
+CITY_KEY_ORDER = {
+    'id': None, 'name': None, 'county': None, 'type': None, 'population': None,
+    'rpr': None, 'dsi': None,
+    'marketScore': {k: None for k in ('overall', 'demand', 'affordability', 'regulation',
+                                      'seasonality', 'saturation', 'rpr', 'verdict')},
+    'rental': {k: None for k in ('avgADR', 'occupancyRate', 'monthlyRevenue', 'medianHomePrice',
+                                 'revenue75thPercentile', 'revenue90thPercentile', 'mtrMonthlyIncome')},
+    'saturationRisk': {k: None for k in ('strToHousingRatio', 'listingsPerThousand',
+                                         'yoySupplyGrowth', 'riskLevel')},
+    'investmentMetrics': {
+        'rpr': None, 'rprRating': None, 'dsi': None,
+        'dsiDetails': {k: None for k in ('monthlyMortgage', 'monthlyExpenses', 'netMonthlyIncome', 'survives')},
+    },
+    'strStatus': None, 'permitRequired': None,
+    'incomeBySize': {k: None for k in ('oneBR', 'twoBR', 'threeBR', 'fourBR', 'fiveBR',
+                                       'sixPlusBR', 'bestPerformer')},
+    'amenityDelta': {
+        'topAmenities': {'name': None, 'revenueBoost': None, 'priority': None},
+        'marketType': None,
+    },
+    'highlights': None,
+}
+
+
+def format_entry(city):
+    return to_ts_literal(city, CITY_KEY_ORDER)
+
+
+def _parse_module(data, name='cityData'):
+    """Return ({state: [city, ...]} in file order, offset of the literal's '{', offset of its '}')."""
+    start = find_export(data, name)
+    by_state = {}
+    last_end = start
+    for state, s, e in iter_array_entries(data, name):
+        by_state.setdefault(state, []).append(parse_literal(data[s:e]))
+        last_end = e
+    # The literal closes at the first '}' after the last state array's ']'
+    close = data.index(b']', last_end)
+    close = data.index(b'}', close)
+    return by_state, start, close
+
+
+def _state_blocks(by_state, render):
+    out = []
+    for state, cities in by_state.items():
+        cities.sort(key=lambda c: c['id'])
+        out.append(f"  {state}: [\n")
+        for city in cities:
+            out.append(f"{INDENT}{render(city)},\n")
+        out.append("  ],\n")
+    return out
+
+
+def format_module(data, name='cityData'):
+    """Return the canonical module text (bytes) for city-data.ts bytes."""
+    by_state, start, close = _parse_module(data, name)
+    out = [data[:start + 1].decode('utf-8'), '\n']
+    out.extend(_state_blocks(by_state, format_entry))
+    out.append(data[close:].decode('utf-8'))
+    return ''.join(out).encode('utf-8')
+
+
+def _entry_multiset(data):
+    return Counter((state, dumps_compact(city)) for state, city in iter_cities(data=data))
+
+
+def verify(original, formatted):
+    """Raise ValueError unless `formatted` holds the same entries and is a fixed point."""
+    if _entry_multiset(original) != _entry_multiset(formatted):
+        raise ValueError("formatted module does not parse back to the same entries")
+    if format_module(formatted) != formatted:
+        raise ValueError("formatting is not idempotent")
+
+
+# ============================================================
+# Compact module (--compact)
+# ============================================================
+
+# Multipliers on monthlyRevenue that generate_city_data() uses; a field is
+# elided only when the expansion reproduces it exactly
+DERIVED_RENTAL = {'revenue75thPercentile': 1.30, 'revenue90thPercentile': 1.60, 'mtrMonthlyIncome': 0.70}
+SIZE_KEYS = ('oneBR', 'twoBR', 'threeBR', 'fourBR', 'fiveBR', 'sixPlusBR')
+# Decimal places floats are rounded to
+FLOAT_PLACES = {'rpr': 3, 'strToHousingRatio': 1, 'listingsPerThousand': 1, 'yoySupplyGrowth': 1}
+MIN_SHARED = 2
+
+COMPACT_TYPES = """\
+type Amenities = CityData['amenityDelta']['topAmenities'];
+// Bedroom multipliers on monthlyRevenue (1BR..6BR+) and how they were rounded
+type SizeProfile = [number, number, number, number, number, number, 'trunc' | 'round'];
+
+// Entries as stored: fields that expandCity() can derive may be omitted
+type CompactCityData = Omit<CityData, 'rental' | 'investmentMetrics' | 'incomeBySize'> & {
+  rental: Omit<CityData['rental'], 'revenue75thPercentile' | 'revenue90thPercentile' | 'mtrMonthlyIncome'>
+    & Partial<Pick<CityData['rental'], 'revenue75thPercentile' | 'revenue90thPercentile' | 'mtrMonthlyIncome'>>;
+  investmentMetrics: Omit<CityData['investmentMetrics'], 'rpr' | 'dsi' | 'dsiDetails'>
+    & Partial<Pick<CityData['investmentMetrics'], 'rpr' | 'dsi'>>
+    & { dsiDetails: Omit<CityData['investmentMetrics']['dsiDetails'], 'survives'> & { survives?: boolean } };
+  incomeBySize: CityData['incomeBySize'] | { profile: number; bestPerformer: CityData['incomeBySize']['bestPerformer'] };
+};
+"""
+
+COMPACT_EXPAND = """\
+function expandCity(c: CompactCityData): CityData {
+  const rev = c.rental.monthlyRevenue;
+  const { dsiDetails, ...metrics } = c.investmentMetrics;
+  let incomeBySize = c.incomeBySize;
+  if ('profile' in incomeBySize) {
+    const p = SIZE_PROFILES[incomeBySize.profile];
+    const size = (m: number) => (p[6] === 'round' ? Math.round(rev * m) : Math.trunc(rev * m));
+    incomeBySize = {
+      oneBR: size(p[0]), twoBR: size(p[1]), threeBR: size(p[2]),
+      fourBR: size(p[3]), fiveBR: size(p[4]), sixPlusBR: size(p[5]),
+      bestPerformer: incomeBySize.bestPerformer,
+    };
+  }
+  return {
+    ...c,
+    rental: {
+      revenue75thPercentile: Math.trunc(rev * 1.3),
+      revenue90thPercentile: Math.trunc(rev * 1.6),
+      mtrMonthlyIncome: Math.trunc(rev * 0.7),
+      ...c.rental,
+    },
+    investmentMetrics: {
+      rpr: c.rpr,
+      dsi: c.dsi,
+      ...metrics,
+      dsiDetails: { survives: dsiDetails.netMonthlyIncome > 0, ...dsiDetails },
+    },
+    incomeBySize,
+  };
+}
+"""
+
+COMPACT_EXPORT = """\
+export const cityData: Record<string, CityData[]> = Object.fromEntries(
+  Object.entries(compactCityData).map(([state, cities]) => [state, cities.map(expandCity)])
+);"""
+
+
+def _js_round(x):
+    """Math.round: halves go up."""
+    return math.floor(x + 0.5)
+
+
+def _size(rev, m, mode):
+    x = rev * m
+    return _js_round(x) if mode == 'round' else math.trunc(x)
+
+
+def _size_profile(city):
+    """(m1..m6, mode) reproducing incomeBySize exactly from monthlyRevenue, or None."""
+    rev = city['rental']['monthlyRevenue']
+    sizes = city['incomeBySize']
+    if not rev:
+        return None
+    ratios = tuple(round(sizes[k] / rev, 2) for k in SIZE_KEYS)
+    for mode in ('trunc', 'round'):
+        if all(_size(rev, m, mode) == sizes[k] for m, k in zip(ratios, SIZE_KEYS)):
+            return ratios + (mode,)
+    return None
+
+
+def _round_floats(value, key=None):
+    if isinstance(value, dict):
+        return {k: _round_floats(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_round_floats(v) for v in value]
+    if isinstance(value, float):
+        if key in FLOAT_PLACES:
+            value = round(value, FLOAT_PLACES[key])
+        return int(value) if value.is_integer() else value
+    return value
+
+
+def _amenity_key(amenities):
+    return dumps_compact(amenities)
+
+
+def collect_shared(cities):
+    """Shared amenity lists {key: (name, list)} and size profiles [profile, ...] used by MIN_SHARED+ cities."""
+    amenity_uses = Counter()
+    amenity_type = {}
+    profile_uses = Counter()
+    for city in cities:
+        key = _amenity_key(city['amenityDelta']['topAmenities'])
+        amenity_uses[key] += 1
+        amenity_type.setdefault(key, Counter())[city['amenityDelta']['marketType']] += 1
+        profile = _size_profile(city)
+        if profile:
+            profile_uses[profile] += 1
+
+    amenities, taken = {}, Counter()
+    for key, uses in sorted(amenity_uses.items(), key=lambda kv: (-kv[1], kv[0])):
+        if uses < MIN_SHARED:
+            continue
+        base = 'AMENITIES_' + amenity_type[key].most_common(1)[0][0].upper()
+        taken[base] += 1
+        name = base if taken[base] == 1 else f"{base}_{taken[base]}"
+        amenities[key] = (name, parse_literal(key.encode('utf-8')))
+    profiles = [p for p, uses in sorted(profile_uses.items(), key=lambda kv: (-kv[1], kv[0])) if uses >= MIN_SHARED]
+    return amenities, profiles
+
+
+def compact_entry(city, amenities, profile_index):
+    """The CompactCityData form of `city` (a new dict)."""
+    c = _round_floats(city)
+    rev = c['rental']['monthlyRevenue']
+    rental = dict(c['rental'])
+    for key, m in DERIVED_RENTAL.items():
+        if rental.get(key) == math.trunc(rev * m):
+            del rental[key]
+    c['rental'] = rental
+
+    metrics = dict(c['investmentMetrics'])
+    for key in ('rpr', 'dsi'):
+        if metrics.get(key) == c[key] and type(metrics.get(key)) is type(c[key]):
+            del metrics[key]
+    details = dict(metrics['dsiDetails'])
+    if details.get('survives') == (details['netMonthlyIncome'] > 0):
+        del details['survives']
+    metrics['dsiDetails'] = details
+    c['investmentMetrics'] = metrics
+
+    index = profile_index.get(_size_profile(city))
+    if index is not None:
+        c['incomeBySize'] = {'profile': index, 'bestPerformer': c['incomeBySize']['bestPerformer']}
+
+    shared = amenities.get(_amenity_key(city['amenityDelta']['topAmenities']))
+    if shared:
+        c['amenityDelta'] = dict(c['amenityDelta'], topAmenities=TsIdent(shared[0]))
+    return c
+
+
+def expand_entry(c, amenities_by_name, profiles):
+    """Python mirror of the TS expandCity(), used to verify the compact module."""
+    c = dict(c)
+    rev = c['rental']['monthlyRevenue']
+    c['rental'] = {**{k: math.trunc(rev * m) for k, m in DERIVED_RENTAL.items()}, **c['rental']}
+    metrics = dict(c['investmentMetrics'])
+    details = metrics.pop('dsiDetails')
+    c['investmentMetrics'] = {'rpr': c['rpr'], 'dsi': c['dsi'], **metrics,
+                              'dsiDetails': {'survives': details['netMonthlyIncome'] > 0, **details}}
+    sizes = c['incomeBySize']
+    if 'profile' in sizes:
+        p = profiles[sizes['profile']]
+        c['incomeBySize'] = {**{k: _size(rev, m, p[6]) for k, m in zip(SIZE_KEYS, p)},
+                             'bestPerformer': sizes['bestPerformer']}
+    amenities = c['amenityDelta']['topAmenities']
+    if isinstance(amenities, TsIdent):
+        c['amenityDelta'] = dict(c['amenityDelta'], topAmenities=amenities_by_name[amenities])
+    return c
+
+
+def compact_module(data, name='cityData'):
+    """Return (compact module bytes, report dict) for city-data.ts bytes.
+
+    Raises ValueError if any compacted entry does not expand back to its
+    (float-rounded) original.
+    """
+    by_state, start, close = _parse_module(data, name)
+    cities = [c for state_cities in by_state.values() for c in state_cities]
+    amenities, profiles = collect_shared(cities)
+    profile_index = {p: i for i, p in enumerate(profiles)}
+    amenities_by_name = dict(amenities.values())
+
+    compacted = {}
+    rounded = 0
+    for state, state_cities in by_state.items():
+        rows = compacted[state] = []
+        for city in state_cities:
+            c = compact_entry(city, amenities, profile_index)
+            expected = _round_floats(city)
+            rounded += expected != city
+            if expand_entry(c, amenities_by_name, profiles) != expected:
+                raise ValueError(f"{city['id']}: compact entry does not expand back to the original")
+            rows.append(c)
+
+    text = data.decode('utf-8')
+    export_line = text.rfind('\n', 0, len(data[:start].decode('utf-8'))) + 1
+    tail = data[close + 1:].decode('utf-8')
+    if tail.startswith(';'):
+        tail = tail[1:]
+
+    out = [text[:export_line], COMPACT_TYPES, '\n']
+    for amenity_name, amenity_list in amenities.values():
+        out.append(f"const {amenity_name}: Amenities = {to_ts_literal(amenity_list, CITY_KEY_ORDER['amenityDelta']['topAmenities'])};\n")
+    out.append('\nconst SIZE_PROFILES: SizeProfile[] = [\n')
+    for p in profiles:
+        out.append(f"  {to_ts_literal(list(p))},\n")
+    out.append('];\n\n')
+    out.append(COMPACT_EXPAND)
+    out.append('\nconst compactCityData: Record<string, CompactCityData[]> = {\n')
+    out.extend(_state_blocks(compacted, format_entry))
+    out.append('};\n\n')
+    out.append(COMPACT_EXPORT)
+    out.append(tail)
+    body = ''.join(out).encode('utf-8')
+
+    report = {
+        'entries': len(cities), 'shared_amenities': len(amenities), 'size_profiles': len(profiles),
+        'profiled': sum(1 for c in cities if _size_profile(c) in profile_index),
+        'amenities_interned': sum(1 for c in cities if _amenity_key(c['amenityDelta']['topAmenities']) in amenities),
+        'floats_rounded': rounded, 'bytes_before': len(data), 'bytes_after': len(body),
+    }
+    return body, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rewrite city-data.ts with one canonical line per city.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--output', help='Write here instead of rewriting --city-data in place')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if the file is not canonical; write nothing')
+    parser.add_argument('--compact', action='store_true',
+                        help='Emit the compact module (shared constants, derived fields elided) to --output; '
+                             'without --output only report the savings')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    # Formatting must not add violations to the source, wherever it writes
+    baseline = None if args.no_validate else snapshot(args.city_data)
+
+    data = read_bytes(args.city_data)
+    if args.compact:
+        return _main_compact(args, data)
+    formatted = format_module(data)
+    if formatted == data:
+        print(f"{args.city_data} is already canonical")
+        return 0
+
+    old_lines = data.decode('utf-8').splitlines()
+    new_lines = formatted.decode('utf-8').splitlines()
+    moved = sum((Counter(old_lines) - Counter(new_lines)).values())
+    print(f"{args.city_data}: {len(old_lines)} -> {len(new_lines)} lines, "
+          f"{moved} lines differ from canonical form")
+    if args.check:
+        return 1
+
+    verify(data, formatted)
+    target = args.output or args.city_data
+    with open(target, 'wb') as f:
+        f.write(formatted)
+    print(f"Wrote {target}")
+    if not args.no_validate and check(target, baseline=baseline):
+        return 1
+    return 0
+
+
+def _main_compact(args, data):
+    body, r = compact_module(data)
+    before, after = r['bytes_before'], r['bytes_after']
+    print(f"Compact {args.city_data}: {before:,} -> {after:,} bytes "
+          f"({before - after:,} saved, {(before - after) / before:.0%})")
+    print(f"  {r['shared_amenities']} shared amenity lists cover {r['amenities_interned']}/{r['entries']} entries")
+    print(f"  {r['size_profiles']} incomeBySize profiles cover {r['profiled']}/{r['entries']} entries")
+    print(f"  {r['floats_rounded']} entries had floats rounded")
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(body)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
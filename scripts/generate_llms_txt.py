@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Regenerate the market-data sections of public/llms.txt and llms-full.txt.
+
+Both files are hand-written; their numbers go stale as soon as
+insert_cities.py or the monthly update changes the data. This keeps one
+generated block per file, between
+
+    <!-- edge-data:begin sha256=... -->
+    <!-- edge-data:end -->
+
+(appended on the first run) and leaves the prose around it alone:
+
+- llms.txt gets a coverage line and the top markets
+- llms-full.txt also gets one summary line per state (market count, average
+  score / ADR / RPR, verdict mix, top three markets)
+
+Markets are ranked by marketScore.overall, then RPR, and each line carries
+the verdict, RPR, ADR, revenue, home price and regulation status (curated
+entries from str-regulations.ts win over the entry's strStatus). Lines are
+added in rank order until the whole file reaches its --budget, so the file
+never outgrows what an LLM crawler will read.
+
+city-data.ts is streamed once; only per-state running totals and bounded
+heaps are kept. The block records a hash of its inputs (data files, hand-
+written text, settings) and a file is only rewritten when that changes.
+
+Usage: python3 scripts/generate_llms_txt.py [--budget-short 16384] [--budget-full 65536] [--force]
+"""
+
+import argparse
+import heapq
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+
+from city_data import (
+    CITY_DATA_TS, NAME_TO_CODE, STR_REGULATIONS_TS, content_hash, iter_cities, load_regulations, read_bytes,
+)
+
+BASE_URL = 'https://edge.teeco.co'
+PUBLIC_DIR = 'public'
+CODE_TO_NAME = {code: name for name, code in NAME_TO_CODE.items()}
+VERDICTS = ('strong-buy', 'buy', 'hold', 'caution', 'avoid')
+STATE_TOP = 3
+# Ranked market lines kept while streaming; the byte budgets cut them further
+MAX_MARKETS = 500
+
+# name: (default byte budget, include state summaries)
+TARGETS = {
+    'llms.txt': (16 * 1024, False),
+    'llms-full.txt': (64 * 1024, True),
+}
+
+_BLOCK_RE = re.compile(r'\n*<!-- edge-data:begin sha256=([0-9a-f]+) -->\n.*?<!-- edge-data:end -->\n?', re.DOTALL)
+
+
+class StateSummary:
+    __slots__ = ('markets', 'score', 'adr', 'rpr', 'verdicts', 'top')
+
+    def __init__(self):
+        self.markets = 0
+        self.score = self.adr = self.rpr = 0.0
+        self.verdicts = Counter()
+        self.top = []
+
+    def add(self, city, rank):
+        self.markets += 1
+        self.score += city['marketScore']['overall']
+        self.adr += city['rental']['avgADR']
+        self.rpr += city['rpr']
+        self.verdicts[city['marketScore']['verdict']] += 1
+        _push(self.top, STATE_TOP, (rank, city['name']))
+
+
+def _push(heap, k, item):
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def regulation_label(city, regulations):
+    entry = regulations.get(city['id'])
+    if entry is None:
+        return f"STR {city['strStatus']}"
+    label = f"STR {entry['legality_status']}"
+    if entry['legality_status'] != 'banned' and entry['permit_difficulty'] not in ('easy', 'unknown'):
+        label += f", permits {entry['permit_difficulty'].replace('_', ' ')}"
+    return label
+
+
+def market_line(state, city, regulations):
+    ms, rental = city['marketScore'], city['rental']
+    return (f"- [{city['name']}, {state}]({BASE_URL}/city/{city['id']}): score {ms['overall']}/100 "
+            f"({ms['verdict']}), RPR {city['rpr']:.3f}, ADR ${rental['avgADR']:,}, "
+            f"${rental['monthlyRevenue']:,}/mo, median home ${rental['medianHomePrice']:,}, "
+            f"{regulation_label(city, regulations)}\n")
+
+
+def state_line(code, s):
+    mix = ', '.join(f"{s.verdicts[v]} {v}" for v in VERDICTS if s.verdicts[v])
+    top = ', '.join(f"{name} ({rank[0]})" for rank, name in sorted(s.top, reverse=True))
+    return (f"- [{CODE_TO_NAME.get(code, code)} ({code})]({BASE_URL}/state/{code.lower()}): "
+            f"{s.markets} markets, avg score {s.score / s.markets:.0f}, avg ADR ${s.adr / s.markets:,.0f}, "
+            f"avg RPR {s.rpr / s.markets:.3f}; {mix}; top: {top}\n")
+
+
+class _Desc:
+    """Reverse string ordering, so equal ranks list ids A-Z."""
+
+    __slots__ = ('s',)
+
+    def __init__(self, s):
+        self.s = s
+
+    def __lt__(self, other):
+        return self.s > other.s
+
+    def __gt__(self, other):
+        return self.s < other.s
+
+    def __eq__(self, other):
+        return self.s == other.s
+
+
+def summarize(city_path=CITY_DATA_TS, regulations=None, top=MAX_MARKETS, data=None):
+    """One streaming pass. Returns ({state: StateSummary}, ranked market lines, unique market count)."""
+    regulations = regulations or {}
+    states = {}
+    heap = []
+    seen = set()
+    for state, city in iter_cities(city_path, data):
+        if city['id'] in seen:
+            continue
+        seen.add(city['id'])
+        rank = (city['marketScore']['overall'], city['rpr'])
+        states.setdefault(state, StateSummary()).add(city, rank)
+        # Ties resolve to the lower id; the line is only built for cities that make the heap
+        item = (rank, _Desc(city['id']))
+        if len(heap) < top or item > heap[0][:2]:
+            entry = item + (market_line(state, city, regulations),)
+            if len(heap) < top:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+    ranked = [line for _rank, _id, line in sorted(heap, reverse=True)]
+    return states, ranked, len(seen)
+
+
+def render_block(digest, states, ranked, markets, with_states, budget, prose_bytes):
+    """The generated block, with as many ranked market lines as fit the file budget."""
+    head = [
+        f"<!-- edge-data:begin sha256={digest} -->\n",
+        f"## Market Data Snapshot ({datetime.now().strftime('%B %Y')})\n\n",
+        f"{markets:,} markets with full STR data across {len(states)} states. Scores are 0-100; "
+        f"RPR is annual gross revenue / median home price.\n\n",
+    ]
+    if with_states:
+        head.append("### States\n\n")
+        head.extend(state_line(code, s) for code, s in sorted(states.items()))
+        head.append("\n")
+    head.append("### Top Markets\n\n")
+    tail = "<!-- edge-data:end -->\n"
+
+    size = prose_bytes + 2 + sum(len(s.encode('utf-8')) for s in head) + len(tail)
+    lines = []
+    for line in ranked:
+        n = len(line.encode('utf-8'))
+        if size + n > budget:
+            break
+        lines.append(line)
+        size += n
+    return ''.join(head + lines) + tail, len(lines)
+
+
+def update_file(path, inputs_hash, budget, with_states, get_summary, force=False):
+    """Rewrite `path` if its inputs changed. Returns (status, markets listed, bytes).
+
+    get_summary() -> (states, ranked lines, market count) is only called when
+    the file has to be rewritten.
+    """
+    text = ''
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    m = _BLOCK_RE.search(text)
+    prose = (text[:m.start()] + text[m.end():]) if m else text
+    prose = prose.rstrip('\n') + '\n'
+    digest = content_hash({'inputs': inputs_hash, 'prose': prose, 'budget': budget, 'states': with_states})
+    if m and m.group(1) == digest and not force:
+        return 'unchanged', None, len(text.encode('utf-8'))
+
+    states, ranked, markets = get_summary()
+    block, listed = render_block(digest, states, ranked, markets, with_states, budget,
+                                 len(prose.encode('utf-8')))
+    if m:
+        new = text[:m.start()].rstrip('\n') + '\n\n' + block + text[m.end():]
+    else:
+        new = prose + '\n' + block
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(new)
+    os.replace(path + '.tmp', path)
+    return 'rewritten', listed, len(new.encode('utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Regenerate the market-data sections of llms.txt / llms-full.txt.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--regulations', default=STR_REGULATIONS_TS)
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--budget-short', type=int, default=TARGETS['llms.txt'][0], help='llms.txt size budget in bytes')
+    parser.add_argument('--budget-full', type=int, default=TARGETS['llms-full.txt'][0], help='llms-full.txt size budget in bytes')
+    parser.add_argument('--force', action='store_true', help='Rewrite even if the inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    city_bytes = read_bytes(args.city_data)
+    regulation_bytes = read_bytes(args.regulations)
+    inputs_hash = content_hash(content_hash(city_bytes) + content_hash(regulation_bytes))
+    budgets = {'llms.txt': args.budget_short, 'llms-full.txt': args.budget_full}
+
+    cache = []
+
+    def get_summary():
+        if not cache:
+            cache.append(summarize(args.city_data, load_regulations(args.regulations), data=city_bytes))
+        return cache[0]
+
+    for name, (_default, with_states) in TARGETS.items():
+        path = os.path.join(args.public_dir, name)
+        status, listed, size = update_file(path, inputs_hash, budgets[name], with_states, get_summary, args.force)
+        detail = f", {listed} markets listed" if listed is not None else ''
+        print(f"  {name}: {status} ({size:,} / {budgets[name]:,} bytes{detail})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
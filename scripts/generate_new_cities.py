@@ -4,20 +4,45 @@ Generate new city entries for city-data.ts.
 
 Strategy:
 - Build a master list of ~250+ cities to add across target regions + national park gateways
-- Calibrate data using nearby existing cities in the same state/region
-- Output TypeScript-formatted entries grouped by state
-- Validate no duplicates against existing dataset
+- Calibrate data using nearby existing cities: with --gazetteer, ADR,
+  occupancy and price are pulled toward the k nearest existing cities of the
+  same market type (see geo_calibration.py); without it, state-level tables only
+- Output TypeScript-formatted entries grouped by state; with --simulate, the
+  revenue percentiles come from monte_carlo.py instead of fixed multipliers
+- Validate no duplicates against existing dataset, then schema-check the
+  output with validate_city_data.py
+- Reuse cached entries: each city's serialized line is stored under a hash of
+  its input tuple, the calibration it sees (state price, amenity profile,
+  neighbor profile, Monte Carlo parameters) and the generator source
+  (including geo_calibration.py and monte_carlo.py), so a
+  rerun only regenerates the cities whose inputs changed (--no-cache to
+  regenerate everything)
 """
 
+import argparse
+import inspect
+import os
 import re
 import json
 import random
 import math
 import hashlib
+import sys
 from collections import defaultdict
 
+from geo_calibration import (
+    DEFAULT_K, NeighborIndex, attach_coordinates, blend, load_gazetteer, lookup, neighbor_profile,
+)
+from city_data import CITY_DATA_TS, content_hash, read_bytes, ts_string
+from city_record import CityRecord, ExistingCity
+from validate_city_data import add_no_validate, check, snapshot
+
 random.seed(42)  # Reproducible
 
+DEFAULT_OUTPUT = '/tmp/new_city_entries.txt'
+DEFAULT_CACHE = '/tmp/new_city_entries.cache.json'
+CACHE_VERSION = 1
+
 # ============================================================
 # STEP 1: Parse existing cities from city-data.ts
 # ============================================================
@@ -49,11 +74,8 @@ def parse_existing_cities(filepath):
         str_ratio = float(m.group(1)) if (m := re.search(r'strToHousingRatio: ([\d.]+)', line)) else 2.0
         yoy = float(m.group(1)) if (m := re.search(r'yoySupplyGrowth: ([\d.]+)', line)) else 5.0
         
-        existing_by_state[state].append({
-            'id': city_id, 'name': name, 'pop': pop, 'adr': adr, 'occ': occ,
-            'rev': rev, 'price': price, 'type': mtype, 'lpt': lpt,
-            'str_ratio': str_ratio, 'yoy': yoy,
-        })
+        existing_by_state[state].append(
+            ExistingCity(city_id, name, pop, adr, occ, rev, price, mtype, lpt, str_ratio, yoy))
     
     return existing_ids, existing_by_state
 
@@ -578,15 +600,19 @@ STATE_HOME_PRICES = {
 }
 
 
-def generate_city_data(city_tuple, existing_by_state):
-    """Generate a complete city data entry calibrated against existing cities in the same state."""
+def generate_city_data(city_tuple, existing_by_state, neighbors=None):
+    """Generate a complete city data entry calibrated against existing cities in the same state.
+
+    `neighbors` is an optional geo_calibration.neighbor_profile() of the
+    nearest existing cities of the same market type.
+    """
     city_id, name, county, state, pop, mtype, highlights, near_park = city_tuple
     
     # Get existing cities in this state for calibration
     state_cities = existing_by_state.get(state, [])
     
     # Find similar cities (same market type, similar population)
-    similar = [c for c in state_cities if c['type'] == mtype]
+    similar = [c for c in state_cities if c.type == mtype]
     if not similar:
         similar = state_cities if state_cities else []
     
@@ -658,6 +684,14 @@ def generate_city_data(city_tuple, existing_by_state):
         occ_low = min(occ_low + 5, occ_high - 5)
     occupancy_rate = int(rng.uniform(occ_low, occ_high))
     
+    # Pull toward the nearest existing markets (after all rng draws above, so
+    # the same seed still produces the same uncalibrated values)
+    if neighbors:
+        median_home_price = round(blend(median_home_price, neighbors['price']) / 1000) * 1000
+        median_home_price = max(125000, min(median_home_price, 1200000))
+        avg_adr = int(blend(avg_adr, neighbors['adr']))
+        occupancy_rate = int(round(blend(occupancy_rate, neighbors['occ'])))
+    
     # Monthly revenue = ADR * occupancy * 30
     monthly_revenue = int(avg_adr * (occupancy_rate / 100) * 30)
     
@@ -801,125 +835,174 @@ def generate_city_data(city_tuple, existing_by_state):
     # Amenities
     amenities = AMENITY_PROFILES.get(mtype, AMENITY_PROFILES['rural'])
     
-    return {
-        'id': city_id,
-        'name': name,
-        'county': county,
-        'type': 'city',
-        'population': pop,
-        'rpr': rpr,
-        'dsi': dsi,
-        'marketScore': {
-            'overall': overall,
-            'demand': demand,
-            'affordability': affordability,
-            'regulation': regulation_score,
-            'seasonality': seasonality,
-            'saturation': saturation_score,
-            'rpr': rpr_score,
-            'verdict': verdict,
-        },
-        'rental': {
-            'avgADR': avg_adr,
-            'occupancyRate': occupancy_rate,
-            'monthlyRevenue': monthly_revenue,
-            'medianHomePrice': median_home_price,
-            'revenue75thPercentile': rev_75,
-            'revenue90thPercentile': rev_90,
-            'mtrMonthlyIncome': mtr_income,
-        },
-        'saturationRisk': {
-            'strToHousingRatio': str_ratio,
-            'listingsPerThousand': listings_per_thousand,
-            'yoySupplyGrowth': yoy_supply_growth,
-            'riskLevel': risk_level,
-        },
-        'investmentMetrics': {
-            'rpr': rpr,
-            'rprRating': rpr_rating,
-            'dsi': dsi,
-            'dsiDetails': {
-                'monthlyMortgage': monthly_mortgage,
-                'monthlyExpenses': monthly_expenses,
-                'netMonthlyIncome': net_monthly_income,
-                'survives': dsi,
-            },
-        },
-        'strStatus': str_status,
-        'permitRequired': permit_required,
-        'incomeBySize': {
-            'oneBR': base_1br,
-            'twoBR': base_2br,
-            'threeBR': base_3br,
-            'fourBR': base_4br,
-            'fiveBR': base_5br,
-            'sixPlusBR': base_6br,
-            'bestPerformer': best,
-        },
-        'amenityDelta': {
-            'topAmenities': amenities,
-            'marketType': mtype,
-        },
-        'highlights': highlights,
-    }
+    return CityRecord(
+        id=city_id,
+        name=name,
+        county=county,
+        type='city',
+        population=pop,
+        rpr=rpr,
+        dsi=dsi,
+        overall=overall,
+        demand=demand,
+        affordability=affordability,
+        regulation=regulation_score,
+        seasonality=seasonality,
+        saturation=saturation_score,
+        rpr_score=rpr_score,
+        verdict=verdict,
+        avg_adr=avg_adr,
+        occupancy_rate=occupancy_rate,
+        monthly_revenue=monthly_revenue,
+        median_home_price=median_home_price,
+        revenue_75=rev_75,
+        revenue_90=rev_90,
+        mtr_income=mtr_income,
+        str_ratio=str_ratio,
+        listings_per_thousand=listings_per_thousand,
+        yoy_supply_growth=yoy_supply_growth,
+        risk_level=risk_level,
+        rpr_rating=rpr_rating,
+        monthly_mortgage=monthly_mortgage,
+        monthly_expenses=monthly_expenses,
+        net_monthly_income=net_monthly_income,
+        str_status=str_status,
+        permit_required=permit_required,
+        income=(base_1br, base_2br, base_3br, base_4br, base_5br, base_6br),
+        best_performer=best,
+        amenities=amenities,
+        market_type=mtype,
+        highlights=highlights,
+    )
+
+
+# Serialized topAmenities per profile list; the lists are shared by every city of a market type
+_AMENITY_STRS = {}
 
 
-def format_city_entry(data):
-    """Format a city data dict as a single-line TypeScript object matching existing format."""
-    d = data
-    ms = d['marketScore']
-    r = d['rental']
-    sr = d['saturationRisk']
-    im = d['investmentMetrics']
-    ibs = d['incomeBySize']
-    ad = d['amenityDelta']
-    
-    # Format amenities
-    amenity_strs = []
-    for a in ad['topAmenities']:
-        amenity_strs.append(
-            f"{{ name: '{a['name']}', revenueBoost: {a['revenueBoost']}, priority: '{a['priority']}' }}"
-        )
-    amenities_str = ', '.join(amenity_strs)
-    
-    # Format highlights
-    highlights_str = ', '.join(f"'{h}'" for h in d['highlights'])
-    
-    # Escape single quotes in name/county
-    name = d['name'].replace("'", "\\'")
-    county = d['county'].replace("'", "\\'")
-    
-    line = (
-        f"    {{ id: '{d['id']}', name: '{name}', county: '{county}', "
-        f"type: '{d['type']}', population: {d['population']}, rpr: {d['rpr']}, dsi: {'true' if d['dsi'] else 'false'}, "
-        f"marketScore: {{ overall: {ms['overall']}, demand: {ms['demand']}, affordability: {ms['affordability']}, "
-        f"regulation: {ms['regulation']}, seasonality: {ms['seasonality']}, saturation: {ms['saturation']}, "
-        f"rpr: {ms['rpr']}, verdict: '{ms['verdict']}' }}, "
-        f"rental: {{ avgADR: {r['avgADR']}, occupancyRate: {r['occupancyRate']}, "
-        f"monthlyRevenue: {r['monthlyRevenue']}, medianHomePrice: {r['medianHomePrice']}, "
-        f"revenue75thPercentile: {r['revenue75thPercentile']}, revenue90thPercentile: {r['revenue90thPercentile']}, "
-        f"mtrMonthlyIncome: {r['mtrMonthlyIncome']} }}, "
-        f"saturationRisk: {{ strToHousingRatio: {sr['strToHousingRatio']}, "
-        f"listingsPerThousand: {sr['listingsPerThousand']}, yoySupplyGrowth: {sr['yoySupplyGrowth']}, "
-        f"riskLevel: '{sr['riskLevel']}' }}, "
-        f"investmentMetrics: {{ rpr: {im['rpr']}, rprRating: '{im['rprRating']}', "
-        f"dsi: {'true' if im['dsi'] else 'false'}, dsiDetails: {{ "
-        f"monthlyMortgage: {im['dsiDetails']['monthlyMortgage']}, "
-        f"monthlyExpenses: {im['dsiDetails']['monthlyExpenses']}, "
-        f"netMonthlyIncome: {im['dsiDetails']['netMonthlyIncome']}, "
-        f"survives: {'true' if im['dsiDetails']['survives'] else 'false'} }} }}, "
-        f"strStatus: '{d['strStatus']}', permitRequired: {'true' if d['permitRequired'] else 'false'}, "
-        f"incomeBySize: {{ oneBR: {ibs['oneBR']}, twoBR: {ibs['twoBR']}, threeBR: {ibs['threeBR']}, "
-        f"fourBR: {ibs['fourBR']}, fiveBR: {ibs['fiveBR']}, sixPlusBR: {ibs['sixPlusBR']}, "
-        f"bestPerformer: '{ibs['bestPerformer']}' }}, "
-        f"amenityDelta: {{ topAmenities: [{amenities_str}], marketType: '{ad['marketType']}' }}, "
+def _amenities_str(amenities):
+    key = id(amenities)
+    cached = _AMENITY_STRS.get(key)
+    if cached is None or cached[0] is not amenities:
+        text = ', '.join(
+            f"{{ name: {ts_string(a['name'])}, revenueBoost: {a['revenueBoost']}, priority: '{a['priority']}' }}"
+            for a in amenities)
+        cached = _AMENITY_STRS[key] = (amenities, text)
+    return cached[1]
+
+
+def _ts_bool(value):
+    return 'true' if value else 'false'
+
+
+def format_city_entry(r):
+    """Format a CityRecord as a single-line TypeScript object matching existing format."""
+    highlights_str = ', '.join(ts_string(h) for h in r.highlights)
+    one, two, three, four, five, six = r.income
+    dsi = _ts_bool(r.dsi)
+
+    return (
+        f"    {{ id: '{r.id}', name: {ts_string(r.name)}, county: {ts_string(r.county)}, "
+        f"type: '{r.type}', population: {r.population}, rpr: {r.rpr}, dsi: {dsi}, "
+        f"marketScore: {{ overall: {r.overall}, demand: {r.demand}, affordability: {r.affordability}, "
+        f"regulation: {r.regulation}, seasonality: {r.seasonality}, saturation: {r.saturation}, "
+        f"rpr: {r.rpr_score}, verdict: '{r.verdict}' }}, "
+        f"rental: {{ avgADR: {r.avg_adr}, occupancyRate: {r.occupancy_rate}, "
+        f"monthlyRevenue: {r.monthly_revenue}, medianHomePrice: {r.median_home_price}, "
+        f"revenue75thPercentile: {r.revenue_75}, revenue90thPercentile: {r.revenue_90}, "
+        f"mtrMonthlyIncome: {r.mtr_income} }}, "
+        f"saturationRisk: {{ strToHousingRatio: {r.str_ratio}, "
+        f"listingsPerThousand: {r.listings_per_thousand}, yoySupplyGrowth: {r.yoy_supply_growth}, "
+        f"riskLevel: '{r.risk_level}' }}, "
+        f"investmentMetrics: {{ rpr: {r.rpr}, rprRating: '{r.rpr_rating}', "
+        f"dsi: {dsi}, dsiDetails: {{ "
+        f"monthlyMortgage: {r.monthly_mortgage}, "
+        f"monthlyExpenses: {r.monthly_expenses}, "
+        f"netMonthlyIncome: {r.net_monthly_income}, "
+        f"survives: {dsi} }} }}, "
+        f"strStatus: '{r.str_status}', permitRequired: {_ts_bool(r.permit_required)}, "
+        f"incomeBySize: {{ oneBR: {one}, twoBR: {two}, threeBR: {three}, "
+        f"fourBR: {four}, fiveBR: {five}, sixPlusBR: {six}, "
+        f"bestPerformer: '{r.best_performer}' }}, "
+        f"amenityDelta: {{ topAmenities: [{_amenities_str(r.amenities)}], marketType: '{r.market_type}' }}, "
         f"highlights: [{highlights_str}] }}"
     )
-    return line
 
 
-def main():
-    existing_ids, existing_by_state = parse_existing_cities('src/data/city-data.ts')
+# ============================================================
+# Generation cache
+# ============================================================
+
+# Whole modules whose code or constants shape the output: blend() and
+# CALIBRATION_WEIGHT for --gazetteer, simulate_city() and its constants for --simulate
+CALIBRATION_MODULES = ('geo_calibration.py', 'monte_carlo.py')
+
+
+def generator_version():
+    """Hash of the generator, formatter and calibration source; editing any of them invalidates every cached entry."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    sources = [inspect.getsource(fn) for fn in (generate_city_data, format_city_entry, _amenities_str)]
+    sources += [content_hash(read_bytes(os.path.join(here, name))) for name in CALIBRATION_MODULES]
+    return content_hash(''.join(sources))
+
+
+def cache_key(version, city_tuple, profile=None, sim=None):
+    """Hash of everything one generated entry depends on."""
+    state, mtype = city_tuple[3], city_tuple[5]
+    return content_hash([
+        version,
+        list(city_tuple),
+        STATE_HOME_PRICES.get(state),
+        AMENITY_PROFILES.get(mtype, AMENITY_PROFILES['rural']),
+        profile,
+        sim,
+    ])
+
+
+def load_cache(path):
+    """{city_id: (key, line)} from a previous run, or {} if missing / another format."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except ValueError:
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return {city_id: tuple(entry) for city_id, entry in cache['entries'].items()}
+
+
+def save_cache(path, entries):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'entries': entries}, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate new city entries for city-data.ts.')
+    parser.add_argument('--gazetteer', help='Census Gazetteer places file for geo-nearest calibration')
+    parser.add_argument('--neighbors', type=int, default=DEFAULT_K, help='k nearest cities to calibrate from')
+    parser.add_argument('--simulate', type=int, metavar='DRAWS', default=0,
+                        help='Set revenue 75th/90th percentiles from a Monte Carlo run (monte_carlo.py) '
+                             'instead of the fixed 1.30/1.60 multipliers')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'Entries file to write (default {DEFAULT_OUTPUT})')
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help=f'Generation cache file (default {DEFAULT_CACHE})')
+    parser.add_argument('--no-cache', action='store_true', help='Regenerate every entry (the cache is still rewritten)')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    baseline = None if args.no_validate else snapshot(args.output)
+
+    existing_ids, existing_by_state = parse_existing_cities(args.city_data)
+    
+    index = coords = None
+    if args.gazetteer:
+        coords = load_gazetteer(args.gazetteer)
+        located = attach_coordinates(existing_by_state, coords)
+        index = NeighborIndex(existing_by_state)
+        print(f"Gazetteer: {len(coords)} places, {located} existing cities located")
     
     # Filter out duplicates
     new_cities = []
@@ -935,32 +1018,71 @@ def main():
     print(f"Skipped (already exist): {len(skipped)} - {skipped}")
     print(f"New cities to generate: {len(new_cities)}")
     
+    sim_params = None
+    if args.simulate:
+        from monte_carlo import FALLBACK, calibrate, simulate_city
+        sim_params = calibrate((st, c.type, c.adr, c.occ)
+                               for st, cities in existing_by_state.items() for c in cities)
+
+    version = generator_version()
+    cache = {} if args.no_cache else load_cache(args.cache)
+    entries = {}
+    regenerated = []
+
     # Group by state
     by_state = defaultdict(list)
+    calibrated = 0
     for city in new_cities:
         state = city[3]
-        data = generate_city_data(city, existing_by_state)
-        by_state[state].append(data)
+        profile = None
+        if index is not None:
+            hit = lookup(coords, city[0], state, city[1])
+            if hit:
+                profile = neighbor_profile(index.nearest(hit[0], hit[1], city[5], args.neighbors))
+                calibrated += 1
+        sim = [args.simulate, sim_params.get(city[5], FALLBACK)] if sim_params is not None else None
+        key = cache_key(version, city, profile, sim)
+        cached = cache.get(city[0])
+        if cached is not None and cached[0] == key:
+            line = cached[1]
+        else:
+            data = generate_city_data(city, existing_by_state, profile)
+            if sim_params is not None:
+                result = simulate_city(data.id, data.avg_adr, data.occupancy_rate, data.median_home_price,
+                                       data.market_type, sim_params, draws=args.simulate)
+                data.revenue_75 = max(result['revenue']['p75'], data.monthly_revenue)
+                data.revenue_90 = max(result['revenue']['p90'], data.revenue_75)
+            line = format_city_entry(data)
+            regenerated.append(city[0])
+        entries[city[0]] = (key, line)
+        by_state[state].append(line)
+    if index is not None:
+        print(f"Geo-calibrated: {calibrated}/{len(new_cities)} (rest use state tables only)")
+    print(f"Cache: {len(new_cities) - len(regenerated)} reused, {len(regenerated)} regenerated")
+    if regenerated and len(regenerated) < len(new_cities):
+        print(f"  Regenerated: {', '.join(regenerated[:20])}{' ...' if len(regenerated) > 20 else ''}")
     
     # Output grouped by state
     output_lines = []
     state_counts = {}
     for state in sorted(by_state.keys()):
-        cities = by_state[state]
-        state_counts[state] = len(cities)
-        output_lines.append(f"// STATE: {state} ({len(cities)} new cities)")
-        for city_data in cities:
-            line = format_city_entry(city_data)
-            output_lines.append(line)
+        lines = by_state[state]
+        state_counts[state] = len(lines)
+        output_lines.append(f"// STATE: {state} ({len(lines)} new cities)")
+        output_lines.extend(lines)
     
     # Write output
-    with open('/tmp/new_city_entries.txt', 'w') as f:
+    with open(args.output, 'w') as f:
         f.write('\n'.join(output_lines))
+    save_cache(args.cache, entries)
     
     print(f"\nGenerated {sum(state_counts.values())} new city entries across {len(state_counts)} states")
     print(f"State breakdown: {dict(sorted(state_counts.items()))}")
-    print(f"Output written to /tmp/new_city_entries.txt")
+    print(f"Output written to {args.output}")
+    if not args.no_validate and check(args.output, baseline=baseline):
+        return 1
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
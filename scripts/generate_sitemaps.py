@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Regenerate the city and state sitemaps from the data files.
+
+- Streams /city/<id> URLs from city-data.ts (first entry per id, file order)
+  and /state/<code> URLs from state-data.ts
+- Cities go into size-bounded shards, public/sitemap-cities-N.xml (at most
+  --max-urls URLs and --max-bytes bytes each)
+- <lastmod> comes from a content hash per entry kept in
+  scripts/manifests/sitemap.json: a URL keeps its old lastmod until its
+  entry (or, for a state page, the state or any of its cities) changes
+- A shard is only rewritten when its bytes change, and sitemap.xml (the
+  index) and the Sitemap: lines in robots.txt are updated to match the
+  shard list. sitemap-pages.xml and sitemap-blog.xml are left alone
+
+Without a manifest, lastmods are seeded from the sitemaps already in public/
+so the first run doesn't mark every page as changed today.
+
+Usage: python3 scripts/generate_sitemaps.py [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from city_data import CITY_DATA_TS, STATE_DATA_TS, content_hash, iter_cities, load_state_data
+
+BASE_URL = 'https://edge.teeco.co'
+PUBLIC_DIR = 'public'
+MANIFEST = 'scripts/manifests/sitemap.json'
+MANIFEST_VERSION = 1
+MAX_URLS = 500
+MAX_BYTES = 10 * 1024 * 1024  # protocol limit is 50MB / 50,000 URLs
+# Index entries that are maintained by hand and kept as they are
+STATIC_SITEMAPS = ('sitemap-pages.xml', 'sitemap-states.xml', 'sitemap-blog.xml')
+
+_URLSET_HEAD = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+_URLSET_TAIL = '</urlset>\n'
+_LOC_RE = re.compile(r'<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>')
+_SHARD_RE = re.compile(r'^sitemap-cities-(\d+)\.xml$')
+
+
+def _now():
+    now = datetime.now(timezone.utc)
+    return now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now.microsecond // 1000:03d}Z"
+
+
+def url_xml(loc, lastmod, priority):
+    return (f"  <url>\n    <loc>{escape(loc)}</loc>\n    <lastmod>{lastmod}</lastmod>\n"
+            f"    <changefreq>monthly</changefreq>\n    <priority>{priority}</priority>\n  </url>\n")
+
+
+def seed_lastmods(public_dir=PUBLIC_DIR):
+    """{loc: lastmod} from the sitemaps currently in public/."""
+    seeded = {}
+    for name in os.listdir(public_dir):
+        if _SHARD_RE.match(name) or name == 'sitemap-states.xml':
+            with open(os.path.join(public_dir, name), encoding='utf-8') as f:
+                seeded.update(_LOC_RE.findall(f.read()))
+    return seeded
+
+
+def load_manifest(path=MANIFEST):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+class LastmodTracker:
+    """Hands out lastmods: the previous one while the hash is unchanged, else now."""
+
+    def __init__(self, previous, seeded, now):
+        self.previous = previous or {}
+        self.seeded = seeded
+        self.now = now
+        self.current = {}
+        self.changed = 0
+
+    def lastmod(self, loc, digest):
+        old = self.previous.get(loc)
+        if old and old['hash'] == digest:
+            lastmod = old['lastmod']
+        elif old is None and loc in self.seeded:
+            lastmod = self.seeded[loc]
+        else:
+            lastmod = self.now
+            self.changed += 1
+        self.current[loc] = {'hash': digest, 'lastmod': lastmod}
+        return lastmod
+
+
+def iter_city_urls(tracker, city_path=CITY_DATA_TS, base_url=BASE_URL, state_hashes=None):
+    """Yield (url_xml, lastmod) per city; collects per-state city hashes into state_hashes."""
+    seen = set()
+    for state, city in iter_cities(city_path):
+        if city['id'] in seen:
+            continue
+        seen.add(city['id'])
+        digest = content_hash(city)
+        if state_hashes is not None:
+            state_hashes.setdefault(state, []).append(digest)
+        loc = f"{base_url}/city/{city['id']}"
+        lastmod = tracker.lastmod(loc, digest)
+        yield url_xml(loc, lastmod, '0.6'), lastmod
+
+
+def shard_urls(urls, max_urls=MAX_URLS, max_bytes=MAX_BYTES):
+    """Group (xml, lastmod) items into shards of (body, newest lastmod)."""
+    overhead = len(_URLSET_HEAD) + len(_URLSET_TAIL)
+    parts, size, newest = [], overhead, ''
+    for xml, lastmod in urls:
+        if parts and (len(parts) >= max_urls or size + len(xml) > max_bytes):
+            yield ''.join(parts), newest
+            parts, size, newest = [], overhead, ''
+        parts.append(xml)
+        size += len(xml)
+        newest = max(newest, lastmod)
+    if parts:
+        yield ''.join(parts), newest
+
+
+def _write_if_changed(path, text, dry_run):
+    data = text.encode('utf-8')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    if not dry_run:
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return True
+
+
+def render_index(entries):
+    out = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for loc, lastmod in entries:
+        out.append(f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n")
+    out.append('</sitemapindex>\n')
+    return ''.join(out)
+
+
+def update_robots(path, shard_names, base_url=BASE_URL, dry_run=False):
+    """Point robots.txt's per-shard Sitemap: lines at the current shard list."""
+    if not os.path.exists(path):
+        return False
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    shard_line = re.compile(r'^Sitemap: .*/sitemap-cities-\d+\.xml$')
+    positions = [i for i, line in enumerate(lines) if shard_line.match(line)]
+    if not positions:
+        return False
+    new = [f"Sitemap: {base_url}/{name}" for name in shard_names]
+    lines[positions[0]:positions[-1] + 1] = new
+    return _write_if_changed(path, '\n'.join(lines), dry_run)
+
+
+def generate(public_dir=PUBLIC_DIR, city_path=CITY_DATA_TS, state_path=STATE_DATA_TS,
+             manifest_path=MANIFEST, base_url=BASE_URL, max_urls=MAX_URLS, max_bytes=MAX_BYTES,
+             dry_run=False):
+    manifest = load_manifest(manifest_path)
+    previous = manifest['urls'] if manifest else None
+    seeded = {} if manifest else seed_lastmods(public_dir)
+    tracker = LastmodTracker(previous, seeded, _now())
+    written = []
+
+    # Cities, one shard at a time
+    state_hashes = {}
+    shard_names = []
+    shard_lastmods = []
+    urls = iter_city_urls(tracker, city_path, base_url, state_hashes)
+    for n, (body, newest) in enumerate(shard_urls(urls, max_urls, max_bytes), 1):
+        name = f"sitemap-cities-{n}.xml"
+        shard_names.append(name)
+        shard_lastmods.append(newest[:10])
+        if _write_if_changed(os.path.join(public_dir, name), _URLSET_HEAD + body + _URLSET_TAIL, dry_run):
+            written.append(name)
+
+    # Stale shards from a larger previous run
+    removed = []
+    for name in os.listdir(public_dir):
+        m = _SHARD_RE.match(name)
+        if m and name not in shard_names:
+            removed.append(name)
+            if not dry_run:
+                os.remove(os.path.join(public_dir, name))
+
+    # States: the page shows the state record and its cities
+    states = load_state_data(state_path)
+    parts, newest = [], ''
+    for code, state in states.items():
+        digest = content_hash({'state': state, 'cities': state_hashes.get(code, [])})
+        loc = f"{base_url}/state/{code.lower()}"
+        lastmod = tracker.lastmod(loc, digest)
+        newest = max(newest, lastmod)
+        parts.append(url_xml(loc, lastmod, '0.8'))
+    if _write_if_changed(os.path.join(public_dir, 'sitemap-states.xml'),
+                         _URLSET_HEAD + ''.join(parts) + _URLSET_TAIL, dry_run):
+        written.append('sitemap-states.xml')
+
+    # Index: hand-maintained entries keep their lastmod, except states
+    index_path = os.path.join(public_dir, 'sitemap.xml')
+    old_index = {}
+    if os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            old_index = dict(_LOC_RE.findall(f.read()))
+    entries = []
+    for name in STATIC_SITEMAPS:
+        loc = f"{base_url}/{name}"
+        if name == 'sitemap-states.xml':
+            entries.append((loc, newest[:10]))
+        elif loc in old_index or os.path.exists(os.path.join(public_dir, name)):
+            entries.append((loc, old_index.get(loc, tracker.now[:10])))
+    entries += [(f"{base_url}/{name}", lastmod) for name, lastmod in zip(shard_names, shard_lastmods)]
+    if _write_if_changed(index_path, render_index(entries), dry_run):
+        written.append('sitemap.xml')
+    if update_robots(os.path.join(public_dir, 'robots.txt'), shard_names, base_url, dry_run):
+        written.append('robots.txt')
+
+    if not dry_run:
+        os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+        tmp = manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'urls': tracker.current}, f, indent=0, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, manifest_path)
+
+    return {'urls': len(tracker.current), 'changed': tracker.changed, 'shards': shard_names,
+            'written': written, 'removed': removed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Regenerate city/state sitemaps with content-hash lastmod.')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--state-data', default=STATE_DATA_TS)
+    parser.add_argument('--manifest', default=MANIFEST)
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS, help=f'URLs per shard (default {MAX_URLS})')
+    parser.add_argument('--max-bytes', type=int, default=MAX_BYTES, help='Bytes per shard')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    result = generate(args.public_dir, args.city_data, args.state_data, args.manifest, args.base_url,
+                      args.max_urls, args.max_bytes, args.dry_run)
+    print(f"{result['urls']} URLs in {len(result['shards'])} city shards + states; "
+          f"{result['changed']} new or changed" + (" [dry run]" if args.dry_run else ""))
+    print(f"  Rewritten: {', '.join(result['written']) or 'nothing'}")
+    if result['removed']:
+        print(f"  Removed stale shards: {', '.join(result['removed'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Geo-nearest calibration for generate_new_cities.py.
+
+Loads a local Census Gazetteer places file (e.g. 2023_Gaz_place_national.txt
+from census.gov/geographies/reference-files) to attach lat/lng to cities,
+then builds one KD-tree per market type over the existing full entries.
+Each new city is calibrated from its k nearest existing neighbors of the
+same market type, so Everglades City is compared with Florida City and
+Chokoloskee rather than Jacksonville. Lookups are O(log n).
+
+Points are stored as 3-D unit vectors, so the KD-tree's Euclidean (chord)
+distance orders neighbors exactly like great-circle distance.
+"""
+
+import csv
+import heapq
+import math
+
+from city_data import normalize_id, normalize_place_name, slugify
+
+EARTH_RADIUS_MI = 3958.8
+DEFAULT_K = 5
+# How far the generated ADR/occupancy/price move toward the neighbor average
+CALIBRATION_WEIGHT = 0.5
+
+
+# ============================================================
+# Gazetteer
+# ============================================================
+
+def load_gazetteer(path):
+    """Return {normalize_id(state-slug): (lat, lng)} from a Gazetteer places file."""
+    coords = {}
+    with open(path, newline='', encoding='latin-1') as f:
+        reader = csv.reader(f, delimiter='\t')
+        header = [h.strip() for h in next(reader)]
+        col = {h: i for i, h in enumerate(header)}
+        st_i, name_i, lat_i, lng_i = col['USPS'], col['NAME'], col['INTPTLAT'], col['INTPTLONG']
+        for row in reader:
+            try:
+                lat, lng = float(row[lat_i]), float(row[lng_i].strip())
+            except (ValueError, IndexError):
+                continue
+            name = normalize_place_name(row[name_i])
+            key = normalize_id(f"{row[st_i].lower()}-{slugify(name)}")
+            coords.setdefault(key, (lat, lng))
+    return coords
+
+
+def lookup(coords, city_id, state=None, name=None):
+    """Find (lat, lng) for a city by id, falling back to state + name."""
+    hit = coords.get(normalize_id(city_id))
+    if hit is None and state and name:
+        hit = coords.get(normalize_id(f"{state.lower()}-{slugify(normalize_place_name(name))}"))
+    return hit
+
+
+def attach_coordinates(existing_by_state, coords):
+    """Set lat/lng on every existing city the gazetteer knows. Returns the count."""
+    found = 0
+    for state, cities in existing_by_state.items():
+        for c in cities:
+            hit = lookup(coords, c.id, state, c.name)
+            if hit:
+                c.lat, c.lng = hit
+                found += 1
+    return found
+
+
+# ============================================================
+# KD-tree
+# ============================================================
+
+def _unit_vector(lat, lng):
+    phi, lam = math.radians(lat), math.radians(lng)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def chord_to_miles(chord):
+    return 2 * EARTH_RADIUS_MI * math.asin(min(1.0, chord / 2))
+
+
+class KDTree:
+    """Static 3-D KD-tree over (lat, lng) points with k-nearest queries."""
+
+    __slots__ = ('_nodes', '_root')
+
+    def __init__(self, items):
+        """items: iterable of (lat, lng, payload)."""
+        points = [(_unit_vector(lat, lng), payload) for lat, lng, payload in items]
+        # Node = (point, payload, axis, left, right); indices into self._nodes
+        self._nodes = []
+        self._root = self._build(points, 0)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _build(self, points, depth):
+        if not points:
+            return -1
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        idx = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(points[:mid], depth + 1)
+        right = self._build(points[mid + 1:], depth + 1)
+        self._nodes[idx] = (points[mid][0], points[mid][1], axis, left, right)
+        return idx
+
+    def nearest(self, lat, lng, k=DEFAULT_K):
+        """Return [(distance_miles, payload)] for the k nearest points, closest first."""
+        if self._root < 0:
+            return []
+        target = _unit_vector(lat, lng)
+        heap = []  # max-heap on squared distance: (-d2, tiebreak, payload)
+        stack = [self._root]
+        while stack:
+            idx = stack.pop()
+            if idx < 0:
+                continue
+            point, payload, axis, left, right = self._nodes[idx]
+            d2 = ((point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+                  + (point[2] - target[2]) ** 2)
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, idx, payload))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, idx, payload))
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Visit the far side only if the splitting plane is within reach
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                stack.append(far)
+            stack.append(near)
+        return [(chord_to_miles(math.sqrt(-d2)), payload) for d2, _, payload in sorted(heap, reverse=True)]
+
+
+# ============================================================
+# Calibration
+# ============================================================
+
+class NeighborIndex:
+    """One KD-tree per market type over existing cities that have coordinates."""
+
+    def __init__(self, existing_by_state):
+        by_type = {}
+        everything = []
+        for cities in existing_by_state.values():
+            for c in cities:
+                if c.lat is None:
+                    continue
+                by_type.setdefault(c.type, []).append((c.lat, c.lng, c))
+                everything.append((c.lat, c.lng, c))
+        self.trees = {mtype: KDTree(items) for mtype, items in by_type.items()}
+        self.all = KDTree(everything)
+
+    def nearest(self, lat, lng, mtype, k=DEFAULT_K):
+        """k nearest of the same market type; falls back to any type if too few exist."""
+        tree = self.trees.get(mtype)
+        if tree is None or len(tree) < k:
+            tree = self.all
+        return tree.nearest(lat, lng, k)
+
+
+def neighbor_profile(neighbors):
+    """Inverse-distance weighted ADR / occupancy / price of a neighbor list."""
+    if not neighbors:
+        return None
+    total = adr = occ = price = 0.0
+    for dist, c in neighbors:
+        w = 1.0 / (1.0 + dist)
+        total += w
+        adr += w * c.adr
+        occ += w * c.occ
+        price += w * c.price
+    return {'adr': adr / total, 'occ': occ / total, 'price': price / total,
+            'nearest': [(round(d, 1), c.id) for d, c in neighbors]}
+
+
+def blend(generated, observed, weight=CALIBRATION_WEIGHT):
+    return generated * (1 - weight) + observed * weight
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Set mtrMonthlyIncome in city-data.ts from HUD Fair Market Rents.
+
+generate_city_data() sets mtrMonthlyIncome to monthlyRevenue x 0.70, and
+the calculator asks /api/hud-fmr for real rents one page view at a time.
+This ingests HUD's county-level FMR file once and writes the rent into
+every entry it can match:
+
+    python3 scripts/ingest_hud_fmr.py --fmr /path/to/FY25_FMRs.csv
+
+- Export the FMR workbook (huduser.gov, "FMRs by county") to CSV. Column
+  names vary by year; fips/fips2010, stusps/state_alpha, countyname/
+  cntyname and fmr_0..fmr_4 (or fmr0..fmr4) are all recognised
+- Rows are indexed by 5-digit county FIPS. New England files list one row
+  per town; those are averaged per county, weighted by the pop column
+- Our `county` strings are joined through a (state, normalized name) ->
+  FIPS map: "Anchorage Borough" and "Anchorage Municipality" meet as
+  "anchorage", while "Richmond City" stays apart from "Richmond County"
+- The rent is the FMR for --bedrooms (default 3, the size monthlyRevenue is
+  quoted for) times --premium for furnishing (default 1.0, the bare FMR)
+- Unmatched counties keep their current value and are listed
+
+Small Area FMRs are ZIP-level and need a ZIP -> county crosswalk, so only
+the county file is read here.
+"""
+
+import argparse
+import csv
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+
+from city_data import CITY_DATA_TS, iter_cities, patch_entries, read_bytes, set_field
+from validate_city_data import add_no_validate, check, snapshot
+
+BEDROOM_COLUMNS = {n: (f'fmr_{n}', f'fmr{n}') for n in range(5)}
+FIPS_COLUMNS = ('fips', 'fips2010', 'fips2000')
+STATE_COLUMNS = ('stusps', 'state_alpha', 'st')
+COUNTY_COLUMNS = ('countyname', 'cntyname', 'county_name')
+POP_PREFIX = 'pop'
+
+# Longest first, so "city and borough" goes before "borough"
+_DESCRIPTORS = ('city and borough', 'census area', 'municipality', 'borough', 'parish', 'county')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def county_key(state, county):
+    """(state, normalized county, is_city) used to join our names to HUD's."""
+    text = county
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = ' '.join(_WORD_RE.findall(text.lower().replace("'", '')))
+    text = re.sub(r'\bsaint\b', 'st', text)
+    for descriptor in _DESCRIPTORS:
+        if text.endswith(' ' + descriptor):
+            text = text[:-len(descriptor) - 1]
+            break
+    is_city = text.endswith(' city')
+    if is_city:
+        text = text[:-5]
+    return state.upper(), text, is_city
+
+
+def _column(header, candidates, required=True):
+    lower = {h.strip().lower(): h for h in header}
+    for name in candidates:
+        if name in lower:
+            return lower[name]
+    if required:
+        raise ValueError(f"FMR CSV has none of the columns {', '.join(candidates)}")
+    return None
+
+
+def load_fmr(path, encoding='utf-8-sig'):
+    """Return ({fips5: [fmr_0..fmr_4]}, {county_key: fips5}) from a county FMR CSV."""
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+        fips_col = _column(header, FIPS_COLUMNS)
+        state_col = _column(header, STATE_COLUMNS)
+        county_col = _column(header, COUNTY_COLUMNS)
+        bedroom_cols = [_column(header, BEDROOM_COLUMNS[n]) for n in range(5)]
+        pop_col = next((h for h in header if h.strip().lower().startswith(POP_PREFIX)), None)
+
+        sums = defaultdict(lambda: [0.0] * 6)        # fmr_0..fmr_4 weighted sums + weight
+        names = {}
+        for row in reader:
+            fips = re.sub(r'\D', '', row[fips_col] or '')
+            if not fips:
+                continue
+            fips5 = fips.zfill(5) if len(fips) <= 5 else fips.zfill(10)[:5]
+            try:
+                rents = [float(row[c].replace(',', '').replace('$', '')) for c in bedroom_cols]
+            except (TypeError, ValueError):
+                continue
+            try:
+                weight = float(row[pop_col].replace(',', '')) if pop_col and row[pop_col] else 1.0
+            except ValueError:
+                weight = 1.0
+            weight = weight or 1.0
+            acc = sums[fips5]
+            for n, rent in enumerate(rents):
+                acc[n] += rent * weight
+            acc[5] += weight
+            names.setdefault(county_key(row[state_col], row[county_col]), fips5)
+
+    by_fips = {fips5: [round(acc[n] / acc[5]) for n in range(5)] for fips5, acc in sums.items()}
+    return by_fips, names
+
+
+def match_counties(city_path, by_fips, names):
+    """Return ({city_id: fips5}, sorted unmatched (state, county) pairs)."""
+    matched, unmatched = {}, set()
+    for state, city in iter_cities(city_path):
+        fips5 = names.get(county_key(state, city['county']))
+        if fips5 in by_fips:
+            matched[city['id']] = fips5
+        else:
+            unmatched.add((state, city['county']))
+    return matched, sorted(unmatched)
+
+
+def apply_fmr(city_path, matched, by_fips, bedrooms=3, premium=1.0, dry_run=False):
+    """Set mtrMonthlyIncome on every matched entry. Returns the changed count."""
+    def patch(_state, raw):
+        m = re.search(rb"""["']?id["']?\s*:\s*['"]([^'"]+)['"]""", raw)
+        fips5 = matched.get(m.group(1).decode('utf-8')) if m else None
+        if fips5 is None:
+            return None
+        return set_field(raw, 'mtrMonthlyIncome', int(round(by_fips[fips5][bedrooms] * premium)))
+
+    data = read_bytes(city_path)
+    new_data, changed = patch_entries(data, 'cityData', patch)
+    if changed and not dry_run:
+        with open(city_path, 'wb') as f:
+            f.write(new_data)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--fmr', required=True, help='HUD county FMR file exported as CSV')
+    parser.add_argument('--encoding', default='utf-8-sig')
+    parser.add_argument('--bedrooms', type=int, default=3, choices=range(5), help='FMR bedroom count (0-4, default 3)')
+    parser.add_argument('--premium', type=float, default=1.0, help='Furnished multiplier on the FMR (default 1.0)')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--dry-run', action='store_true')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    baseline = None if args.no_validate or args.dry_run else snapshot(args.city_data)
+
+    by_fips, names = load_fmr(args.fmr, args.encoding)
+    print(f"Loaded FMRs for {len(by_fips)} counties from {args.fmr}")
+    matched, unmatched = match_counties(args.city_data, by_fips, names)
+    changed = apply_fmr(args.city_data, matched, by_fips, args.bedrooms, args.premium, args.dry_run)
+    print(f"Matched {len(matched)} cities to a county FMR; {changed} mtrMonthlyIncome values "
+          f"{'would change' if args.dry_run else 'updated'} ({args.bedrooms}BR x {args.premium:g})")
+    if unmatched:
+        print(f"{len(unmatched)} counties without an FMR row (values kept):")
+        for state, county in unmatched[:20]:
+            print(f"  {state}: {county}")
+        if len(unmatched) > 20:
+            print(f"  ... and {len(unmatched) - 20} more")
+    if changed and not args.dry_run and not args.no_validate and check(args.city_data, baseline=baseline):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
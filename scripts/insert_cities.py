@@ -3,14 +3,31 @@
 Insert new city entries into city-data.ts at the correct state array positions.
 Reads the generated entries from /tmp/new_city_entries.txt and inserts them
 into the appropriate state arrays in city-data.ts.
+
+Usage: python3 scripts/insert_cities.py [--entries PATH] [--city-data PATH]
 """
 
+import argparse
 import re
+import sys
 from collections import defaultdict
 
-def main():
+from city_data import CITY_DATA_TS
+from validate_city_data import add_no_validate, check, snapshot
+
+DEFAULT_ENTRIES = '/tmp/new_city_entries.txt'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Insert generated city entries into city-data.ts.')
+    parser.add_argument('--entries', default=DEFAULT_ENTRIES, help=f'Generated entries (default {DEFAULT_ENTRIES})')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    baseline = None if args.no_validate else snapshot(args.city_data)
+
     # Read the generated entries
-    with open('/tmp/new_city_entries.txt') as f:
+    with open(args.entries) as f:
         lines = f.readlines()
     
     # Parse entries by state
@@ -29,7 +46,7 @@ def main():
         print(f"  {state}: {len(entries_by_state[state])} cities")
     
     # Read city-data.ts
-    with open('src/data/city-data.ts') as f:
+    with open(args.city_data) as f:
         ts_lines = f.readlines()
     
     # Find state array boundaries (line numbers are 0-indexed here)
@@ -83,13 +100,13 @@ def main():
         print(f"Inserted {len(entries)} cities into {state} at line {insert_at + 1}")
     
     # Write back
-    with open('src/data/city-data.ts', 'w') as f:
+    with open(args.city_data, 'w') as f:
         f.writelines(ts_lines)
     
     print(f"\nTotal: {total_inserted} new cities inserted into city-data.ts")
     
     # Verify by counting total cities
-    with open('src/data/city-data.ts') as f:
+    with open(args.city_data) as f:
         content = f.read()
     ids = re.findall(r"id: '([^']+)'", content)
     print(f"Total cities now in city-data.ts: {len(ids)}")
@@ -106,5 +123,9 @@ def main():
     else:
         print("No duplicate IDs found.")
 
+    if not args.no_validate and check(args.city_data, baseline=baseline):
+        return 1
+    return 0
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -10,18 +10,23 @@ Downloads fresh data from:
 
 Then surgically updates:
   - src/data/state-data.ts (appreciation + mortgage rates)
-  - src/data/inventory-data.ts (DOM, price cuts, inventory level)
+  - src/data/inventory-data.ts (DOM, price cuts, inventory level, and
+    inventoryVs2019 against the Dec 2019 Redfin baseline)
   - src/data/helpers.ts (DATA_LAST_UPDATED)
   - src/data/basic-city-data.ts (comment)
+  - src/data/city-data.ts, with --propagate-prices only (medianHomePrice
+    scaled by the state ZHVI change, RPR / DSI / scores recomputed; see
+    propagate_appreciation.py)
 
 Does NOT modify:
   - STR revenue, ADR, occupancy (PriceLabs data)
   - Migration data (Census)
   - STR regulations (curated)
   - Demand drivers, playbooks, amenity deltas
-  - City-level medianHomePrice
+  - City-level medianHomePrice (unless --propagate-prices)
 """
 
+import argparse
 import csv
 import io
 import gzip
@@ -30,6 +35,9 @@ import sys
 import urllib.request
 from datetime import datetime
 
+from anomaly_gates import MAX_FLAGGED_SHARE, MAX_Z, current_values, gate, load_previous
+from city_data import CITY_DATA_TS, NAME_TO_CODE
+
 # ============================================================
 # Config
 # ============================================================
@@ -42,22 +50,12 @@ INVENTORY_TS = "src/data/inventory-data.ts"
 HELPERS_TS = "src/data/helpers.ts"
 BASIC_CITY_TS = "src/data/basic-city-data.ts"
 
-NAME_TO_CODE = {
-    'Alabama': 'AL', 'Alaska': 'AK', 'Arizona': 'AZ', 'Arkansas': 'AR',
-    'California': 'CA', 'Colorado': 'CO', 'Connecticut': 'CT', 'Delaware': 'DE',
-    'Florida': 'FL', 'Georgia': 'GA', 'Hawaii': 'HI', 'Idaho': 'ID',
-    'Illinois': 'IL', 'Indiana': 'IN', 'Iowa': 'IA', 'Kansas': 'KS',
-    'Kentucky': 'KY', 'Louisiana': 'LA', 'Maine': 'ME', 'Maryland': 'MD',
-    'Massachusetts': 'MA', 'Michigan': 'MI', 'Minnesota': 'MN', 'Mississippi': 'MS',
-    'Missouri': 'MO', 'Montana': 'MT', 'Nebraska': 'NE', 'Nevada': 'NV',
-    'New Hampshire': 'NH', 'New Jersey': 'NJ', 'New Mexico': 'NM', 'New York': 'NY',
-    'North Carolina': 'NC', 'North Dakota': 'ND', 'Ohio': 'OH', 'Oklahoma': 'OK',
-    'Oregon': 'OR', 'Pennsylvania': 'PA', 'Rhode Island': 'RI', 'South Carolina': 'SC',
-    'South Dakota': 'SD', 'Tennessee': 'TN', 'Texas': 'TX', 'Utah': 'UT',
-    'Vermont': 'VT', 'Virginia': 'VA', 'Washington': 'WA', 'West Virginia': 'WV',
-    'Wisconsin': 'WI', 'Wyoming': 'WY', 'District of Columbia': 'DC'
+# inventory-data.ts field -> Redfin period (YYYY-MM) whose inventory it is measured against
+INVENTORY_ANCHORS = {
+    'inventoryVs2019': '2019-12',
 }
 
+
 def download(url):
     """Download a URL and return bytes."""
     req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
@@ -102,46 +100,79 @@ def fetch_zillow():
 # ============================================================
 # 2. Parse Redfin state data
 # ============================================================
-def fetch_redfin():
+def _redfin_float(fields, idx):
+    try:
+        val = fields[idx].strip('"')
+        return float(val) if val and val != 'NA' else None
+    except (ValueError, IndexError):
+        return None
+
+
+def _open_source(source):
+    """Binary stream for a URL or a local path."""
+    if re.match(r'https?://', source):
+        req = urllib.request.Request(source, headers={'User-Agent': 'Mozilla/5.0'})
+        return urllib.request.urlopen(req, timeout=120)
+    return open(source, 'rb')
+
+
+def fetch_redfin(source=REDFIN_URL, anchors=INVENTORY_ANCHORS):
+    """One streaming pass over the Redfin state tracker.
+
+    Per state this keeps the latest All Residential row and, for each anchor
+    period in `anchors`, that month's inventory. Rows are split by series
+    (period duration, seasonal adjustment) so the baseline always comes from
+    the same series as the latest row. Each anchor field (inventoryVs2019)
+    is the % change of the latest inventory against its baseline.
+    """
     print("Downloading Redfin state market data...")
-    compressed = download(REDFIN_URL)
-    data = gzip.decompress(compressed).decode('utf-8')
-    
+    latest = {}                 # state -> (period, series, fields)
+    baselines = {}              # (state, series, anchor field) -> inventory
+    anchor_items = list(anchors.items())
+
+    # Decompressed and split as it arrives; the file is never held in memory
+    with _open_source(source) as raw, io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding='utf-8') as f:
+        next(f, None)  # header
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) < 51:
+                continue
+
+            period = fields[0].strip('"')
+            state_code = fields[10].strip('"')
+            prop_type = fields[11].strip('"')
+
+            if prop_type != 'All Residential' or not state_code or len(state_code) != 2:
+                continue
+
+            series = (fields[2].strip('"'), fields[6].strip('"'))
+            for name, anchor in anchor_items:
+                if period.startswith(anchor):
+                    baselines.setdefault((state_code, series, name), _redfin_float(fields, 34))
+            if state_code not in latest or period > latest[state_code][0]:
+                latest[state_code] = (period, series, fields)
+
     results = {}
-    lines = data.split('\n')
-    header = lines[0]  # skip
-    
-    for line in lines[1:]:
-        if not line.strip():
-            continue
-        fields = line.split('\t')
-        if len(fields) < 51:
-            continue
-        
-        period = fields[0].strip('"')
-        state_code = fields[10].strip('"')
-        prop_type = fields[11].strip('"')
-        
-        if prop_type != 'All Residential' or not state_code or len(state_code) != 2:
-            continue
-        
-        if state_code not in results or period > results[state_code]['period']:
-            def safe_float(idx):
-                try:
-                    val = fields[idx].strip('"')
-                    return float(val) if val and val != 'NA' else None
-                except (ValueError, IndexError):
-                    return None
-            
-            results[state_code] = {
-                'period': period,
-                'inventory': safe_float(34),
-                'inventoryYoY': round(safe_float(36) * 100, 1) if safe_float(36) is not None else None,
-                'priceCuts': round(safe_float(49) * 100, 1) if safe_float(49) is not None else None,
-                'dom': round(safe_float(40)) if safe_float(40) is not None else None,
-            }
-    
-    print(f"  Parsed {len(results)} states. Latest period: {list(results.values())[0]['period'] if results else 'N/A'}")
+    for state_code, (period, series, fields) in latest.items():
+        inv_yoy = _redfin_float(fields, 36)
+        price_cuts = _redfin_float(fields, 49)
+        dom = _redfin_float(fields, 40)
+        inventory = _redfin_float(fields, 34)
+        row = {
+            'period': period,
+            'inventory': inventory,
+            'inventoryYoY': round(inv_yoy * 100, 1) if inv_yoy is not None else None,
+            'priceCuts': round(price_cuts * 100, 1) if price_cuts is not None else None,
+            'dom': round(dom) if dom is not None else None,
+        }
+        for name, _anchor in anchor_items:
+            base = baselines.get((state_code, series, name))
+            row[name] = round((inventory / base - 1) * 100) if inventory is not None and base else None
+        results[state_code] = row
+
+    with_baseline = sum(all(r[name] is not None for name in anchors) for r in results.values())
+    print(f"  Parsed {len(results)} states ({with_baseline} with all baselines). "
+          f"Latest period: {max((r['period'] for r in results.values()), default='N/A')}")
     return results
 
 # ============================================================
@@ -181,9 +212,9 @@ def fetch_freddie():
 # ============================================================
 # 4. Update state-data.ts
 # ============================================================
-def update_state_data(zillow, freddie):
+def update_state_data(zillow, freddie, path=STATE_DATA_TS):
     print("Updating state-data.ts...")
-    with open(STATE_DATA_TS, 'r') as f:
+    with open(path, 'r') as f:
         content = f.read()
     
     # Determine mortgage trend
@@ -214,16 +245,16 @@ def update_state_data(zillow, freddie):
                        old_text[m2.end(6) - m2.start(0):])
             content = content.replace(old_text, new_text)
     
-    with open(STATE_DATA_TS, 'w') as f:
+    with open(path, 'w') as f:
         f.write(content)
     print(f"  Updated {changes} states")
 
 # ============================================================
 # 5. Update inventory-data.ts
 # ============================================================
-def update_inventory_data(redfin):
+def update_inventory_data(redfin, path=INVENTORY_TS):
     print("Updating inventory-data.ts...")
-    with open(INVENTORY_TS, 'r') as f:
+    with open(path, 'r') as f:
         content = f.read()
     
     changes = 0
@@ -248,42 +279,44 @@ def update_inventory_data(redfin):
         pattern = rf"({code}: \{{ inventoryLevel: ')([^']+)(',\s*inventoryGrowthYoY:\s*)([\d.-]+)(,\s*inventoryVs2019:\s*)([\d.-]+)(,\s*priceCutPercent:\s*)([\d.]+)(,\s*daysOnMarket:\s*)(\d+)"
         m = re.search(pattern, content)
         if m:
-            old_vs2019 = m.group(6)
-            new_line = f"{code}: {{ inventoryLevel: '{level}', inventoryGrowthYoY: {round(inv_yoy)}, inventoryVs2019: {old_vs2019}, priceCutPercent: {round(price_cuts, 1)}, daysOnMarket: {dom}"
+            # Keep the current value when the download has no baseline for this state
+            vs2019 = data.get('inventoryVs2019')
+            vs2019 = m.group(6) if vs2019 is None else vs2019
+            new_line = f"{code}: {{ inventoryLevel: '{level}', inventoryGrowthYoY: {round(inv_yoy)}, inventoryVs2019: {vs2019}, priceCutPercent: {round(price_cuts, 1)}, daysOnMarket: {dom}"
             content = content[:m.start()] + new_line + content[m.end():]
             changes += 1
     
-    with open(INVENTORY_TS, 'w') as f:
+    with open(path, 'w') as f:
         f.write(content)
     print(f"  Updated {changes} states")
 
 # ============================================================
 # 6. Update DATA_LAST_UPDATED
 # ============================================================
-def update_last_updated():
+def update_last_updated(helpers_path=HELPERS_TS, basic_path=BASIC_CITY_TS):
     now = datetime.now()
     month_name = now.strftime('%B %Y')  # e.g., "March 2026"
     
     # helpers.ts
-    with open(HELPERS_TS, 'r') as f:
+    with open(helpers_path, 'r') as f:
         content = f.read()
     content = re.sub(
         r"export const DATA_LAST_UPDATED = '[^']+';",
         f"export const DATA_LAST_UPDATED = '{month_name}';",
         content
     )
-    with open(HELPERS_TS, 'w') as f:
+    with open(helpers_path, 'w') as f:
         f.write(content)
     
     # basic-city-data.ts comment
-    with open(BASIC_CITY_TS, 'r') as f:
+    with open(basic_path, 'r') as f:
         content = f.read()
     content = re.sub(
         r"// Last updated: [A-Z][a-z]+ \d{4}",
         f"// Last updated: {month_name}",
         content
     )
-    with open(BASIC_CITY_TS, 'w') as f:
+    with open(basic_path, 'w') as f:
         f.write(content)
     
     print(f"  DATA_LAST_UPDATED → '{month_name}'")
@@ -291,36 +324,76 @@ def update_last_updated():
 # ============================================================
 # MAIN
 # ============================================================
-if __name__ == '__main__':
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Monthly Zillow / Redfin / Freddie Mac data update.')
+    parser.add_argument('--state-data', default=STATE_DATA_TS)
+    parser.add_argument('--inventory', default=INVENTORY_TS)
+    parser.add_argument('--helpers', default=HELPERS_TS)
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--redfin', default=REDFIN_URL, help='Redfin state tracker .tsv000.gz (URL or local path)')
+    parser.add_argument('--max-z', type=float, default=MAX_Z, help=f'Anomaly gate robust z limit (default {MAX_Z})')
+    parser.add_argument('--max-flagged-share', type=float, default=MAX_FLAGGED_SHARE,
+                        help=f'Block when a metric flags more than this share of states (default {MAX_FLAGGED_SHARE})')
+    parser.add_argument('--force', action='store_true', help='Write even if the anomaly gates fail')
+    parser.add_argument('--propagate-prices', action='store_true',
+                        help="Scale city medianHomePrice by each state's ZHVI change and recompute RPR / DSI / scores")
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--no-validate', action='store_true',
+                        help='Skip validating city-data.ts after --propagate-prices (exit 0 despite known violations)')
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print(f"EDGE MONTHLY DATA UPDATE — {datetime.now().strftime('%B %d, %Y')}")
     print("=" * 60)
     
     try:
         zillow = fetch_zillow()
-        redfin = fetch_redfin()
+        redfin = fetch_redfin(args.redfin)
         freddie = fetch_freddie()
     except Exception as e:
         print(f"\nERROR downloading data: {e}")
         print("Aborting update — no files were modified.")
-        sys.exit(1)
+        return 1
     
     # Sanity checks before writing
     if len(zillow) < 45:
         print(f"ERROR: Only {len(zillow)} states from Zillow (expected 50+). Aborting.")
-        sys.exit(1)
+        return 1
     if len(redfin) < 45:
         print(f"ERROR: Only {len(redfin)} states from Redfin (expected 50+). Aborting.")
-        sys.exit(1)
+        return 1
     if not freddie['thirtyYear'] or freddie['thirtyYear'] < 2 or freddie['thirtyYear'] > 15:
         print(f"ERROR: Suspicious mortgage rate: {freddie['thirtyYear']}%. Aborting.")
-        sys.exit(1)
+        return 1
+
+    # Month-over-month anomaly gates against the values currently on disk
+    previous = load_previous(args.state_data, args.inventory)
+    if not gate(previous, current_values(zillow, redfin), args.max_z, args.max_flagged_share):
+        if not args.force:
+            print("ERROR: Anomaly gates failed (see BLOCK rows above). Aborting — no files were modified.")
+            print("Re-run with --force if the moves are real.")
+            return 1
+        print("WARNING: Anomaly gates failed; writing anyway (--force).")
     
     print("\nAll data validated. Applying updates...")
-    update_state_data(zillow, freddie)
-    update_inventory_data(redfin)
-    update_last_updated()
+    update_state_data(zillow, freddie, args.state_data)
+    update_inventory_data(redfin, args.inventory)
+    violations = 0
+    if args.propagate_prices:
+        from propagate_appreciation import run as propagate_prices
+        print("Propagating state price changes into city-data.ts...")
+        _changed, violations = propagate_prices(
+            args.city_data,
+            {code: v['medianValue'] for code, v in previous.items() if v.get('medianValue')},
+            {code: z['medianValue'] for code, z in zillow.items()},
+            validate=not args.no_validate)
+    update_last_updated(args.helpers, args.basic)
     
     print("\n" + "=" * 60)
     print("UPDATE COMPLETE")
     print("=" * 60)
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
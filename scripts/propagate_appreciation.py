@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Propagate the monthly state ZHVI change into city-level prices and the
+metrics that depend on them.
+
+The monthly update refreshes appreciation.medianValue per state, but each
+city's rental.medianHomePrice stays where it was entered, so rpr, DSI and
+the stored scores drift further from the market every month. This scales
+every city by its state's month-over-month factor (new / previous state
+medianValue) and recomputes, per entry:
+
+- rental.medianHomePrice (scaled, rounded to the dollar)
+- rpr and investmentMetrics.rpr: the stored value divided by the factor,
+  so curated entries whose rpr isn't revenue x 12 / price keep their offset,
+  clamped to generate_city_data()'s 0.05 - 0.35 unless it was already outside
+- investmentMetrics.dsiDetails: monthlyMortgage scales with the price (it is
+  a fixed share of it, whatever financing the entry assumed), then
+  netMonthlyIncome, survives, and both dsi flags
+- investmentMetrics.rprRating, marketScore.affordability / rpr / overall /
+  verdict - only when a value crosses one of generate_city_data()'s band
+  thresholds. The component score then moves by the difference between the
+  band midpoints and overall by its weighted change (kept within the
+  generator's 25 - 95), so curated scores are adjusted rather than overwritten
+
+All arithmetic is one NumPy pass over every entry; the file is patched in a
+single pass and the applied factor is printed per state. States whose factor
+moves more than --max-change are skipped (the anomaly gates should have
+caught those already).
+
+The live site scores with src/lib/scoring.ts from medianHomePrice, so those
+scores follow the new prices without any further step.
+
+monthly-data-update.py runs this with --propagate-prices. Standalone it
+compares two versions of state-data.ts:
+
+    git show HEAD~1:src/data/state-data.ts > /tmp/state-data.ts
+    python3 scripts/propagate_appreciation.py --previous-state-data /tmp/state-data.ts
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from city_data import (
+    CITY_DATA_TS, STATE_DATA_TS, iter_array_entries, load_state_data, patch_entries, read_bytes, set_path, ts_to_json,
+)
+from validate_city_data import add_no_validate, check, snapshot
+
+MAX_CHANGE = 0.05
+
+# generate_city_data() bands: (lower bound, label, score range midpoint), best first
+RPR_BANDS = ((0.18, 'elite', 85.0), (0.15, 'good', 69.0), (0.12, 'marginal', 48.5), (-np.inf, 'poor', 24.0))
+# Affordability is banded on price, cheapest first: (upper bound, score range midpoint)
+PRICE_BANDS = ((200000, 85.0), (300000, 73.5), (450000, 56.5), (600000, 36.5), (np.inf, 25.0))
+VERDICT_BANDS = ((78, 'strong-buy'), (65, 'buy'), (52, 'hold'), (40, 'caution'), (-np.inf, 'avoid'))
+AFFORDABILITY_WEIGHT = 0.25
+RPR_WEIGHT = 0.15
+# generate_city_data() clamps
+RPR_RANGE = (0.05, 0.35)
+OVERALL_RANGE = (25, 95)
+
+
+def state_factors(previous, current, max_change=MAX_CHANGE):
+    """Return ({state: factor}, {state: factor} skipped) from two {state: medianValue} maps."""
+    factors, skipped = {}, {}
+    for code in sorted(set(previous) & set(current)):
+        old, new = previous[code], current[code]
+        if not old or not new:
+            continue
+        factor = new / old
+        (factors if abs(factor - 1) <= max_change else skipped)[code] = factor
+    return factors, skipped
+
+
+def median_values(state_path=STATE_DATA_TS):
+    return {code: s['appreciation']['medianValue'] for code, s in load_state_data(state_path).items()}
+
+
+def _band(values, bounds):
+    """Index of the first band whose lower bound `values` reach (bounds descending)."""
+    return np.searchsorted(-np.asarray(bounds, dtype=float), -values, side='left')
+
+
+def _price_band(prices):
+    """Index of the affordability band (price below its upper bound)."""
+    return np.searchsorted(np.array([b for b, _ in PRICE_BANDS[:-1]], dtype=float), prices, side='right')
+
+
+def load_columns(data):
+    """Per-entry arrays (file order) of everything the propagation reads."""
+    states, rows = [], []
+    for state, s, e in iter_array_entries(data, 'cityData'):
+        city = json.loads(ts_to_json(data[s:e]))
+        ms, rental, im = city['marketScore'], city['rental'], city['investmentMetrics']
+        dd = im['dsiDetails']
+        states.append(state)
+        rows.append((rental['medianHomePrice'], rental['monthlyRevenue'], city['rpr'],
+                     dd['monthlyMortgage'], dd['monthlyExpenses'],
+                     ms['overall'], ms['affordability'], ms['rpr']))
+    cols = np.array(rows, dtype=np.float64).reshape(-1, 8).T
+    return np.array(states), dict(zip(
+        ('price', 'revenue', 'rpr', 'mortgage', 'expenses', 'overall', 'affordability', 'rpr_score'), cols))
+
+
+def propagate(states, c, factors):
+    """Vectorized recompute. Returns a dict of new per-entry arrays plus the `moved` mask."""
+    factor = np.array([factors.get(s, 1.0) for s in states])
+    moved = factor != 1.0
+
+    price = np.where(moved, np.round(c['price'] * factor), c['price'])
+    # Curated entries already outside the range are scaled, not pulled into it
+    rpr = np.round(c['rpr'] / factor, 3)
+    in_range = (c['rpr'] >= RPR_RANGE[0]) & (c['rpr'] <= RPR_RANGE[1])
+    rpr = np.where(moved, np.where(in_range, np.clip(rpr, *RPR_RANGE), rpr), c['rpr'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mortgage = np.where(c['price'] > 0, np.round(c['mortgage'] * price / c['price']), c['mortgage'])
+    net = c['revenue'] - mortgage - c['expenses']
+
+    rpr_bounds = [b for b, _, _ in RPR_BANDS]
+    rpr_mid = np.array([m for _, _, m in RPR_BANDS])
+    old_rpr_band, new_rpr_band = _band(c['rpr'], rpr_bounds), _band(rpr, rpr_bounds)
+    rpr_delta = np.where(old_rpr_band != new_rpr_band, rpr_mid[new_rpr_band] - rpr_mid[old_rpr_band], 0.0)
+
+    price_mid = np.array([m for _, m in PRICE_BANDS])
+    old_price_band, new_price_band = _price_band(c['price']), _price_band(price)
+    aff_delta = np.where(old_price_band != new_price_band,
+                         price_mid[new_price_band] - price_mid[old_price_band], 0.0)
+
+    rpr_score = np.clip(np.round(c['rpr_score'] + rpr_delta), 0, 100)
+    affordability = np.clip(np.round(c['affordability'] + aff_delta), 0, 100)
+    overall = np.clip(np.round(c['overall'] + AFFORDABILITY_WEIGHT * (affordability - c['affordability'])
+                               + RPR_WEIGHT * (rpr_score - c['rpr_score'])), *OVERALL_RANGE)
+    verdict_bounds = [b for b, _ in VERDICT_BANDS]
+    old_verdict_band, new_verdict_band = _band(c['overall'], verdict_bounds), _band(overall, verdict_bounds)
+
+    return {
+        'moved': moved, 'factor': factor, 'price': price, 'rpr': rpr, 'mortgage': mortgage, 'net': net,
+        'rpr_band': np.where(old_rpr_band != new_rpr_band, new_rpr_band, -1),
+        'rpr_score': rpr_score, 'affordability': affordability, 'overall': overall,
+        'verdict_band': np.where(old_verdict_band != new_verdict_band, new_verdict_band, -1),
+    }
+
+
+def _patch_entry(raw, r, i):
+    raw = set_path(raw, 'rental.medianHomePrice', int(r['price'][i]))
+    rpr = float(r['rpr'][i])
+    survives = bool(r['net'][i] > 0)
+    raw = set_path(raw, 'rpr', rpr)
+    raw = set_path(raw, 'investmentMetrics.rpr', rpr)
+    raw = set_path(raw, 'dsi', survives)
+    raw = set_path(raw, 'investmentMetrics.dsi', survives)
+    raw = set_path(raw, 'investmentMetrics.dsiDetails.monthlyMortgage', int(r['mortgage'][i]))
+    raw = set_path(raw, 'investmentMetrics.dsiDetails.netMonthlyIncome', int(r['net'][i]))
+    raw = set_path(raw, 'investmentMetrics.dsiDetails.survives', survives)
+    if r['rpr_band'][i] >= 0:
+        raw = set_path(raw, 'investmentMetrics.rprRating', RPR_BANDS[r['rpr_band'][i]][1])
+    raw = set_path(raw, 'marketScore.rpr', int(r['rpr_score'][i]))
+    raw = set_path(raw, 'marketScore.affordability', int(r['affordability'][i]))
+    raw = set_path(raw, 'marketScore.overall', int(r['overall'][i]))
+    if r['verdict_band'][i] >= 0:
+        raw = set_path(raw, 'marketScore.verdict', VERDICT_BANDS[r['verdict_band'][i]][1])
+    return raw
+
+
+def apply(city_path, factors, dry_run=False):
+    """Scale every entry of the factored states. Returns (states array, results, changed entries)."""
+    data = read_bytes(city_path)
+    states, columns = load_columns(data)
+    results = propagate(states, columns, factors)
+
+    index = iter(range(len(states)))
+
+    def patch(_state, raw):
+        i = next(index)
+        return _patch_entry(raw, results, i) if results['moved'][i] else None
+
+    new_data, changed = patch_entries(data, 'cityData', patch)
+    if changed and not dry_run:
+        with open(city_path, 'wb') as f:
+            f.write(new_data)
+    return states, columns, results, changed
+
+
+def report(states, columns, results, factors, skipped):
+    moved = results['moved']
+    print(f"  Price propagation ({len(factors)} states, {int(moved.sum())} cities):")
+    for code in sorted(factors):
+        mask = states == code
+        if not mask.any():
+            continue
+        rating = int((results['rpr_band'][mask] >= 0).sum())
+        verdict = int((results['verdict_band'][mask] >= 0).sum())
+        print(f"    {code} x{factors[code]:.4f}  {int(mask.sum()):>3} cities  "
+              f"median price {np.median(columns['price'][mask]):>9,.0f} -> {np.median(results['price'][mask]):>9,.0f}  "
+              f"rating changes {rating:>2}  verdict changes {verdict:>2}")
+    for code, factor in sorted(skipped.items()):
+        print(f"    {code} x{factor:.4f}  skipped (beyond --max-change)")
+
+
+def run(city_path, previous, current, max_change=MAX_CHANGE, dry_run=False, validate=True):
+    """Propagate {state: medianValue} previous -> current into city_path.
+
+    Returns (changed entries, violations the write introduced).
+    """
+    factors, skipped = state_factors(previous, current, max_change)
+    baseline = snapshot(city_path) if validate and not dry_run else None
+    states, columns, results, changed = apply(city_path, factors, dry_run)
+    report(states, columns, results, factors, skipped)
+    violations = check(city_path, baseline=baseline) if changed and baseline is not None else 0
+    return changed, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scale city prices by the state ZHVI change and recompute RPR / DSI / scores.')
+    parser.add_argument('--previous-state-data', required=True, help='state-data.ts before the monthly update')
+    parser.add_argument('--state-data', default=STATE_DATA_TS)
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--max-change', type=float, default=MAX_CHANGE,
+                        help=f'Skip states whose factor moves more than this (default {MAX_CHANGE})')
+    parser.add_argument('--dry-run', action='store_true')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+
+    changed, violations = run(args.city_data, median_values(args.previous_state_data),
+                              median_values(args.state_data), args.max_change, args.dry_run, not args.no_validate)
+    print(f"{changed} entries {'would change' if args.dry_run else 'updated'}")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Regenerate basic-city-data.ts (Tier 2) from a Census SUB-EST population CSV.
+
+Download the "City and Town Population Totals" file (e.g. sub-est2023.csv)
+from census.gov and run:
+
+    python3 scripts/regenerate_basic_cities.py --census /path/to/sub-est2023.csv
+
+- Streams the CSV row by row and keeps incorporated places (SUMLEV 162) and
+  consolidated-city balances (SUMLEV 172), bucketed by state
+- Normalizes place names: "Juneau city and borough" -> "Juneau",
+  "Indianapolis city (balance)" -> "Indianapolis", "Boise City city" ->
+  "Boise City". Only lowercase legal descriptors are stripped
+- Keeps existing ids stable through an alias map built from the current file,
+  so the old ak-juneau-city-and row keeps its id but gets the clean name
+- Sets hasFullData from city-data.ts and refreshes `population` on matching
+  city-data.ts entries in the same run
+- Emits the whole module with a single buffered write
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import defaultdict
+
+from city_data import (
+    CITY_DATA_TS, BASIC_CITY_TS, NAME_TO_CODE, iter_array_entries, iter_basic_cities, normalize_id,
+    normalize_place_name, patch_entries, read_bytes, set_field, slugify,
+)
+from sync_has_full_data import load_full_ids
+from validate_city_data import add_no_validate, check, snapshot
+
+# SUB-EST summary levels: 162 = incorporated place, 172 = consolidated city
+# (balance). 170 (the consolidated total) would double count Nashville etc.
+PLACE_SUMLEVS = {'162', '172'}
+
+
+def census_year(path, encoding='latin-1'):
+    """Latest POPESTIMATEyyyy year in the CSV header."""
+    with open(path, newline='', encoding=encoding) as f:
+        header = next(csv.reader(f))
+    years = sorted(c[-4:] for c in header if re.fullmatch(r'POPESTIMATE\d{4}', c))
+    if not years:
+        raise ValueError(f"{path}: no POPESTIMATEyyyy columns")
+    return years[-1]
+
+
+def stream_census(path, encoding='latin-1', year=None):
+    """Yield (state, name, population) for every place row, streaming the CSV."""
+    year = year or census_year(path, encoding)
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        col = {name: i for i, name in enumerate(header)}
+        pop_col = f"POPESTIMATE{year}"
+        pop_i, sum_i, name_i, st_i = col[pop_col], col['SUMLEV'], col['NAME'], col['STNAME']
+        for row in reader:
+            if row[sum_i] not in PLACE_SUMLEVS:
+                continue
+            state = NAME_TO_CODE.get(row[st_i])
+            if not state:
+                continue
+            try:
+                population = int(row[pop_i])
+            except ValueError:
+                continue
+            yield state, normalize_place_name(row[name_i]), population
+
+
+def build_alias_map(basic_path=BASIC_CITY_TS):
+    """normalize_id(...) -> existing id, so regenerated rows keep their old ids.
+
+    Each existing row is registered under its own id and under the id its
+    cleaned-up name would produce, so "Nashville-Davidson metropolitan
+    government" still claims the new tn-nashville row.
+    """
+    aliases = {}
+    for state, row in iter_basic_cities(basic_path):
+        aliases.setdefault(normalize_id(row['id']), row['id'])
+        clean = f"{state.lower()}-{slugify(normalize_place_name(row['name']))}"
+        aliases.setdefault(normalize_id(clean), row['id'])
+    return aliases
+
+
+def bucket_rows(census_rows, aliases):
+    """Group census rows by state, dedupe on id, keep the larger population.
+
+    Also returns the ids that more than one census row collapsed into.
+    """
+    by_state = defaultdict(dict)
+    aliased = 0
+    merged = set()
+    for state, name, population in census_rows:
+        new_id = f"{state.lower()}-{slugify(name)}"
+        city_id = aliases.get(normalize_id(new_id), new_id)
+        if city_id != new_id:
+            aliased += 1
+        rows = by_state[state]
+        if city_id in rows:
+            merged.add(city_id)
+        if city_id not in rows or population > rows[city_id]['population']:
+            rows[city_id] = {'id': city_id, 'name': name, 'state': state, 'population': population}
+    return by_state, aliased, merged
+
+
+def _ts_string(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def render_module(by_state, full_ids, header, footer):
+    """Render basic-city-data.ts as one string (states A-Z, population desc)."""
+    out = [header]
+    total = 0
+    for state in sorted(by_state):
+        out.append(f"  {state}: [\n")
+        for row in sorted(by_state[state].values(), key=lambda r: (-r['population'], r['id'])):
+            out.append(
+                f"    {{ id: {_ts_string(row['id'])}, name: {_ts_string(row['name'])}, "
+                f"state: \"{state}\", population: {row['population']}, "
+                f"hasFullData: {'true' if row['id'] in full_ids else 'false'} }},\n"
+            )
+            total += 1
+        out.append("  ],\n")
+    out.append("};\n\n")
+    out.append(f"// Total cities: {total}\n")
+    out.append(footer)
+    return ''.join(out), total
+
+
+def _entry_id(raw):
+    m = re.search(rb"""["']?id["']?\s*:\s*['"]([^'"]+)['"]""", raw)
+    return m.group(1).decode('utf-8') if m else None
+
+
+def refresh_full_populations(populations, city_path=CITY_DATA_TS, dry_run=False, merged=()):
+    """Set population on city-data.ts entries whose id matches a census row.
+
+    The exact id wins. An entry falls back to its normalize_id() key only when
+    that key belongs to exactly one census row (not one of the `merged` ids)
+    that no other entry matches exactly - otherwise the Nashville-Davidson
+    "(balance)" entry would take the consolidated city's population.
+    """
+    data = read_bytes(city_path)
+    exact = {city_id for _state, s, e in iter_array_entries(data, 'cityData')
+             if (city_id := _entry_id(data[s:e])) in populations}
+    by_norm = {}
+    for city_id in populations:
+        by_norm.setdefault(normalize_id(city_id), []).append(city_id)
+
+    def patch(_state, raw):
+        city_id = _entry_id(raw)
+        if city_id is None:
+            return None
+        population = populations.get(city_id)
+        if population is None:
+            candidates = by_norm.get(normalize_id(city_id), [])
+            if len(candidates) != 1 or candidates[0] in exact or candidates[0] in merged:
+                return None
+            population = populations[candidates[0]]
+        return set_field(raw, 'population', population)
+
+    new_data, changed = patch_entries(data, 'cityData', patch)
+    if changed and not dry_run:
+        with open(city_path, 'wb') as f:
+            f.write(new_data)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--census', required=True, help='Census SUB-EST CSV (e.g. sub-est2023.csv)')
+    parser.add_argument('--year', help='POPESTIMATE year column to use (default: latest)')
+    parser.add_argument('--encoding', default='latin-1', help='CSV encoding (Census files are latin-1)')
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--drop-missing', action='store_true',
+                        help='Drop existing rows that are not in the census file (default: keep them)')
+    parser.add_argument('--dry-run', action='store_true')
+    add_no_validate(parser)
+    args = parser.parse_args(argv)
+    baseline = None if args.no_validate or args.dry_run else snapshot(args.city_data)
+
+    text = read_bytes(args.basic).decode('utf-8')
+    export_at = text.index('export const basicCityData')
+    header = text[:text.index('{', export_at) + 2]
+    year = args.year or census_year(args.census, args.encoding)
+    header = re.sub(r'Census Bureau \d{4} Population', f'Census Bureau {year} Population', header)
+    footer_m = re.search(r'// Last updated: .*\n?', text)
+    footer = footer_m.group(0) if footer_m else ''
+
+    aliases = build_alias_map(args.basic)
+    by_state, aliased, merged = bucket_rows(stream_census(args.census, args.encoding, year), aliases)
+
+    populations = {cid: row['population'] for rows in by_state.values() for cid, row in rows.items()}
+    missing = 0
+    for state, row in iter_basic_cities(data=text.encode('utf-8')):
+        if row['id'] not in by_state[state]:
+            missing += 1
+            if not args.drop_missing:
+                by_state[state][row['id']] = {k: row[k] for k in ('id', 'name', 'state', 'population')}
+
+    full_ids = load_full_ids(args.city_data)
+    module, total = render_module(by_state, full_ids, header, footer)
+    if not args.dry_run:
+        tmp = args.basic + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(module)
+        os.replace(tmp, args.basic)
+
+    refreshed = refresh_full_populations(populations, args.city_data, args.dry_run, merged)
+
+    print(f"Wrote {total} cities across {len(by_state)} states to {args.basic}"
+          + (" [dry run]" if args.dry_run else ""))
+    print(f"  Ids kept stable via alias map: {aliased}")
+    print(f"  Existing rows not in census ({'dropped' if args.drop_missing else 'kept'}): {missing}")
+    print(f"  Module size: {len(module.encode('utf-8')) / 1024:.0f} KB")
+    print(f"  city-data.ts populations refreshed: {refreshed}")
+    if refreshed and not args.dry_run and not args.no_validate and check(args.city_data, baseline=baseline):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
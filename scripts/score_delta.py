@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Emit the cities whose market-score inputs changed since the last sync.
+
+getAllCities() scores a city from its rental numbers, listings per thousand,
+population, state and its curated STR regulation entry, using
+src/lib/scoring.ts. This script hashes exactly those inputs per city and
+compares them with the manifest from the previous run:
+
+    python3 scripts/score_delta.py                  # writes the delta + a pending manifest
+    npx tsx scripts/sync-scores.ts --delta /tmp/score-delta.ndjson
+    python3 scripts/score_delta.py --commit         # sync succeeded: advance the manifest
+
+Delta lines (NDJSON):
+  {"op": "upsert", "id", "state", "hash", "changed": [...], "fields": {...}}
+  {"op": "delete", "id", "state"}
+
+`changed` lists the dotted input paths that differ ("new" for cities not in
+the manifest, "scoring" when scoring.ts itself changed, which marks every
+city). The manifest is only advanced by --commit, so a failed sync is
+retried with the same delta on the next run.
+
+--apply-sqlite DB applies a delta to a local SQLite stand-in of the
+`cities` table, for testing the round trip without Supabase.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from city_data import (
+    CITY_DATA_TS, STR_REGULATIONS_TS, content_hash, iter_cities, load_regulations, read_bytes,
+)
+
+MANIFEST = 'scripts/manifests/score-inputs.json'
+MANIFEST_VERSION = 1
+DEFAULT_DELTA = '/tmp/score-delta.ndjson'
+SCORING_TS = 'src/lib/scoring.ts'
+
+# Inputs of calculateCityScore() + the columns sync-scores pushes alongside the score
+SCORE_FIELDS = (
+    'name', 'county', 'population',
+    'rental.avgADR', 'rental.occupancyRate', 'rental.monthlyRevenue', 'rental.medianHomePrice',
+    'saturationRisk.listingsPerThousand',
+)
+
+
+def _path_get(obj, path):
+    for key in path.split('.'):
+        obj = obj.get(key) if isinstance(obj, dict) else None
+    return obj
+
+
+def current_inputs(city_path=CITY_DATA_TS, regulations_path=STR_REGULATIONS_TS):
+    """Return {id: {'state', 'fields', 'hash'}} in file order, first entry per id."""
+    regulations = load_regulations(regulations_path)
+    cities = {}
+    for state, city in iter_cities(city_path):
+        if city['id'] in cities:
+            continue
+        fields = {path: _path_get(city, path) for path in SCORE_FIELDS}
+        fields['regulation'] = regulations.get(city['id'])
+        cities[city['id']] = {
+            'state': state,
+            'fields': fields,
+            'hash': content_hash({'state': state, 'fields': fields}),
+        }
+    return cities
+
+
+def load_manifest(path=MANIFEST):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def write_manifest(path, scoring_hash, cities):
+    """One city per line so the manifest diffs cleanly."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    lines = [json.dumps(city_id) + ': ' + json.dumps(cities[city_id], sort_keys=True, separators=(',', ':'))
+             for city_id in sorted(cities)]
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(f'{{"version": {MANIFEST_VERSION}, "scoringHash": "{scoring_hash}", "cities": {{\n')
+        f.write(',\n'.join(lines))
+        f.write('\n}}\n')
+    os.replace(tmp, path)
+
+
+def compute_delta(previous, cities, scoring_changed):
+    """Yield delta records comparing `cities` with the previous manifest's cities."""
+    previous = previous or {}
+    for city_id, cur in cities.items():
+        old = previous.get(city_id)
+        if old is None:
+            changed = ['new']
+        elif scoring_changed:
+            changed = ['scoring']
+        elif old['hash'] == cur['hash']:
+            continue
+        else:
+            changed = [k for k in cur['fields'] if cur['fields'][k] != old['fields'].get(k)]
+            if old['state'] != cur['state']:
+                changed.insert(0, 'state')
+        yield {'op': 'upsert', 'id': city_id, 'state': cur['state'], 'hash': cur['hash'],
+               'changed': changed, 'fields': cur['fields']}
+    for city_id in sorted(previous.keys() - cities.keys()):
+        yield {'op': 'delete', 'id': city_id, 'state': previous[city_id]['state']}
+
+
+def apply_sqlite(db_path, delta_path):
+    """Apply a delta file to a SQLite `cities` table. Returns (upserted, deleted)."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""CREATE TABLE IF NOT EXISTS cities (
+            id TEXT PRIMARY KEY, state TEXT NOT NULL, name TEXT NOT NULL, county TEXT,
+            population INTEGER, avg_adr REAL, occupancy REAL, str_monthly_revenue REAL,
+            median_home_value REAL, listings_per_thousand REAL, regulation TEXT,
+            content_hash TEXT)""")
+        upserts, deletes = [], []
+        with open(delta_path) as f:
+            for line in f:
+                rec = json.loads(line)
+                if rec['op'] == 'delete':
+                    deletes.append((rec['id'],))
+                    continue
+                fl = rec['fields']
+                reg = fl.get('regulation')
+                upserts.append((
+                    rec['id'], rec['state'], fl['name'], fl['county'], fl['population'],
+                    fl['rental.avgADR'], fl['rental.occupancyRate'], fl['rental.monthlyRevenue'],
+                    fl['rental.medianHomePrice'], fl['saturationRisk.listingsPerThousand'],
+                    reg['legality_status'] if reg else 'legal', rec['hash'],
+                ))
+        conn.executemany("""INSERT INTO cities VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+            ON CONFLICT(id) DO UPDATE SET state=excluded.state, name=excluded.name,
+            county=excluded.county, population=excluded.population, avg_adr=excluded.avg_adr,
+            occupancy=excluded.occupancy, str_monthly_revenue=excluded.str_monthly_revenue,
+            median_home_value=excluded.median_home_value,
+            listings_per_thousand=excluded.listings_per_thousand,
+            regulation=excluded.regulation, content_hash=excluded.content_hash""", upserts)
+        conn.executemany("DELETE FROM cities WHERE id = ?", deletes)
+    conn.close()
+    return len(upserts), len(deletes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Emit an NDJSON delta of cities whose score inputs changed.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--regulations', default=STR_REGULATIONS_TS)
+    parser.add_argument('--scoring', default=SCORING_TS, help='Scoring module; a change re-syncs every city')
+    parser.add_argument('--manifest', default=MANIFEST)
+    parser.add_argument('--output', default=DEFAULT_DELTA, help=f'Delta file (default {DEFAULT_DELTA})')
+    parser.add_argument('--commit', action='store_true',
+                        help='Promote the pending manifest after a successful sync')
+    parser.add_argument('--apply-sqlite', metavar='DB', help='Apply --output to a SQLite stand-in and exit')
+    args = parser.parse_args(argv)
+    pending = args.manifest + '.pending'
+
+    if args.commit:
+        if not os.path.exists(pending):
+            print(f"No pending manifest at {pending}")
+            return 1
+        os.replace(pending, args.manifest)
+        print(f"Manifest advanced: {args.manifest}")
+        return 0
+    if args.apply_sqlite:
+        upserted, deleted = apply_sqlite(args.apply_sqlite, args.output)
+        print(f"{args.apply_sqlite}: {upserted} upserted, {deleted} deleted")
+        return 0
+
+    manifest = load_manifest(args.manifest)
+    scoring_hash = content_hash(read_bytes(args.scoring))
+    cities = current_inputs(args.city_data, args.regulations)
+    scoring_changed = manifest is not None and manifest.get('scoringHash') != scoring_hash
+
+    counts = {'upsert': 0, 'delete': 0}
+    with open(args.output, 'w') as f:
+        for rec in compute_delta(manifest and manifest['cities'], cities, scoring_changed):
+            f.write(json.dumps(rec, separators=(',', ':'), ensure_ascii=False) + '\n')
+            counts[rec['op']] += 1
+    write_manifest(pending, scoring_hash, cities)
+
+    print(f"{len(cities)} cities, manifest: {'none (full sync)' if manifest is None else args.manifest}"
+          + (" [scoring.ts changed - every city included]" if scoring_changed else ""))
+    print(f"Delta: {counts['upsert']} upserts, {counts['delete']} deletes -> {args.output}")
+    print(f"Pending manifest: {pending} (run with --commit after the sync succeeds)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,12 @@
+import { readFileSync } from 'fs';
 import { getAllCities } from '../src/data/helpers';
 import { createClient } from '@supabase/supabase-js';
 
+// Optional: --delta <file> pushes only the cities listed in a delta from
+// scripts/score_delta.py (bulk upserts instead of a SELECT + UPDATE per row).
+const deltaArg = process.argv.indexOf('--delta');
+const deltaPath = deltaArg >= 0 ? process.argv[deltaArg + 1] : null;
+
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
 
@@ -11,8 +17,76 @@ if (!supabaseUrl || !supabaseKey) {
   process.exit(1);
 }
 
+interface DeltaRecord {
+  op: 'upsert' | 'delete';
+  id: string;
+  state: string;
+  changed?: string[];
+}
+
+function readDelta(path: string): DeltaRecord[] {
+  return readFileSync(path, 'utf8')
+    .split('\n')
+    .filter(line => line.trim())
+    .map(line => JSON.parse(line) as DeltaRecord);
+}
+
+async function syncDelta(supabase: ReturnType<typeof createClient>, path: string) {
+  const records = readDelta(path);
+  const upsertIds = new Set(records.filter(r => r.op === 'upsert').map(r => r.id));
+  const deletes = records.filter(r => r.op === 'delete');
+  // First entry per id wins, as in migrate-cities-to-supabase.ts; one upsert batch can't touch a row twice
+  const seenIds = new Set<string>();
+  const cities = getAllCities().filter(c => upsertIds.has(c.id) && !seenIds.has(c.id) && seenIds.add(c.id));
+
+  console.log(`Delta: ${upsertIds.size} changed cities, ${deletes.length} removed (${path})`);
+
+  const rows = cities.map(city => ({
+    id: city.id,
+    name: city.name,
+    state: city.stateCode,
+    county: city.county || null,
+    population: city.population,
+    has_full_data: true,
+    market_score: city.marketScore,
+    cash_on_cash: city.cashOnCash,
+    avg_adr: city.avgADR,
+    occupancy: city.occupancy,
+    str_monthly_revenue: city.strMonthlyRevenue,
+    median_home_value: city.medianHomeValue,
+    regulation: city.regulation,
+    full_data: city as unknown as object,
+  }));
+
+  // Upsert in batches of 500
+  const BATCH_SIZE = 500;
+  let updated = 0;
+  for (let i = 0; i < rows.length; i += BATCH_SIZE) {
+    const batch = rows.slice(i, i + BATCH_SIZE);
+    const { error } = await supabase.from('cities').upsert(batch, { onConflict: 'id' });
+    if (error) {
+      console.error(`Error upserting batch ${i / BATCH_SIZE + 1}: ${error.message}`);
+      process.exit(1);
+    }
+    updated += batch.length;
+  }
+
+  // Removed full cities keep their Tier 2 row; migrate-cities-to-supabase.ts owns deletions
+  for (const r of deletes.slice(0, 20)) {
+    console.log(`  Not in city-data.ts any more (left as is): ${r.id}`);
+  }
+
+  console.log('\n=== DELTA SYNC COMPLETE ===');
+  console.log(`Upserted: ${updated}`);
+  console.log('Run `python3 scripts/score_delta.py --commit` to advance the manifest.');
+}
+
 async function main() {
   const supabase = createClient(supabaseUrl, supabaseKey);
+  if (deltaPath) {
+    await syncDelta(supabase, deltaPath);
+    return;
+  }
   const cities = getAllCities();
 
   console.log('Total cities to sync:', cities.length);
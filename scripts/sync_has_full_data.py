@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Sync the hasFullData flag in basic-city-data.ts with the ids in city-data.ts.
+
+- Builds one id set from city-data.ts
+- Makes one streaming pass over basic-city-data.ts, flipping hasFullData on
+  the rows whose value is wrong (true -> false as well as false -> true)
+- Only the lines that changed are rewritten; every other byte is untouched
+- Reports orphans: full cities with no Tier 2 row, split into ids with no
+  match at all and ids that only differ by normalization (ak-juneau vs
+  ak-juneau-city-and, st- vs saint-)
+
+Usage: python3 scripts/sync_has_full_data.py [--dry-run] [--city-data PATH] [--basic PATH]
+"""
+
+import argparse
+import re
+import sys
+
+from city_data import CITY_DATA_TS, BASIC_CITY_TS, iter_array_entries, normalize_id, read_bytes
+
+_ENTRY_ID_RE = re.compile(rb"""["']?id["']?\s*:\s*['"]([^'"]+)['"]""")
+_ROW_RE = re.compile(r"""\bid: ["']([^"']+)["'].*\bhasFullData: (true|false)""")
+
+
+def load_full_ids(path=CITY_DATA_TS):
+    data = read_bytes(path)
+    ids = set()
+    for _, s, e in iter_array_entries(data, 'cityData'):
+        m = _ENTRY_ID_RE.search(data, s, e)
+        if m:
+            ids.add(m.group(1).decode('utf-8'))
+    return ids
+
+
+def sync(full_ids, basic_path=BASIC_CITY_TS, dry_run=False):
+    """Flip hasFullData in one pass. Returns (flipped, basic_ids)."""
+    with open(basic_path, encoding='utf-8') as f:
+        lines = f.readlines()
+
+    flipped = []
+    basic_ids = set()
+    for i, line in enumerate(lines):
+        m = _ROW_RE.search(line)
+        if not m:
+            continue
+        city_id, flag = m.group(1), m.group(2)
+        basic_ids.add(city_id)
+        want = 'true' if city_id in full_ids else 'false'
+        if flag != want:
+            lines[i] = line[:m.start(2)] + want + line[m.end(2):]
+            flipped.append((city_id, flag, want))
+
+    if flipped and not dry_run:
+        with open(basic_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+    return flipped, basic_ids
+
+
+def find_orphans(full_ids, basic_ids):
+    """Return (missing, near) for full ids that have no exact Tier 2 row.
+
+    `near` holds (full_id, basic_id) pairs that match after normalize_id().
+    """
+    by_norm = {}
+    for bid in basic_ids:
+        by_norm.setdefault(normalize_id(bid), []).append(bid)
+
+    missing, near = [], []
+    for fid in sorted(full_ids - basic_ids):
+        matches = by_norm.get(normalize_id(fid))
+        if matches:
+            near.extend((fid, bid) for bid in sorted(matches))
+        else:
+            missing.append(fid)
+    return missing, near
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sync hasFullData in basic-city-data.ts with city-data.ts.')
+    parser.add_argument('--city-data', default=CITY_DATA_TS)
+    parser.add_argument('--basic', default=BASIC_CITY_TS)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+    dry_run = args.dry_run
+
+    full_ids = load_full_ids(args.city_data)
+    flipped, basic_ids = sync(full_ids, args.basic, dry_run=dry_run)
+    missing, near = find_orphans(full_ids, basic_ids)
+
+    print(f"Full cities: {len(full_ids)}, Tier 2 rows: {len(basic_ids)}")
+    to_true = sum(1 for _, _, want in flipped if want == 'true')
+    print(f"hasFullData flips: {len(flipped)} ({to_true} -> true, {len(flipped) - to_true} -> false)"
+          + (" [dry run, nothing written]" if dry_run else ""))
+    for city_id, old, new in flipped[:20]:
+        print(f"  {city_id}: {old} -> {new}")
+    if len(flipped) > 20:
+        print(f"  ... and {len(flipped) - 20} more")
+
+    print(f"\nFull cities with no Tier 2 row: {len(missing) + len(near)}")
+    print(f"  Differ only by normalization: {len(near)}")
+    for fid, bid in near:
+        print(f"    {fid}  ~  {bid}")
+    print(f"  No match at all: {len(missing)}")
+    for fid in missing[:30]:
+        print(f"    {fid}")
+    if len(missing) > 30:
+        print(f"    ... and {len(missing) - 30} more")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Smoke test for data_daemon.py: serve the real data files on a temporary
+socket and check that `reload` returns, malformed requests get an error reply
+and the daemon still answers after both.
+
+    python3 scripts/test_data_daemon.py      (or: python3 -m pytest scripts/test_data_daemon.py)
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from city_data import BASIC_CITY_TS, CITY_DATA_TS, STATE_DATA_TS  # noqa: E402
+from data_daemon import DataIndex, DataServer, query  # noqa: E402
+
+ROOT = os.path.dirname(HERE)
+
+
+class DaemonSmokeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.socket = os.path.join(cls.tmp, 'edge-data.sock')
+        index = DataIndex(*(os.path.join(ROOT, p) for p in (CITY_DATA_TS, BASIC_CITY_TS, STATE_DATA_TS)))
+        cls.server = DataServer(cls.socket, index)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        if os.path.exists(cls.socket):
+            os.unlink(cls.socket)
+        os.rmdir(cls.tmp)
+
+    def test_reload_then_ping(self):
+        reloaded = query({'op': 'reload'}, self.socket, timeout=30)
+        self.assertEqual(sorted(reloaded), ['basic', 'cities', 'states'])
+        self.assertEqual(query({'op': 'ping'}, self.socket, timeout=5), 'pong')
+
+    def test_malformed_request_gets_an_error_reply(self):
+        for body in ([1, 2], 'ping', {'op': 'nope'}):
+            with self.assertRaises(RuntimeError):
+                query(body, self.socket, timeout=5)
+        self.assertEqual(query({'op': 'ping'}, self.socket, timeout=5), 'pong')
+
+    def test_query_reports_a_closed_connection(self):
+        path = os.path.join(self.tmp, 'closing.sock')
+
+        def read_then_close():
+            conn = listener.accept()[0]
+            conn.recv(65536)
+            conn.close()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(path)
+            try:
+                listener.listen(1)
+                closer = threading.Thread(target=read_then_close)
+                closer.start()
+                with self.assertRaisesRegex(RuntimeError, 'without a reply'):
+                    query({'op': 'ping'}, path, timeout=5)
+                closer.join()
+            finally:
+                os.unlink(path)
+
+    def test_filter_sorts_missing_values_last(self):
+        index = self.server.index
+        cities = [{'id': 'a', 'score': 2}, {'id': 'b'}, {'id': 'c', 'score': 5}, {'id': 'd', 'score': 1}]
+        with index.lock:
+            saved, index.cities = index.cities, [('XX', c) for c in cities]
+            try:
+                ascending = index.op_filter({'sort': 'score', 'fields': ['id']})['rows']
+                descending = index.op_filter({'sort': 'score', 'desc': True, 'fields': ['id']})['rows']
+            finally:
+                index.cities = saved
+        self.assertEqual([r['id'] for r in ascending], ['d', 'a', 'c', 'b'])
+        self.assertEqual([r['id'] for r in descending], ['c', 'a', 'd', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Validate every entry in city-data.ts against the CityData interface.
+
+One streaming pass over the file: each entry is located by byte offset,
+parsed on its own and checked for
+- required keys (and keys the interface does not declare)
+- value types and enums (type, verdict, rprRating, riskLevel, marketType,
+  strStatus, bestPerformer, amenity priority)
+- numeric ranges (scores 0-100, occupancy 0-100, prices > 0, ...)
+- cross-field invariants: rpr == investmentMetrics.rpr, dsi ==
+  investmentMetrics.dsi == dsiDetails.survives, netMonthlyIncome ==
+  revenue - mortgage - expenses, monthlyRevenue ~ ADR x occupancy x 30
+- duplicate ids
+
+Every violation is reported with its byte offset and line, so a bad entry
+is found before the Next.js build trips over it. The full dataset takes
+well under a second. The mutating scripts take a snapshot() before writing,
+call check() on their way out and exit non-zero only on violations the write
+introduced; --no-validate skips both.
+
+Also accepts a generated entries file (/tmp/new_city_entries.txt), where
+every line starting with `{` is one entry.
+
+Usage: python3 scripts/validate_city_data.py [path ...] [--limit 50]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from city_data import CITY_DATA_TS, iter_array_entries, read_bytes, ts_to_json
+
+# Relative tolerance for monthlyRevenue vs avgADR * occupancyRate/100 * 30
+REVENUE_TOLERANCE = 0.05
+# Absolute tolerance ($) for netMonthlyIncome vs revenue - mortgage - expenses
+NET_INCOME_TOLERANCE = 2
+# Absolute tolerance for rpr vs monthlyRevenue * 12 / medianHomePrice
+RPR_TOLERANCE = 0.01
+
+SCORE = ('num', 0, 100)
+NON_NEGATIVE = ('num', 0, None)
+POSITIVE = 'positive'
+
+SCHEMA = {
+    'id': 'str',
+    'name': 'str',
+    'county': 'str',
+    'type': {'city', 'county'},
+    'population': NON_NEGATIVE,
+    'rpr': ('num', 0, 1),
+    'dsi': 'bool',
+    'marketScore': {
+        'overall': SCORE,
+        'demand': SCORE,
+        'affordability': SCORE,
+        'regulation': SCORE,
+        'seasonality': SCORE,
+        'saturation': SCORE,
+        'rpr': SCORE,
+        'verdict': {'strong-buy', 'buy', 'hold', 'caution', 'avoid'},
+    },
+    'investmentMetrics': {
+        'rpr': ('num', 0, 1),
+        'rprRating': {'elite', 'good', 'marginal', 'poor'},
+        'dsi': 'bool',
+        'dsiDetails': {
+            'monthlyMortgage': NON_NEGATIVE,
+            'monthlyExpenses': NON_NEGATIVE,
+            'netMonthlyIncome': ('num', None, None),
+            'survives': 'bool',
+        },
+    },
+    'saturationRisk': {
+        'strToHousingRatio': ('num', 0, 100),
+        'listingsPerThousand': NON_NEGATIVE,
+        'yoySupplyGrowth': ('num', None, None),
+        'riskLevel': {'low', 'moderate', 'high', 'very-high'},
+    },
+    'rental': {
+        'avgADR': POSITIVE,
+        'occupancyRate': ('num', 0, 100),
+        'monthlyRevenue': NON_NEGATIVE,
+        'medianHomePrice': POSITIVE,
+        'revenue75thPercentile': NON_NEGATIVE,
+        'revenue90thPercentile': NON_NEGATIVE,
+        'mtrMonthlyIncome': NON_NEGATIVE,
+    },
+    'incomeBySize': {
+        'oneBR': NON_NEGATIVE,
+        'twoBR': NON_NEGATIVE,
+        'threeBR': NON_NEGATIVE,
+        'fourBR': NON_NEGATIVE,
+        'fiveBR': NON_NEGATIVE,
+        'sixPlusBR': NON_NEGATIVE,
+        'bestPerformer': {'1BR', '2BR', '3BR', '4BR', '5BR', '6BR+'},
+    },
+    'amenityDelta': {
+        'topAmenities': ('list', {
+            'name': 'str',
+            'revenueBoost': ('num', 0, 100),
+            'priority': {'must-have', 'high-impact', 'nice-to-have'},
+        }),
+        'marketType': {'mountain', 'beach', 'urban', 'lake', 'desert', 'rural',
+                       'suburban', 'waterfront', 'tropical'},
+    },
+    'strStatus': {'legal', 'restricted', 'varies', 'banned'},
+    'permitRequired': 'bool',
+    'highlights': ('list', 'str'),
+}
+
+
+class Violation:
+    __slots__ = ('source', 'offset', 'line', 'city_id', 'path', 'message')
+
+    def __init__(self, source, offset, line, city_id, path, message):
+        self.source = source
+        self.offset = offset
+        self.line = line
+        self.city_id = city_id
+        self.path = path
+        self.message = message
+
+    def __str__(self):
+        where = f"{self.source}:{self.line} (byte {self.offset})"
+        return f"{where} {self.city_id or '?'}: {self.path or '<entry>'}: {self.message}"
+
+
+def _is_num(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _check_value(value, spec, path, out):
+    if spec == 'str':
+        if not isinstance(value, str) or not value:
+            out.append((path, f"expected non-empty string, got {value!r}"))
+    elif spec == 'positive':
+        if not _is_num(value) or value <= 0:
+            out.append((path, f"expected positive number, got {value!r}"))
+    elif spec == 'bool':
+        if not isinstance(value, bool):
+            out.append((path, f"expected boolean, got {value!r}"))
+    elif isinstance(spec, set):
+        if value not in spec:
+            out.append((path, f"{value!r} is not one of {', '.join(sorted(spec))}"))
+    elif isinstance(spec, dict):
+        if not isinstance(value, dict):
+            out.append((path, f"expected object, got {type(value).__name__}"))
+        else:
+            _check_object(value, spec, path, out)
+    elif spec[0] == 'num':
+        _, lo, hi = spec
+        if not _is_num(value):
+            out.append((path, f"expected number, got {value!r}"))
+        elif (lo is not None and value < lo) or (hi is not None and value > hi):
+            out.append((path, f"{value} out of range [{'' if lo is None else lo}, {'' if hi is None else hi}]"))
+    elif spec[0] == 'list':
+        if not isinstance(value, list):
+            out.append((path, f"expected array, got {type(value).__name__}"))
+        else:
+            for i, item in enumerate(value):
+                _check_value(item, spec[1], f"{path}[{i}]", out)
+
+
+def _check_object(obj, schema, prefix, out):
+    for key, spec in schema.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if key not in obj:
+            out.append((path, "missing required key"))
+        else:
+            _check_value(obj[key], spec, path, out)
+    for key in obj.keys() - schema.keys():
+        out.append((f"{prefix}.{key}" if prefix else key, "unknown key"))
+
+
+def _get(obj, *keys):
+    for key in keys:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def check_invariants(city, out):
+    """Cross-field checks; skipped silently where the fields are missing or mistyped."""
+    rpr, im_rpr = city.get('rpr'), _get(city, 'investmentMetrics', 'rpr')
+    if _is_num(rpr) and _is_num(im_rpr) and rpr != im_rpr:
+        out.append(('investmentMetrics.rpr', f"{im_rpr} != top-level rpr {rpr}"))
+
+    dsi, im_dsi = city.get('dsi'), _get(city, 'investmentMetrics', 'dsi')
+    if isinstance(dsi, bool) and isinstance(im_dsi, bool) and dsi != im_dsi:
+        out.append(('investmentMetrics.dsi', f"{im_dsi} != top-level dsi {dsi}"))
+
+    details = _get(city, 'investmentMetrics', 'dsiDetails') or {}
+    survives = details.get('survives')
+    if isinstance(dsi, bool) and isinstance(survives, bool) and survives != dsi:
+        out.append(('investmentMetrics.dsiDetails.survives', f"{survives} != dsi {dsi}"))
+
+    rental = city.get('rental') if isinstance(city.get('rental'), dict) else {}
+    adr, occ, revenue = rental.get('avgADR'), rental.get('occupancyRate'), rental.get('monthlyRevenue')
+    if _is_num(adr) and _is_num(occ) and _is_num(revenue):
+        expected = adr * occ / 100 * 30
+        if expected > 0 and abs(revenue - expected) > expected * REVENUE_TOLERANCE:
+            out.append(('rental.monthlyRevenue',
+                        f"{revenue} is not ~ avgADR x occupancy x 30 = {expected:.0f}"))
+
+    price = rental.get('medianHomePrice')
+    if _is_num(rpr) and _is_num(revenue) and _is_num(price) and price > 0:
+        expected = revenue * 12 / price
+        if abs(rpr - expected) > RPR_TOLERANCE:
+            out.append(('rpr', f"{rpr} is not ~ monthlyRevenue x 12 / medianHomePrice = {expected:.3f}"))
+
+    mortgage, expenses, net = (details.get('monthlyMortgage'), details.get('monthlyExpenses'),
+                               details.get('netMonthlyIncome'))
+    if all(_is_num(v) for v in (revenue, mortgage, expenses, net)):
+        expected = revenue - mortgage - expenses
+        if abs(net - expected) > NET_INCOME_TOLERANCE:
+            out.append(('investmentMetrics.dsiDetails.netMonthlyIncome',
+                        f"{net} != monthlyRevenue - mortgage - expenses = {expected}"))
+
+    p75, p90 = rental.get('revenue75thPercentile'), rental.get('revenue90thPercentile')
+    if _is_num(p75) and _is_num(p90) and p90 < p75:
+        out.append(('rental.revenue90thPercentile', f"{p90} < revenue75thPercentile {p75}"))
+
+
+def validate_entry(city):
+    """Return [(path, message)] for one parsed entry."""
+    out = []
+    if not isinstance(city, dict):
+        return [('', f"expected object, got {type(city).__name__}")]
+    _check_object(city, SCHEMA, '', out)
+    check_invariants(city, out)
+    return out
+
+
+_ID_RE = re.compile(rb"""["']?id["']?\s*:\s*['"]([^'"]+)['"]""")
+
+
+def _field_offset(data, start, end, path):
+    """Best-effort byte offset of `path` (e.g. rental.avgADR) inside an entry."""
+    pos = start
+    for key in re.sub(r'\[\d+\]', '', path).split('.'):
+        if not key:
+            continue
+        m = re.compile(rb"""[{,]\s*["']?""" + re.escape(key.encode()) + rb"""["']?\s*:""").search(data, pos, end)
+        if not m:
+            break
+        pos = m.start() + 1
+    return pos
+
+
+def iter_fragment_entries(data):
+    """Yield (start, end) for each one-line entry in a generated entries file."""
+    pos = 0
+    for line in data.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith(b'{'):
+            start = pos + line.index(b'{')
+            end = pos + len(line.rstrip().rstrip(b','))
+            yield start, end
+        pos += len(line)
+
+
+def validate_bytes(data, source='<bytes>', export='cityData'):
+    """Validate every entry in `data`. Returns a list of Violation, in file order.
+
+    If `data` has no `export const cityData`, it is treated as a generated
+    entries file.
+    """
+    if f'export const {export}'.encode() in data:
+        spans = ((s, e) for _, s, e in iter_array_entries(data, export))
+    else:
+        spans = iter_fragment_entries(data)
+
+    violations = []
+    seen = {}
+
+    def add(start, end, city_id, path, message):
+        offset = _field_offset(data, start, end, path) if path else start
+        line = data.count(b'\n', 0, offset) + 1
+        violations.append(Violation(source, offset, line, city_id, path, message))
+
+    for start, end in spans:
+        m = _ID_RE.search(data, start, end)
+        city_id = m.group(1).decode('utf-8') if m else None
+        try:
+            city = json.loads(ts_to_json(data[start:end]))
+        except ValueError as e:
+            add(start, end, city_id, '', f"unparseable entry ({e})")
+            continue
+        for path, message in validate_entry(city):
+            add(start, end, city_id, path, message)
+        if city_id is not None:
+            if city_id in seen:
+                add(start, end, city_id, 'id', f"duplicate id (first at byte {seen[city_id]})")
+            else:
+                seen[city_id] = start
+    return violations
+
+
+def validate_file(path=CITY_DATA_TS):
+    return validate_bytes(read_bytes(path), path)
+
+
+def _keys(violations):
+    # Offsets and values shift with every write; the entry and field identify a violation
+    return Counter((v.city_id, v.path) for v in violations)
+
+
+def snapshot(path=CITY_DATA_TS):
+    """Violations already in `path` (none if it doesn't exist yet), for check(baseline=...)."""
+    return _keys(validate_file(path)) if os.path.exists(path) else Counter()
+
+
+def check(path=CITY_DATA_TS, limit=10, baseline=None):
+    """Validate `path` and print a short report.
+
+    Called at the end of every script that writes city entries. Returns the
+    number of violations not in `baseline` (a snapshot() taken before the
+    write), or all of them without one; a positive count makes that script
+    exit non-zero.
+    """
+    violations = validate_file(path)
+    if not violations:
+        print(f"Validation: {path} OK")
+        return 0
+    new = violations
+    if baseline is not None:
+        known = Counter(baseline)
+        new = []
+        for v in violations:
+            key = (v.city_id, v.path)
+            if known[key]:
+                known[key] -= 1
+            else:
+                new.append(v)
+    print(f"Validation: {len(violations)} violation(s) in {path}"
+          + (f", {len(new)} new" if baseline is not None else ""))
+    for v in new[:limit]:
+        print(f"  {v}")
+    if len(new) > limit:
+        print(f"  ... and {len(new) - limit} more (python3 scripts/validate_city_data.py {path})")
+    return len(new)
+
+
+def add_no_validate(parser):
+    """Add --no-validate to a script that calls check() after writing."""
+    parser.add_argument('--no-validate', action='store_true',
+                        help='Skip the closing validation (exit 0 even on new violations)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate city entries against the CityData interface.')
+    parser.add_argument('paths', nargs='*', default=[CITY_DATA_TS],
+                        help=f'city-data.ts or a generated entries file (default {CITY_DATA_TS})')
+    parser.add_argument('--limit', type=int, default=50, help='Max violations to print per file')
+    args = parser.parse_args(argv)
+
+    total = 0
+    for path in args.paths:
+        start = time.time()
+        violations = validate_file(path)
+        elapsed = time.time() - start
+        print(f"{path}: {len(violations)} violation(s) ({elapsed:.2f}s)")
+        for v in violations[:args.limit]:
+            print(f"  {v}")
+        if len(violations) > args.limit:
+            print(f"  ... and {len(violations) - args.limit} more")
+        total += len(violations)
+    return 1 if total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
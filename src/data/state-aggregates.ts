@@ -0,0 +1,69 @@
+// Generated by scripts/build_state_aggregates.py from city-data.ts - do not edit by hand.
+// Population-weighted medians and distributions over each state's full-data markets.
+// `hash` covers the state's member entries; only states whose cities changed are rewritten.
+
+export interface StateAggregate {
+  hash: string;
+  cityCount: number;
+  population: number;
+  medianADR: number;
+  medianOccupancy: number;
+  medianMonthlyRevenue: number;
+  medianRPR: number;
+  verdicts: Record<'strong-buy' | 'buy' | 'hold' | 'caution' | 'avoid', number>;
+  marketTypes: Record<string, number>;
+}
+
+export const stateAggregates: Record<string, StateAggregate> = {
+  AK: { hash: '05ef51766fa8d0d5', cityCount: 21, population: 419040, medianADR: 175, medianOccupancy: 55, medianMonthlyRevenue: 2888, medianRPR: 0.087, verdicts: { 'strong-buy': 0, buy: 8, hold: 7, caution: 2, avoid: 4 }, marketTypes: { lake: 1, mountain: 4, rural: 11, suburban: 1, urban: 1, waterfront: 3 } },
+  AL: { hash: '710dea84fef35c2f', cityCount: 20, population: 1296606, medianADR: 145, medianOccupancy: 58, medianMonthlyRevenue: 2523, medianRPR: 0.108, verdicts: { 'strong-buy': 0, buy: 3, hold: 7, caution: 6, avoid: 4 }, marketTypes: { beach: 3, lake: 2, mountain: 1, rural: 2, suburban: 1, urban: 8, waterfront: 3 } },
+  AR: { hash: '9740b8595d6ebf8f', cityCount: 20, population: 635951, medianADR: 145, medianOccupancy: 61, medianMonthlyRevenue: 2393, medianRPR: 0.132, verdicts: { 'strong-buy': 2, buy: 3, hold: 4, caution: 5, avoid: 6 }, marketTypes: { lake: 10, mountain: 1, rural: 6, urban: 3 } },
+  AZ: { hash: '56f816b22b2d2afe', cityCount: 42, population: 5144266, medianADR: 195, medianOccupancy: 65, medianMonthlyRevenue: 3929, medianRPR: 0.108, verdicts: { 'strong-buy': 0, buy: 13, hold: 9, caution: 5, avoid: 15 }, marketTypes: { desert: 11, lake: 5, mountain: 9, rural: 10, urban: 7 } },
+  CA: { hash: 'b40561c0de349788', cityCount: 152, population: 20977284, medianADR: 225, medianOccupancy: 71, medianMonthlyRevenue: 4752, medianRPR: 0.063, verdicts: { 'strong-buy': 0, buy: 0, hold: 32, caution: 55, avoid: 65 }, marketTypes: { beach: 15, desert: 8, lake: 5, mountain: 13, rural: 10, urban: 98, waterfront: 3 } },
+  CO: { hash: '0095a4ef7545ad43', cityCount: 52, population: 3120151, medianADR: 185, medianOccupancy: 65, medianMonthlyRevenue: 3608, medianRPR: 0.083, verdicts: { 'strong-buy': 0, buy: 1, hold: 19, caution: 11, avoid: 21 }, marketTypes: { desert: 1, lake: 2, mountain: 30, rural: 6, urban: 13 } },
+  CT: { hash: '7104a88a31572e6e', cityCount: 18, population: 824945, medianADR: 206, medianOccupancy: 64, medianMonthlyRevenue: 3770, medianRPR: 0.105, verdicts: { 'strong-buy': 0, buy: 1, hold: 4, caution: 4, avoid: 9 }, marketTypes: { beach: 1, rural: 4, urban: 6, waterfront: 7 } },
+  DC: { hash: '067f782619f8e385', cityCount: 2, population: 694545, medianADR: 213, medianOccupancy: 66, medianMonthlyRevenue: 4217, medianRPR: 0.089, verdicts: { 'strong-buy': 0, buy: 0, hold: 0, caution: 1, avoid: 1 }, marketTypes: { rural: 1, urban: 1 } },
+  DE: { hash: '73629dc855d80974', cityCount: 10, population: 39588, medianADR: 278, medianOccupancy: 45, medianMonthlyRevenue: 3500, medianRPR: 0.092, verdicts: { 'strong-buy': 0, buy: 0, hold: 6, caution: 3, avoid: 1 }, marketTypes: { beach: 6, rural: 2, suburban: 2 } },
+  FL: { hash: '266134c489b4a092', cityCount: 98, population: 5512226, medianADR: 193, medianOccupancy: 68, medianMonthlyRevenue: 3964, medianRPR: 0.125, verdicts: { 'strong-buy': 0, buy: 20, hold: 37, caution: 24, avoid: 17 }, marketTypes: { beach: 33, lake: 5, rural: 14, suburban: 5, urban: 27, waterfront: 14 } },
+  GA: { hash: '8e85ab941fba9882', cityCount: 37, population: 2495649, medianADR: 165, medianOccupancy: 65, medianMonthlyRevenue: 3366, medianRPR: 0.107, verdicts: { 'strong-buy': 0, buy: 9, hold: 8, caution: 10, avoid: 10 }, marketTypes: { beach: 4, lake: 2, mountain: 11, rural: 7, urban: 12, waterfront: 1 } },
+  HI: { hash: 'add6dd37f072835d', cityCount: 15, population: 841494, medianADR: 245, medianOccupancy: 75, medianMonthlyRevenue: 5733, medianRPR: 0.091, verdicts: { 'strong-buy': 0, buy: 0, hold: 2, caution: 4, avoid: 9 }, marketTypes: { beach: 10, rural: 2, tropical: 2, urban: 1 } },
+  IA: { hash: 'f895e318eb9387d1', cityCount: 14, population: 767476, medianADR: 128, medianOccupancy: 65, medianMonthlyRevenue: 2886, medianRPR: 0.135, verdicts: { 'strong-buy': 0, buy: 5, hold: 3, caution: 4, avoid: 2 }, marketTypes: { lake: 4, rural: 4, urban: 6 } },
+  ID: { hash: '03102917142a00d6', cityCount: 20, population: 776580, medianADR: 178, medianOccupancy: 65, medianMonthlyRevenue: 3571, medianRPR: 0.093, verdicts: { 'strong-buy': 0, buy: 2, hold: 5, caution: 6, avoid: 7 }, marketTypes: { lake: 2, mountain: 4, rural: 11, urban: 3 } },
+  IL: { hash: '9e86a300f64b7832', cityCount: 30, population: 4293964, medianADR: 175, medianOccupancy: 68, medianMonthlyRevenue: 3570, medianRPR: 0.14, verdicts: { 'strong-buy': 4, buy: 5, hold: 5, caution: 10, avoid: 6 }, marketTypes: { lake: 1, mountain: 1, rural: 9, suburban: 7, urban: 12 } },
+  IN: { hash: '17a7715ff1e40417', cityCount: 23, population: 2857749, medianADR: 141, medianOccupancy: 66, medianMonthlyRevenue: 2917, medianRPR: 0.124, verdicts: { 'strong-buy': 2, buy: 2, hold: 6, caution: 11, avoid: 2 }, marketTypes: { beach: 1, lake: 1, rural: 6, suburban: 6, urban: 9 } },
+  KS: { hash: '7f215fda1ceb1d9f', cityCount: 18, population: 958357, medianADR: 125, medianOccupancy: 58, medianMonthlyRevenue: 2175, medianRPR: 0.102, verdicts: { 'strong-buy': 0, buy: 3, hold: 9, caution: 4, avoid: 2 }, marketTypes: { rural: 14, urban: 4 } },
+  KY: { hash: '732200ce40f6c614', cityCount: 31, population: 2956451, medianADR: 145, medianOccupancy: 63, medianMonthlyRevenue: 2710, medianRPR: 0.088, verdicts: { 'strong-buy': 2, buy: 14, hold: 8, caution: 3, avoid: 4 }, marketTypes: { lake: 6, mountain: 3, rural: 15, urban: 7 } },
+  LA: { hash: 'e65e663392f2b4e3', cityCount: 14, population: 1083656, medianADR: 195, medianOccupancy: 62, medianMonthlyRevenue: 3463, medianRPR: 0.214, verdicts: { 'strong-buy': 0, buy: 1, hold: 6, caution: 4, avoid: 3 }, marketTypes: { rural: 4, suburban: 3, urban: 4, waterfront: 3 } },
+  MA: { hash: 'e8537623d37bbc68', cityCount: 29, population: 2423096, medianADR: 224, medianOccupancy: 70, medianMonthlyRevenue: 4860, medianRPR: 0.075, verdicts: { 'strong-buy': 0, buy: 0, hold: 0, caution: 9, avoid: 20 }, marketTypes: { beach: 14, rural: 3, urban: 12 } },
+  MD: { hash: '9cfe95965077eb41', cityCount: 22, population: 728865, medianADR: 145, medianOccupancy: 62, medianMonthlyRevenue: 2697, medianRPR: 0.175, verdicts: { 'strong-buy': 0, buy: 6, hold: 4, caution: 6, avoid: 6 }, marketTypes: { beach: 3, lake: 1, rural: 11, urban: 1, waterfront: 6 } },
+  ME: { hash: '130565c508045f01', cityCount: 27, population: 160648, medianADR: 225, medianOccupancy: 60, medianMonthlyRevenue: 4388, medianRPR: 0.098, verdicts: { 'strong-buy': 1, buy: 9, hold: 4, caution: 7, avoid: 6 }, marketTypes: { beach: 5, mountain: 1, rural: 14, waterfront: 7 } },
+  MI: { hash: 'cf8e1f5b7049e9f1', cityCount: 51, population: 1437708, medianADR: 223, medianOccupancy: 66, medianMonthlyRevenue: 4333, medianRPR: 0.167, verdicts: { 'strong-buy': 12, buy: 12, hold: 12, caution: 7, avoid: 8 }, marketTypes: { beach: 1, lake: 32, rural: 2, suburban: 1, urban: 14, waterfront: 1 } },
+  MN: { hash: '7c71395ea895d4a9', cityCount: 25, population: 1249082, medianADR: 155, medianOccupancy: 65, medianMonthlyRevenue: 3023, medianRPR: 0.115, verdicts: { 'strong-buy': 0, buy: 9, hold: 5, caution: 7, avoid: 4 }, marketTypes: { lake: 15, mountain: 1, rural: 5, urban: 4 } },
+  MO: { hash: 'a450d42b6313198c', cityCount: 23, population: 1630102, medianADR: 97, medianOccupancy: 63, medianMonthlyRevenue: 2023, medianRPR: 0.098, verdicts: { 'strong-buy': 2, buy: 6, hold: 5, caution: 7, avoid: 3 }, marketTypes: { lake: 7, rural: 8, suburban: 1, urban: 7 } },
+  MS: { hash: 'f1811b5401d6b4a1', cityCount: 12, population: 374321, medianADR: 145, medianOccupancy: 59, medianMonthlyRevenue: 2523, medianRPR: 0.176, verdicts: { 'strong-buy': 0, buy: 5, hold: 3, caution: 2, avoid: 2 }, marketTypes: { beach: 1, rural: 4, urban: 4, waterfront: 3 } },
+  MT: { hash: '39f8ccf8adab6a0f', cityCount: 30, population: 393939, medianADR: 225, medianOccupancy: 62, medianMonthlyRevenue: 4185, medianRPR: 0.079, verdicts: { 'strong-buy': 1, buy: 4, hold: 14, caution: 3, avoid: 8 }, marketTypes: { lake: 1, mountain: 12, rural: 15, urban: 2 } },
+  NC: { hash: 'aaabd0d2f79ad6bb', cityCount: 54, population: 3545467, medianADR: 155, medianOccupancy: 65, medianMonthlyRevenue: 3023, medianRPR: 0.093, verdicts: { 'strong-buy': 0, buy: 9, hold: 11, caution: 18, avoid: 16 }, marketTypes: { beach: 18, lake: 2, mountain: 14, rural: 11, urban: 9 } },
+  ND: { hash: 'b9f149f5ff734030', cityCount: 14, population: 59130, medianADR: 243, medianOccupancy: 38, medianMonthlyRevenue: 2667, medianRPR: 0.115, verdicts: { 'strong-buy': 3, buy: 2, hold: 9, caution: 0, avoid: 0 }, marketTypes: { lake: 3, rural: 11 } },
+  NE: { hash: 'c46ab5e43fdde0a6', cityCount: 9, population: 846751, medianADR: 125, medianOccupancy: 58, medianMonthlyRevenue: 2175, medianRPR: 0.092, verdicts: { 'strong-buy': 3, buy: 1, hold: 1, caution: 1, avoid: 3 }, marketTypes: { lake: 2, rural: 5, urban: 2 } },
+  NH: { hash: '0e95d9670484d2ce', cityCount: 17, population: 345651, medianADR: 218, medianOccupancy: 62, medianMonthlyRevenue: 4055, medianRPR: 0.123, verdicts: { 'strong-buy': 0, buy: 1, hold: 3, caution: 8, avoid: 5 }, marketTypes: { lake: 4, mountain: 10, rural: 1, urban: 2 } },
+  NJ: { hash: '6a79ea6402f903f6', cityCount: 22, population: 1869405, medianADR: 212, medianOccupancy: 63, medianMonthlyRevenue: 4452, medianRPR: 0.098, verdicts: { 'strong-buy': 0, buy: 0, hold: 1, caution: 10, avoid: 11 }, marketTypes: { beach: 12, rural: 1, suburban: 1, urban: 8 } },
+  NM: { hash: '4fd8259cc4c581df', cityCount: 20, population: 861924, medianADR: 145, medianOccupancy: 62, medianMonthlyRevenue: 2697, medianRPR: 0.096, verdicts: { 'strong-buy': 0, buy: 8, hold: 4, caution: 6, avoid: 2 }, marketTypes: { desert: 1, mountain: 7, rural: 11, urban: 1 } },
+  NV: { hash: '63e93ac6a2be0089', cityCount: 19, population: 1678172, medianADR: 195, medianOccupancy: 72, medianMonthlyRevenue: 4212, medianRPR: 0.12, verdicts: { 'strong-buy': 1, buy: 3, hold: 5, caution: 4, avoid: 6 }, marketTypes: { lake: 4, mountain: 2, rural: 11, urban: 2 } },
+  NY: { hash: '65608a70fa38ae25', cityCount: 51, population: 17305587, medianADR: 209, medianOccupancy: 76, medianMonthlyRevenue: 4703, medianRPR: 0.105, verdicts: { 'strong-buy': 12, buy: 8, hold: 13, caution: 5, avoid: 13 }, marketTypes: { beach: 6, lake: 22, mountain: 7, rural: 11, urban: 5 } },
+  OH: { hash: '3c435e903e83f7ed', cityCount: 42, population: 2663311, medianADR: 140, medianOccupancy: 62, medianMonthlyRevenue: 2511, medianRPR: 0.139, verdicts: { 'strong-buy': 3, buy: 25, hold: 8, caution: 3, avoid: 3 }, marketTypes: { lake: 8, rural: 18, suburban: 11, urban: 5 } },
+  OK: { hash: 'fdfcdb9f029f28c0', cityCount: 17, population: 1600096, medianADR: 125, medianOccupancy: 59, medianMonthlyRevenue: 2175, medianRPR: 0.129, verdicts: { 'strong-buy': 5, buy: 3, hold: 2, caution: 6, avoid: 1 }, marketTypes: { lake: 7, mountain: 1, rural: 3, urban: 6 } },
+  OR: { hash: 'bcc15866bad77c34', cityCount: 34, population: 1630770, medianADR: 165, medianOccupancy: 68, medianMonthlyRevenue: 3366, medianRPR: 0.078, verdicts: { 'strong-buy': 0, buy: 1, hold: 16, caution: 5, avoid: 12 }, marketTypes: { beach: 3, mountain: 8, rural: 17, urban: 6 } },
+  PA: { hash: 'ddcfc9884e688dd8', cityCount: 28, population: 2700037, medianADR: 155, medianOccupancy: 68, medianMonthlyRevenue: 3162, medianRPR: 0.167, verdicts: { 'strong-buy': 0, buy: 4, hold: 8, caution: 6, avoid: 10 }, marketTypes: { lake: 3, mountain: 9, rural: 11, urban: 5 } },
+  RI: { hash: '726ef27870a7fba0', cityCount: 15, population: 453481, medianADR: 141, medianOccupancy: 63, medianMonthlyRevenue: 2664, medianRPR: 0.076, verdicts: { 'strong-buy': 0, buy: 0, hold: 7, caution: 4, avoid: 4 }, marketTypes: { beach: 4, rural: 6, urban: 3, waterfront: 2 } },
+  SC: { hash: 'b6230e06435f9e45', cityCount: 44, population: 1102494, medianADR: 165, medianOccupancy: 59, medianMonthlyRevenue: 3069, medianRPR: 0.102, verdicts: { 'strong-buy': 0, buy: 11, hold: 18, caution: 6, avoid: 9 }, marketTypes: { beach: 10, lake: 3, mountain: 2, rural: 16, suburban: 8, urban: 5 } },
+  SD: { hash: '20155d5e7006c22a', cityCount: 12, population: 290462, medianADR: 108, medianOccupancy: 70, medianMonthlyRevenue: 2268, medianRPR: 0.084, verdicts: { 'strong-buy': 0, buy: 5, hold: 2, caution: 2, avoid: 3 }, marketTypes: { desert: 1, lake: 1, mountain: 5, rural: 4, urban: 1 } },
+  TN: { hash: '209bb1f718d30ad4', cityCount: 30, population: 3589150, medianADR: 156, medianOccupancy: 60, medianMonthlyRevenue: 2808, medianRPR: 0.137, verdicts: { 'strong-buy': 0, buy: 9, hold: 10, caution: 7, avoid: 4 }, marketTypes: { lake: 1, mountain: 6, rural: 18, urban: 5 } },
+  TX: { hash: 'b4d0a454db3084d8', cityCount: 87, population: 13833244, medianADR: 165, medianOccupancy: 66, medianMonthlyRevenue: 3366, medianRPR: 0.134, verdicts: { 'strong-buy': 4, buy: 6, hold: 17, caution: 29, avoid: 31 }, marketTypes: { beach: 9, desert: 6, lake: 3, mountain: 1, rural: 22, urban: 45, waterfront: 1 } },
+  UT: { hash: '01514b09a3e95f58', cityCount: 44, population: 1363295, medianADR: 165, medianOccupancy: 65, medianMonthlyRevenue: 3218, medianRPR: 0.07, verdicts: { 'strong-buy': 0, buy: 4, hold: 16, caution: 12, avoid: 12 }, marketTypes: { desert: 16, mountain: 5, rural: 13, urban: 10 } },
+  VA: { hash: 'df588fe193982472', cityCount: 38, population: 1821071, medianADR: 201, medianOccupancy: 62, medianMonthlyRevenue: 3750, medianRPR: 0.133, verdicts: { 'strong-buy': 0, buy: 18, hold: 9, caution: 7, avoid: 4 }, marketTypes: { beach: 1, lake: 1, mountain: 4, rural: 20, urban: 7, waterfront: 5 } },
+  VT: { hash: '4a9c66694141a07e', cityCount: 24, population: 150370, medianADR: 195, medianOccupancy: 55, medianMonthlyRevenue: 3627, medianRPR: 0.095, verdicts: { 'strong-buy': 0, buy: 1, hold: 10, caution: 4, avoid: 9 }, marketTypes: { lake: 1, mountain: 7, rural: 15, urban: 1 } },
+  WA: { hash: '4a93121f97801c25', cityCount: 52, population: 2836820, medianADR: 195, medianOccupancy: 65, medianMonthlyRevenue: 4212, medianRPR: 0.061, verdicts: { 'strong-buy': 0, buy: 6, hold: 9, caution: 20, avoid: 17 }, marketTypes: { beach: 9, lake: 2, mountain: 9, rural: 16, urban: 12, waterfront: 4 } },
+  WI: { hash: 'c6f3be3d99d3a8d4', cityCount: 25, population: 675715, medianADR: 155, medianOccupancy: 62, medianMonthlyRevenue: 2883, medianRPR: 0.11, verdicts: { 'strong-buy': 2, buy: 10, hold: 2, caution: 4, avoid: 7 }, marketTypes: { lake: 16, rural: 5, urban: 3, waterfront: 1 } },
+  WV: { hash: 'a0927acf28aedf15', cityCount: 30, population: 159074, medianADR: 162, medianOccupancy: 53, medianMonthlyRevenue: 2575, medianRPR: 0.168, verdicts: { 'strong-buy': 1, buy: 22, hold: 4, caution: 2, avoid: 1 }, marketTypes: { lake: 1, mountain: 1, rural: 27, urban: 1 } },
+  WY: { hash: '0db67f37e2b5f2fe', cityCount: 27, population: 213174, medianADR: 166, medianOccupancy: 61, medianMonthlyRevenue: 2667, medianRPR: 0.07, verdicts: { 'strong-buy': 0, buy: 5, hold: 9, caution: 3, avoid: 10 }, marketTypes: { mountain: 7, rural: 18, urban: 2 } },
+};